@@ -19,16 +19,83 @@ try:
     from rpyutils import add_dll_directories_from_env
 
     with add_dll_directories_from_env('PATH'):
+        from event_camera_py._event_camera_py import ColumnarDecoder
         from event_camera_py._event_camera_py import Decoder
+        from event_camera_py._event_camera_py import EventCD
+        from event_camera_py._event_camera_py import EventCD64
+        from event_camera_py._event_camera_py import EventCDCamera
+        from event_camera_py._event_camera_py import EventExtTrig
+        from event_camera_py._event_camera_py import EventExtTrigCamera
+        from event_camera_py._event_camera_py import FrameDecoder
+        from event_camera_py._event_camera_py import MultiDecoder
+        from event_camera_py._event_camera_py import Time64Decoder
         from event_camera_py._event_camera_py import UniqueDecoder
+        from event_camera_py._event_camera_py import WindowedDecoder
+        from event_camera_py._event_camera_py import encode_events
 
 except ImportError:
     try:
         # if rpyutils does not insist, try regular import under ROS2
+        from event_camera_py._event_camera_py import ColumnarDecoder
         from event_camera_py._event_camera_py import Decoder
+        from event_camera_py._event_camera_py import EventCD
+        from event_camera_py._event_camera_py import EventCD64
+        from event_camera_py._event_camera_py import EventCDCamera
+        from event_camera_py._event_camera_py import EventExtTrig
+        from event_camera_py._event_camera_py import EventExtTrigCamera
+        from event_camera_py._event_camera_py import FrameDecoder
+        from event_camera_py._event_camera_py import MultiDecoder
+        from event_camera_py._event_camera_py import Time64Decoder
         from event_camera_py._event_camera_py import UniqueDecoder
+        from event_camera_py._event_camera_py import WindowedDecoder
+        from event_camera_py._event_camera_py import encode_events
     except ImportError:
         # import under ROS1
+        from _event_camera_py import ColumnarDecoder
         from _event_camera_py import Decoder
+        from _event_camera_py import EventCD
+        from _event_camera_py import EventCD64
+        from _event_camera_py import EventCDCamera
+        from _event_camera_py import EventExtTrig
+        from _event_camera_py import EventExtTrigCamera
+        from _event_camera_py import FrameDecoder
+        from _event_camera_py import MultiDecoder
+        from _event_camera_py import Time64Decoder
         from _event_camera_py import UniqueDecoder
-__all__ = ['Decoder', 'UniqueDecoder']
+        from _event_camera_py import WindowedDecoder
+        from _event_camera_py import encode_events
+
+from event_camera_py.bag_reader import BagReader  # noqa: E402, I100
+from event_camera_py.parallel_bag_decoder import ParallelBagDecoder  # noqa: E402
+from event_camera_py.raw_file_decoder import RawFileDecoder  # noqa: E402
+from event_camera_py.synthetic import SyntheticEventStream  # noqa: E402
+from event_camera_py.time_index import SeekPosition  # noqa: E402
+from event_camera_py.time_index import TimeIndex  # noqa: E402
+from event_camera_py.windows import iter_count_windows  # noqa: E402
+from event_camera_py.windows import iter_trigger_windows  # noqa: E402
+from event_camera_py.windows import iter_windows  # noqa: E402
+
+__all__ = [
+    'BagReader',
+    'ColumnarDecoder',
+    'Decoder',
+    'EventCD',
+    'EventCD64',
+    'EventCDCamera',
+    'EventExtTrig',
+    'EventExtTrigCamera',
+    'FrameDecoder',
+    'MultiDecoder',
+    'ParallelBagDecoder',
+    'RawFileDecoder',
+    'SeekPosition',
+    'SyntheticEventStream',
+    'Time64Decoder',
+    'TimeIndex',
+    'UniqueDecoder',
+    'WindowedDecoder',
+    'encode_events',
+    'iter_count_windows',
+    'iter_trigger_windows',
+    'iter_windows',
+]
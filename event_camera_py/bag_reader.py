@@ -0,0 +1,157 @@
+# -----------------------------------------------------------------------------
+# Copyright 2026 Bernd Pfrommer <bernd.pfrommer@gmail.com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Bag reader that prefetches messages in a background thread."""
+
+import os
+import queue
+import threading
+
+_END = object()  # marks the end of the bag in the queue
+
+
+def open_ros2_reader(bag_path, topics):
+    """
+    Open ROS2 bag for sequential reading of raw (serialized) messages.
+
+    :param bag_path: path of the bag directory
+    :param topics: list of topics to read
+    :return: tuple with rosbag2_py.SequentialReader and dictionary topic -> type name
+    """
+    # imported here such that the package works without rosbag2
+    import rosbag2_py
+
+    reader = rosbag2_py.SequentialReader()
+    reader.open(
+        rosbag2_py.StorageOptions(uri=str(bag_path)),
+        rosbag2_py.ConverterOptions(
+            input_serialization_format='cdr', output_serialization_format='cdr'
+        ),
+    )
+    reader.set_filter(rosbag2_py.StorageFilter(topics=list(topics)))
+    types = {t.name: t.type for t in reader.get_all_topics_and_types()}
+    return reader, types
+
+
+class BagReader:
+    """
+    Reads messages from a ROS1 or ROS2 bag without loading the whole bag.
+
+    A background thread reads and deserializes the messages into a queue
+    of bounded size, such that reading overlaps with the processing (e.g.
+    decoding) of the messages, and memory usage stays bounded.
+    """
+
+    def __init__(self, bag_path, topics, queue_size=64, start_time=None, ros_version=None):
+        """
+        Open bag for reading.
+
+        :param bag_path: path of the bag, i.e. the .bag file for ROS1 and
+                         the bag directory for ROS2.
+        :param topics: topic or list of topics to read
+        :param queue_size: maximum number of prefetched messages
+        :param start_time: recording time (nanoseconds) of the first message
+                           to read, or None to read from the start.
+        :param ros_version: 1 or 2, None to use the ROS_VERSION environment
+                            variable, or guess from the bag path.
+        """
+        self._bag_path = str(bag_path)
+        self._topics = [topics] if isinstance(topics, str) else list(topics)
+        self._start_time = start_time
+        self._ros_version = int(ros_version or os.environ.get('ROS_VERSION', 0)) or (
+            1 if self._bag_path.endswith('.bag') else 2
+        )
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __iter__(self):
+        return self.read_messages()
+
+    def read_messages(self):
+        """
+        Read messages.
+
+        :return: generator of tuples (topic, message, recording time in nanoseconds)
+        """
+        if self._thread is not None:
+            raise RuntimeError('bag can only be read once!')
+        self._thread = threading.Thread(target=self._prefetch, daemon=True)
+        self._thread.start()
+        try:
+            while True:
+                item = self._queue.get()
+                if item is _END:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            self.close()
+
+    def close(self):
+        """Stop the prefetching thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _prefetch(self):
+        try:
+            messages = self._read_ros1() if self._ros_version == 1 else self._read_ros2()
+            for item in messages:
+                if not self._put(item):
+                    return
+            self._put(_END)
+        except Exception as e:  # hand over to the reading thread
+            self._put(e)
+
+    def _put(self, item):
+        # returns False if reading has been stopped
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _read_ros1(self):
+        import rosbag
+        import rospy
+
+        start_time = None
+        if self._start_time is not None:
+            start_time = rospy.Time(nsecs=self._start_time)
+        with rosbag.Bag(self._bag_path) as bag:
+            for topic, msg, t in bag.read_messages(topics=self._topics, start_time=start_time):
+                yield (topic, msg, t.to_nsec())
+
+    def _read_ros2(self):
+        from rclpy.serialization import deserialize_message
+        from rosidl_runtime_py.utilities import get_message
+
+        reader, types = open_ros2_reader(self._bag_path, self._topics)
+        msg_types = {topic: get_message(t) for topic, t in types.items() if topic in self._topics}
+        if self._start_time is not None:
+            reader.seek(self._start_time)
+        while reader.has_next() and not self._stop.is_set():
+            topic, data, t = reader.read_next()
+            yield (topic, deserialize_message(data, msg_types[topic]), t)
@@ -0,0 +1,294 @@
+# -----------------------------------------------------------------------------
+# Copyright 2026 Bernd Pfrommer <bernd.pfrommer@gmail.com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Decode a ROS2 bag in chunks with a pool of processes."""
+
+from collections import deque
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+import datetime
+import os
+import time
+
+from event_camera_py import Decoder
+from event_camera_py import Time64Decoder
+from event_camera_py.bag_reader import open_ros2_reader
+import numpy as np
+
+ChunkResult = namedtuple(
+    'ChunkResult', ['first_message', 'end_message', 'cd_events', 'ext_trig_events']
+)
+ChunkResult.__doc__ = """
+Decoded events of a range of messages.
+
+:param first_message: index of the first message of the chunk
+:param end_message: index one past the last message of the chunk
+:param cd_events: CD events of dtype EventCD64, identical to decoding sequentially
+:param ext_trig_events: trigger events of dtype EventExtTrig
+"""
+
+
+def _to_nsec(t):
+    # the bag metadata has datetime and timedelta objects
+    if isinstance(t, datetime.timedelta):
+        return t // datetime.timedelta(microseconds=1) * 1000
+    if isinstance(t, datetime.datetime):
+        return int(t.timestamp() * 1e6) * 1000
+    return int(t)
+
+
+def _read_metadata(bag_path, topic):
+    """Return recording time range (nanoseconds) and number of messages without reading them."""
+    reader, _ = open_ros2_reader(bag_path, [topic])
+    metadata = reader.get_metadata()
+    start = _to_nsec(metadata.starting_time)
+    num_msgs = sum(
+        t.message_count
+        for t in metadata.topics_with_message_count
+        if t.topic_metadata.name == topic
+    )
+    return start, start + _to_nsec(metadata.duration), num_msgs
+
+
+def _read_priming(reader, bag_start, prime_time, begin_time, num_priming):
+    """Read the num_priming messages before begin_time, starting the search at prime_time."""
+    while True:
+        reader.seek(prime_time)
+        priming = deque(maxlen=num_priming)
+        while reader.has_next():
+            _, data, t = reader.read_next()
+            if t >= begin_time:
+                break
+            priming.append(data)
+        if len(priming) == num_priming or prime_time <= bag_start:
+            return list(priming)
+        # too few messages since prime_time, look further back
+        prime_time = max(2 * prime_time - begin_time, bag_start)
+
+
+def _read_chunk(bag_path, topic, bag_start, prime_time, begin_time, end_time, num_priming):
+    """Read the serialized messages of a chunk, and up to num_priming messages before it."""
+    reader, types = open_ros2_reader(bag_path, [topic])
+    priming = []
+    if prime_time < begin_time:
+        priming = _read_priming(reader, bag_start, prime_time, begin_time, num_priming)
+    reader.seek(begin_time)
+    chunk = []
+    while reader.has_next():
+        _, data, t = reader.read_next()
+        if end_time is not None and t >= end_time:
+            break
+        chunk.append(data)
+    return priming, chunk, types[topic]
+
+
+def _last_time(cd, trig, start_time):
+    # sensor time of the last event
+    times = []
+    if cd.shape[0] > 0:
+        times.append(int(cd['t'][-1]) + start_time)
+    if trig.shape[0] > 0:
+        times.append(int(trig['t'][-1]))
+    return max(times, default=None)
+
+
+def _decode_chunk(bag_path, topic, bag_start, prime_time, begin_time, end_time, num_priming):
+    """Decode a chunk of messages with a freshly primed decoder (runs in the worker)."""
+    # imported here such that the package works without ROS2
+    from rclpy.serialization import deserialize_message
+    from rosidl_runtime_py.utilities import get_message
+
+    priming, chunk, msg_type = _read_chunk(
+        bag_path, topic, bag_start, prime_time, begin_time, end_time, num_priming
+    )
+    # a fresh codec must start with a message that has a time stamp
+    k = len(priming)
+    while k > 0 and Decoder().find_first_sensor_time_serialized(priming[k - 1]) is None:
+        k -= 1
+    if priming and k == 0:
+        raise RuntimeError(f'no time stamp found in {num_priming} priming messages!')
+    msg_class = get_message(msg_type)
+    priming = [deserialize_message(data, msg_class) for data in priming[max(k - 1, 0):]]
+    decoder = Time64Decoder()
+    prime_last_time = decoder.prime(priming)
+    cd, trig = [], []
+    for data in chunk:
+        decoder.decode_serialized(data)
+        cd.append(decoder.get_cd_events())
+        trig.append(decoder.get_ext_trig_events())
+    cd = np.concatenate(cd) if cd else np.zeros(0, dtype=decoder.get_cd_events().dtype)
+    trig = np.concatenate(trig) if trig else decoder.get_ext_trig_events()
+    start_time = decoder.get_start_time()  # not None only for time since epoch
+    counts = (
+        decoder.get_num_cd_off(),
+        decoder.get_num_cd_on(),
+        decoder.get_num_trigger_rising(),
+        decoder.get_num_trigger_falling(),
+    )
+    last_time = _last_time(cd, trig, start_time or 0)
+    return len(chunk), cd, trig, start_time, prime_last_time, last_time, counts
+
+
+class ParallelBagDecoder:
+    """
+    Decodes the events of a ROS2 bag in parallel with a pool of processes.
+
+    The bag is split into chunks of consecutive messages. Each worker
+    process reads its chunk from the bag, primes a fresh decoder with the
+    messages preceding the chunk, and decodes the chunk. The results are
+    returned in order, with the time stamps corrected for the sensor time
+    rollovers that the worker's fresh decoder has not seen, such that
+    they are identical to decoding the bag sequentially.
+
+    Without a TimeIndex, the chunks span equal intervals of recording time,
+    computed from the bag metadata, so the bag is never read up front.
+    """
+
+    def __init__(
+        self,
+        bag_path,
+        topic='/event_camera/events',
+        num_workers=None,
+        messages_per_chunk=1000,
+        num_priming=8,
+        index=None,
+    ):
+        """
+        Create parallel bag decoder.
+
+        :param bag_path: path to the ROS2 bag
+        :param topic: topic with the event packet messages
+        :param num_workers: number of worker processes, None to use all cores
+        :param messages_per_chunk: number of messages that a worker decodes at a
+                                   time, on average if no index is given.
+        :param num_priming: maximum number of messages before a chunk that are
+                            searched for a time stamp to prime the decoder with.
+        :param index: TimeIndex of the bag, to split it into chunks of exactly
+                      messages_per_chunk messages.
+        """
+        self._bag_path = str(bag_path)
+        self._topic = topic
+        self._num_workers = num_workers or os.cpu_count()
+        self._messages_per_chunk = messages_per_chunk
+        self._num_priming = num_priming
+        self._index = index
+        self._counts = np.zeros(4, dtype=np.int64)
+        self._start_time = None
+        self._elapsed_time = 0
+
+    def decode(self):
+        """
+        Decode the bag.
+
+        :return: generator of ChunkResult, in message order
+        """
+        t_start = time.time()
+        self._counts[:] = 0
+        self._start_time = None
+        rollover_offset = 0
+        last_time = None  # sensor time of the last event so far
+        end = 0  # index of the first message of the next chunk
+        with ProcessPoolExecutor(max_workers=self._num_workers) as executor:
+            pending = deque()
+            chunks = iter(self._make_chunks())
+            while True:
+                # keep the workers busy, but limit the number of undelivered results
+                while len(pending) < 2 * self._num_workers:
+                    chunk = next(chunks, None)
+                    if chunk is None:
+                        break
+                    pending.append(
+                        executor.submit(
+                            _decode_chunk, self._bag_path, self._topic, *chunk, self._num_priming
+                        )
+                    )
+                if not pending:
+                    break
+                num_msgs, cd, trig, start_time, prime_last, chunk_last, counts = (
+                    pending.popleft().result()
+                )
+                if num_msgs == 0:
+                    continue  # no messages in this time interval
+                if last_time is not None and prime_last is not None:
+                    rollover_offset = last_time - prime_last
+                if start_time is not None and self._start_time is None:
+                    self._start_time = start_time + rollover_offset
+                # CD time is relative to start time, which differs between workers
+                cd['t'] += rollover_offset + (
+                    0 if start_time is None else start_time - self._start_time
+                )
+                trig['t'] += rollover_offset
+                if chunk_last is not None:
+                    last_time = chunk_last + rollover_offset
+                self._counts += counts
+                self._elapsed_time = time.time() - t_start
+                end += num_msgs
+                yield ChunkResult(end - num_msgs, end, cd, trig)
+
+    def get_num_cd_off(self):
+        """Return number of OFF events decoded so far."""
+        return int(self._counts[0])
+
+    def get_num_cd_on(self):
+        """Return number of ON events decoded so far."""
+        return int(self._counts[1])
+
+    def get_num_trigger_rising(self):
+        """Return number of rising edge trigger events decoded so far."""
+        return int(self._counts[2])
+
+    def get_num_trigger_falling(self):
+        """Return number of falling edge trigger events decoded so far."""
+        return int(self._counts[3])
+
+    def get_start_time(self):
+        """Return start time (see Decoder.get_start_time()), or None."""
+        return self._start_time
+
+    def get_rate(self):
+        """Return decoding rate of CD and trigger events in Mev/s."""
+        if self._elapsed_time <= 0:
+            return 0.0
+        return float(np.sum(self._counts)) / self._elapsed_time * 1e-6
+
+    def _make_chunks(self):
+        """
+        Split the bag into chunks by recording time.
+
+        :return: list of tuples (bag_start, prime_time, begin_time, end_time). A worker
+                 reads the messages from prime_time up to begin_time to prime its decoder,
+                 reaching back as far as bag_start if there are too few, and decodes
+                 those from begin_time up to end_time (None: to the end).
+        """
+        if self._index is not None:
+            rec_times = [int(t) for t in self._index.entries['recording_time']]
+            firsts = range(self._messages_per_chunk, len(rec_times), self._messages_per_chunk)
+            bounds = [rec_times[i] for i in firsts]
+            prime_times = [rec_times[max(i - self._num_priming, 0)] for i in firsts]
+            num_chunks = len(bounds) + 1 if rec_times else 0
+            start = rec_times[0] if rec_times else 0
+        else:
+            start, end, num_msgs = _read_metadata(self._bag_path, self._topic)
+            num_chunks = -(-num_msgs // self._messages_per_chunk)
+            dt = (end + 1 - start) / max(num_chunks, 1)
+            bounds = [start + round(k * dt) for k in range(1, num_chunks)]
+            # search the priming messages in the average time they take up
+            gap = max(round(dt / self._messages_per_chunk * self._num_priming), 1)
+            prime_times = [max(b - gap, start) for b in bounds]
+        if num_chunks == 0:
+            return []
+        return [(start, 0, 0, bounds[0] if bounds else None)] + [
+            (start, p, b, e) for p, b, e in zip(prime_times, bounds, bounds[1:] + [None])
+        ]
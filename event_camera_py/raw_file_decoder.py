@@ -0,0 +1,218 @@
+# -----------------------------------------------------------------------------
+# Copyright 2026 Bernd Pfrommer <bernd.pfrommer@gmail.com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Decoder for Metavision .raw files."""
+
+import mmap
+from types import SimpleNamespace
+
+from event_camera_py import Decoder
+from event_camera_py.windows import iter_count_windows
+from event_camera_py.windows import iter_windows
+import numpy as np
+
+# maps the Metavision format names to the codec encodings
+_ENCODINGS = {'EVT3': 'evt3', 'EVT2': 'evt2', 'EVT21': 'evt21'}
+_WORD_SIZE = {'evt3': 2, 'evt2': 4, 'evt21': 8}
+
+
+def read_raw_header(f):
+    """
+    Read header of a Metavision .raw file.
+
+    :param f: file opened in binary mode, positioned at the start
+    :return: tuple with encoding, width, height, and size of header in bytes
+    """
+    fmt, width, height = None, None, None
+    header_size = 0
+    while True:
+        line = f.readline()
+        if not line.startswith(b'%'):
+            break
+        header_size += len(line)
+        key, _, value = line[1:].decode('latin-1').strip().partition(' ')
+        if key == 'end':
+            break
+        if key == 'format':  # e.g. "EVT3;height=720;width=1280"
+            fields = value.split(';')
+            fmt = fields[0]
+            params = dict(p.split('=', 1) for p in fields[1:] if '=' in p)
+            width = int(params.get('width', width or 0)) or width
+            height = int(params.get('height', height or 0)) or height
+        elif key == 'evt' and fmt is None:  # older files: "evt 3.0"
+            fmt = 'EVT' + value.replace('.0', '').replace('.', '')
+        elif key == 'geometry':  # older files: "geometry 1280x720"
+            width, height = (int(v) for v in value.split('x'))
+    if fmt not in _ENCODINGS:
+        raise RuntimeError(f'unsupported raw file format: {fmt}')
+    if not width or not height:
+        raise RuntimeError('no sensor geometry found in raw file header!')
+    return _ENCODINGS[fmt], width, height, header_size
+
+
+class RawFileDecoder:
+    """
+    Decodes a Metavision .raw file without ROS.
+
+    The file is memory-mapped and handed to the decoder in large chunks
+    that look like event packet messages, without copying the data. Only
+    if the decoder has state saving enabled (Decoder.enable_state()) does it
+    keep copies of its most recent chunks, i.e. up to 8 * chunk_size bytes.
+    """
+
+    def __init__(self, path, chunk_size=1 << 24, decoder=None):
+        """
+        Open raw file.
+
+        :param path: name of the .raw file
+        :param chunk_size: number of bytes per chunk
+        :param decoder: decoder to use, e.g. Time64Decoder(), None for a new Decoder.
+                        Reduce chunk_size when passing a decoder with enable_state().
+        """
+        with open(path, 'rb') as f:
+            self.encoding, self.width, self.height, self._header_size = read_raw_header(f)
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        word_size = _WORD_SIZE[self.encoding]
+        self._chunk_size = max(chunk_size // word_size, 1) * word_size
+        self._data = np.frombuffer(self._mmap, dtype=np.uint8, offset=self._header_size)
+        self._data = self._data[: self._data.shape[0] // word_size * word_size]
+        self._decoder = Decoder() if decoder is None else decoder
+        self._offset = 0  # file position (excluding header) of next chunk
+        self._current = None  # chunk that decode_until() is working on
+        self._cd, self._trig = [], []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Release the memory map. Events still referenced keep it alive."""
+        self._data = None
+        self._current = None
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass  # still in use by a chunk somebody holds on to
+
+    def get_num_bytes(self):
+        """Return number of event data bytes in the file."""
+        return self._data.shape[0]
+
+    def messages(self):
+        """
+        Iterate over the remaining data in chunks.
+
+        The chunks are objects with the same attributes as an event packet
+        message, so they can be passed to any decoder or to iter_windows().
+
+        :return: generator of message-like objects
+        """
+        while True:
+            msg = self._next_chunk()
+            if msg is None:
+                break
+            yield msg
+
+    def decode(self):
+        """
+        Decode next chunk of the file.
+
+        :return: False if the end of the file has been reached, True otherwise
+        """
+        self._cd, self._trig = [], []
+        if self._current is not None:
+            # finish the chunk in which decode_until() stopped
+            self._decoder.decode_until(self._current, (1 << 64) - 1)
+            self._current = None
+            return True
+        msg = self._next_chunk()
+        if msg is None:
+            return False
+        self._decoder.decode(msg)
+        return True
+
+    def decode_until(self, until_time):
+        """
+        Decode until the sensor time reaches until_time.
+
+        Unlike Decoder.decode_until(), this continues across chunks.
+
+        :param until_time: sensor time in usec up to which to decode
+        :return: tuple (reached_time_limit, next_time). If reached_time_limit
+                 is False, the end of the file has been reached.
+        """
+        self._cd, self._trig = [], []
+        while True:
+            if self._current is None:
+                self._current = self._next_chunk()
+                if self._current is None:
+                    return False, 0
+            reached, next_time = self._decoder.decode_until(self._current, until_time)
+            self._cd.append(self._decoder.get_cd_events())
+            self._trig.append(self._decoder.get_ext_trig_events())
+            if reached:
+                return True, next_time
+            self._current = None  # chunk is done
+
+    def get_cd_events(self):
+        """Return CD events decoded by the last call to decode() or decode_until()."""
+        return self._get_events(self._cd, self._decoder.get_cd_events)
+
+    def get_ext_trig_events(self):
+        """Return trigger events decoded by the last call to decode() or decode_until()."""
+        return self._get_events(self._trig, self._decoder.get_ext_trig_events)
+
+    def find_first_sensor_time(self):
+        """Return first sensor time in the file, or None."""
+        return Decoder().find_first_sensor_time(self._make_msg(0, self._chunk_size))
+
+    def iter_windows(self, window_length, start_time=None):
+        """Decode the rest of the file in windows of fixed duration, see iter_windows()."""
+        return iter_windows(self.messages(), window_length, start_time)
+
+    def iter_count_windows(self, count):
+        """Decode the rest of the file in windows of fixed size, see iter_count_windows()."""
+        return iter_count_windows(self.messages(), count)
+
+    def get_decoder(self):
+        """Return the decoder, e.g. to get the event counters."""
+        return self._decoder
+
+    def _get_events(self, parts, get_from_decoder):
+        if not parts:
+            return get_from_decoder()
+        # decode_until() spanning several chunks, only then a copy is needed
+        events = parts[0] if len(parts) == 1 else np.concatenate(parts)
+        parts.clear()
+        return events
+
+    def _next_chunk(self):
+        if self._data is None or self._offset >= self._data.shape[0]:
+            return None
+        msg = self._make_msg(self._offset, self._chunk_size)
+        self._offset += self._chunk_size
+        return msg
+
+    def _make_msg(self, offset, size):
+        end = offset + size
+        return SimpleNamespace(
+            encoding=self.encoding,
+            width=self.width,
+            height=self.height,
+            time_base=0,
+            events=self._data[offset:end],
+        )
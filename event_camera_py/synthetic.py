@@ -0,0 +1,178 @@
+# -----------------------------------------------------------------------------
+# Copyright 2026 Bernd Pfrommer <bernd.pfrommer@gmail.com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Synthetic event streams for testing and benchmarking."""
+
+from types import SimpleNamespace
+
+from event_camera_py import encode_events
+from event_camera_py import EventCD64
+from event_camera_py import EventExtTrig
+import numpy as np
+
+
+class SyntheticEventStream:
+    """
+    Generates a random stream of events and encodes it into messages.
+
+    The CD events are spread uniformly over the sensor, with Poisson
+    distributed arrival times. Hot pixels fire at a much higher rate than
+    the other pixels. External trigger events come at a fixed frequency,
+    the falling edge half a period after the rising edge. As for the
+    decoded trigger events, p is 0 for the rising and 1 for the falling
+    edge.
+    """
+
+    def __init__(
+        self,
+        width=1280,
+        height=720,
+        event_rate=10e6,
+        num_hot_pixels=0,
+        hot_pixel_rate=1000.0,
+        trigger_frequency=0.0,
+        encoding='evt3',
+        start_time=0,
+        seed=None,
+    ):
+        """
+        Create synthetic event stream.
+
+        :param width: sensor width
+        :param height: sensor height
+        :param event_rate: rate of CD events (events/sec) without the hot pixels
+        :param num_hot_pixels: number of hot pixels
+        :param hot_pixel_rate: rate of CD events (events/sec) per hot pixel
+        :param trigger_frequency: frequency (Hz) of the external trigger, 0 for none
+        :param encoding: encoding of the messages, 'evt3' or 'evt2'
+        :param start_time: sensor time (usec) of the start of the stream
+        :param seed: seed of the random number generator
+        """
+        self.width = width
+        self.height = height
+        self.encoding = encoding
+        self._event_rate = event_rate
+        self._hot_pixel_rate = hot_pixel_rate
+        self._trigger_period = 1e6 / trigger_frequency if trigger_frequency > 0 else 0
+        self._rng = np.random.default_rng(seed)
+        self._hot_pixels = self._rng.choice(width * height, size=num_hot_pixels, replace=False)
+        self._time = start_time
+        self._next_trigger = 0  # index of next trigger edge
+
+    def get_hot_pixels(self):
+        """Return hot pixels as array of (x, y)."""
+        return np.stack((self._hot_pixels % self.width, self._hot_pixels // self.width), axis=1)
+
+    def get_time(self):
+        """Return sensor time (usec) up to which events have been generated."""
+        return self._time
+
+    def generate_events(self, duration):
+        """
+        Generate the events of the next time interval.
+
+        :param duration: length of the time interval in usec
+        :return: tuple with arrays of CD events (EventCD64) and trigger events, sorted by time.
+        """
+        t0, t1 = self._time, self._time + duration
+        self._time = t1
+        rate = self._event_rate + self._hot_pixels.shape[0] * self._hot_pixel_rate
+        # number of events per usec, such that the times come out sorted
+        counts = self._rng.poisson(rate * 1e-6, size=duration)
+        n = int(counts.sum())
+        cd = np.empty(n, dtype=EventCD64)
+        cd['t'] = np.repeat(np.arange(t0, t1, dtype=np.int64), counts)
+        pixels = self._rng.integers(0, self.width * self.height, size=n)
+        if self._hot_pixels.shape[0] > 0:
+            is_hot = self._rng.random(n) * rate >= self._event_rate
+            pixels[is_hot] = self._rng.choice(self._hot_pixels, size=np.count_nonzero(is_hot))
+        cd['x'] = pixels % self.width
+        cd['y'] = pixels // self.width
+        cd['p'] = self._rng.integers(0, 2, size=n)
+        return cd, self._generate_triggers(t0, t1)
+
+    def messages(self, num_messages, message_duration=1000, num_unique=0):
+        """
+        Generate encoded messages.
+
+        Generating and encoding the events costs far more than decoding them.
+        For stress tests, set num_unique: only that many messages are
+        generated, after which they are replayed with their time stamps
+        shifted, at the speed of a memory copy.
+
+        :param num_messages: number of messages to generate
+        :param message_duration: time interval (usec) covered by each message
+        :param num_unique: number of distinct messages to replay, 0 for no replay.
+                           num_unique * message_duration must be a multiple of
+                           4096 usec for evt3, 64 usec for evt2.
+        :return: generator of objects with the same attributes as an EventPacket message
+        """
+        period = num_unique * message_duration
+        if num_unique > 0 and period % _TIME_HIGH_UNIT[self.encoding] != 0:
+            raise ValueError(
+                f'replay period {period} is not a multiple of '
+                f'{_TIME_HIGH_UNIT[self.encoding]} usec!'
+            )
+        unique = []
+        for i in range(num_messages):
+            if i < num_unique or num_unique == 0:
+                cd, trig = self.generate_events(message_duration)
+                events = encode_events(self.encoding, cd, trig)
+                if num_unique > 0:
+                    unique.append(events)
+            else:
+                cycle, j = divmod(i, num_unique)
+                events = _shift_time(self.encoding, unique[j], cycle * period)
+                self._time += message_duration
+            yield SimpleNamespace(
+                encoding=self.encoding,
+                width=self.width,
+                height=self.height,
+                time_base=0,
+                events=events,
+            )
+
+    def _generate_triggers(self, t0, t1):
+        if self._trigger_period == 0:
+            return np.zeros(0, dtype=EventExtTrig)
+        # edge k is at time k * period / 2, even k are rising (p=0), odd k falling (p=1)
+        half = self._trigger_period / 2
+        k_start = max(self._next_trigger, int(np.ceil(t0 / half)))
+        k = np.arange(k_start, int(np.ceil(t1 / half)) + 1)
+        k = k[np.floor(k * half) < t1]
+        if k.shape[0] > 0:
+            self._next_trigger = int(k[-1]) + 1
+        trig = np.zeros(k.shape[0], dtype=EventExtTrig)
+        trig['t'] = np.floor(k * half).astype(np.int64)
+        trig['p'] = k % 2
+        return trig
+
+
+# number of usec by which a TIME_HIGH word advances
+_TIME_HIGH_UNIT = {'evt3': 1 << 12, 'evt2': 1 << 6}
+
+
+def _shift_time(encoding, events, dt):
+    # dt is a multiple of _TIME_HIGH_UNIT, so only the TIME_HIGH words change
+    if encoding == 'evt3':
+        words, bits = events.view(np.uint16), 12
+    else:
+        words, bits = events.view(np.uint32), 28
+    shifted = words.copy()
+    idx = np.flatnonzero((words >> bits) == 0x8)
+    mask = (1 << bits) - 1
+    shift = (dt // _TIME_HIGH_UNIT[encoding]) & mask
+    shifted[idx] = (0x8 << bits) | ((words[idx] + shift) & mask)
+    return shifted.view(np.uint8)
@@ -0,0 +1,204 @@
+# -----------------------------------------------------------------------------
+# Copyright 2026 Bernd Pfrommer <bernd.pfrommer@gmail.com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Time index for seeking in a stream of event messages."""
+
+from collections import namedtuple
+
+from event_camera_py import Decoder
+from event_camera_py import Time64Decoder
+import numpy as np
+
+INDEX_DTYPE = np.dtype(
+    [
+        ('first_time', np.uint64),  # sensor time of first event (usec)
+        ('last_time', np.uint64),  # sensor time of last event (usec)
+        ('has_sensor_time', np.bool_),  # message has time stamp to prime a fresh decoder
+        ('recording_time', np.uint64),  # e.g. the bag time stamp
+        ('num_bytes', np.uint64),
+        ('num_cd', np.uint64),
+        ('num_trig', np.uint64),
+    ]
+)
+
+SeekPosition = namedtuple('SeekPosition', ['index', 'prime_index', 'last_time'])
+SeekPosition.__doc__ = """
+Where to start decoding to get to a given sensor time.
+
+:param index: index of the first message that has events at or after the time
+:param prime_index: index of the first message to pass to Decoder.prime().
+    The messages from prime_index up to index (exclusive) establish the
+    codec state.
+:param last_time: sensor time of the last event before message index, to
+    pass to Decoder.prime(), or None if index is 0.
+"""
+
+
+class TimeIndex:
+    """
+    Index of the sensor time covered by each message of an event stream.
+
+    The index is built once by decoding the whole stream, and can then be
+    saved to a sidecar file next to the recording. Subsequently, seek()
+    finds the message to start decoding from by bisection.
+    """
+
+    def __init__(self, entries=None, encoding=''):
+        """
+        Create time index.
+
+        :param entries: structured numpy array of dtype INDEX_DTYPE, or None
+                        to start an empty index that is filled with add().
+        :param encoding: encoding of the indexed messages
+        """
+        self._entries = np.zeros(0, dtype=INDEX_DTYPE) if entries is None else entries
+        self._new_entries = []
+        self._decoder = Time64Decoder()
+        self._last_time = 0
+        if self._entries.shape[0] > 0:
+            self._last_time = int(self._entries['last_time'][-1])
+        self.encoding = encoding
+
+    @classmethod
+    def build(cls, msgs, recording_times=None):
+        """
+        Build index by decoding all messages.
+
+        :param msgs: iterable of event packet messages of the same sensor
+        :param recording_times: iterable of recording time stamps (e.g. bag
+                                time) of the messages, or None.
+        :return: the time index
+        """
+        index = cls()
+        if recording_times is None:
+            for msg in msgs:
+                index.add(msg)
+        else:
+            for msg, t in zip(msgs, recording_times):
+                index.add(msg, t)
+        return index
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load index from sidecar file.
+
+        :param path: file name, as written by save()
+        :return: the time index
+        """
+        with np.load(path, allow_pickle=False) as f:
+            return cls(f['entries'].astype(INDEX_DTYPE), str(f['encoding']))
+
+    @staticmethod
+    def sidecar_path(recording_path):
+        """Return default name of sidecar file for a given recording."""
+        return str(recording_path).rstrip('/') + '.time_index.npz'
+
+    def save(self, path):
+        """
+        Save index to sidecar file.
+
+        :param path: file name, usually sidecar_path(recording)
+        """
+        with open(path, 'wb') as f:
+            np.savez(f, entries=self.entries, encoding=np.array(self.encoding))
+
+    def add(self, msg, recording_time=0):
+        """
+        Decode message and append it to the index.
+
+        The messages must be added in order, without skipping any.
+
+        :param msg: event packet message
+        :param recording_time: recording time stamp of the message, e.g. bag time
+        """
+        self.encoding = msg.encoding
+        # a fresh decoder only finds the time if the message has a time stamp
+        has_sensor_time = Decoder().find_first_sensor_time(msg) is not None
+        self._decoder.decode(msg)
+        cd = self._decoder.get_cd_events()
+        trig = self._decoder.get_ext_trig_events()
+        # the time field of the CD events is relative to the start time
+        t0 = self._decoder.get_start_time() or 0
+        first_times, last_times = [], []
+        if cd.shape[0] > 0:
+            first_times.append(int(cd['t'][0]) + t0)
+            last_times.append(int(cd['t'][-1]) + t0)
+        if trig.shape[0] > 0:
+            first_times.append(int(trig['t'][0]))
+            last_times.append(int(trig['t'][-1]))
+        # no events found: carry over time of previous message
+        first_time = min(first_times, default=self._last_time)
+        self._last_time = max(last_times, default=self._last_time)
+        self._new_entries.append(
+            (
+                first_time,
+                self._last_time,
+                has_sensor_time,
+                recording_time,
+                len(msg.events),
+                cd.shape[0],
+                trig.shape[0],
+            )
+        )
+
+    @property
+    def entries(self):
+        """Structured numpy array of dtype INDEX_DTYPE with one element per message."""
+        if self._new_entries:
+            self._entries = np.concatenate(
+                [self._entries, np.array(self._new_entries, dtype=INDEX_DTYPE)]
+            )
+            self._new_entries = []
+        return self._entries
+
+    def __len__(self):
+        return self._entries.shape[0] + len(self._new_entries)
+
+    def seek(self, t, num_priming=1):
+        """
+        Find message from which to decode to get the events at sensor time t.
+
+        :param t: sensor time (usec, same as for decode_until())
+        :param num_priming: minimum number of messages to prime the codec state
+        :return: SeekPosition. The index is len(self) if t is past the
+                 last event.
+        """
+        index = int(np.searchsorted(self.entries['last_time'], t, side='left'))
+        return self.get_position(index, num_priming)
+
+    def get_position(self, index, num_priming=1):
+        """
+        Get position to start decoding with a given message.
+
+        :param index: index of the message to start decoding with
+        :param num_priming: minimum number of messages to prime the codec state.
+                            More messages are used if needed to get a time stamp.
+        :return: SeekPosition
+        """
+        if index == 0:
+            return SeekPosition(0, 0, None)
+        e = self.entries
+        prime_index = max(index - num_priming, 0)
+        while prime_index > 0 and not e['has_sensor_time'][prime_index]:
+            prime_index -= 1
+        return SeekPosition(index, prime_index, int(e['last_time'][index - 1]))
+
+    def get_time_range(self):
+        """Return tuple with first and last sensor time of the stream."""
+        e = self.entries
+        if e.shape[0] == 0:
+            return None
+        return (int(e['first_time'][0]), int(e['last_time'][-1]))
@@ -0,0 +1,96 @@
+# -----------------------------------------------------------------------------
+# Copyright 2026 Bernd Pfrommer <bernd.pfrommer@gmail.com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Iterators that slice a stream of event messages into windows."""
+
+from event_camera_py import WindowedDecoder
+
+
+def iter_windows(msgs, window_length, start_time=None, decoder=None):
+    """
+    Decode messages and yield the events in windows of fixed duration.
+
+    Every message is decoded exactly once, and windows extend across
+    message boundaries. The last, incomplete window is yielded
+    when the messages are exhausted.
+
+    :param msgs: iterable of event packet messages of the same sensor
+    :param window_length: window duration in usec
+    :param start_time: sensor time at which the first window starts,
+                       or None to start with the first event.
+    :param decoder: WindowedDecoder to use, or None to create a new one.
+    :return: generator of tuples (t_start, cd_events, ext_trig_events)
+    """
+    decoder = WindowedDecoder() if decoder is None else decoder
+    decoder.set_time_window(window_length, start_time)
+    for msg in msgs:
+        decoder.decode(msg)
+        yield from decoder.get_windows()
+    decoder.flush()
+    yield from decoder.get_windows()
+
+
+def iter_count_windows(msgs, count, decoder=None):
+    """
+    Decode messages and yield the events in windows of fixed size.
+
+    Each window holds exactly ``count`` CD events, except for the
+    last one, which is yielded when the messages are exhausted.
+    The windows extend across message boundaries, so no
+    concatenation is necessary.
+
+    :param msgs: iterable of event packet messages of the same sensor
+    :param count: number of CD events per window
+    :param decoder: WindowedDecoder to use, or None to create a new one.
+    :return: generator of tuples (t_start, cd_events, ext_trig_events)
+    """
+    decoder = WindowedDecoder() if decoder is None else decoder
+    decoder.set_count_window(count)
+    for msg in msgs:
+        decoder.decode(msg)
+        yield from decoder.get_windows()
+    decoder.flush()
+    yield from decoder.get_windows()
+
+
+def iter_trigger_windows(msgs, edge=None, trigger_id=None, decoder=None):
+    """
+    Decode messages and slice the CD events at external trigger events.
+
+    The CD events are cut as they are decoded, at every trigger event with
+    matching edge and id, e.g. to align them with the frames of a camera
+    that is triggered by the same signal. Slices extend across message
+    boundaries. Trigger events that do not match are dropped, use
+    WindowedDecoder.set_trigger_window() to get all of them.
+
+    :param msgs: iterable of event packet messages of the same sensor
+    :param edge: edge (field p of the trigger events) to slice at: 0 for rising,
+                 1 for falling, None for any
+    :param trigger_id: id of the trigger events to slice at, None for any
+    :param decoder: WindowedDecoder to use, or None to create a new one.
+    :return: generator of tuples (trigger_event, cd_events) with the CD events
+             since the previous matching trigger event. The CD events after the
+             last trigger event are yielded with trigger_event None.
+    """
+    decoder = WindowedDecoder() if decoder is None else decoder
+    decoder.set_trigger_window(edge, trigger_id)
+    for msg in msgs:
+        decoder.decode(msg)
+        for _, cd, trig in decoder.get_windows():
+            yield trig[-1], cd
+    decoder.flush()
+    for _, cd, trig in decoder.get_windows():
+        # the window has been ended by flush(), not by a trigger
+        yield None, cd
@@ -19,6 +19,7 @@
 #include <event_camera_codecs/decoder.h>
 #include <event_camera_codecs/decoder_factory.h>
 #include <event_camera_codecs/event_packet.h>
+#include <event_camera_py/accumulator_base.h>
 #include <event_camera_py/event_cd.h>
 #include <event_camera_py/event_ext_trig.h>
 #include <pybind11/numpy.h>
@@ -28,97 +29,111 @@
 #include <tuple>
 #include <vector>
 
-class Accumulator : public event_camera_codecs::EventProcessor
+// E is the type of the CD events, EventCD or EventCD64
+template <class E>
+class AccumulatorT : public AccumulatorBase
 {
 public:
+  using EventCDType = E;
+
   // inherited from EventProcessor
   void eventCD(uint64_t sensor_time, uint16_t ex, uint16_t ey, uint8_t polarity) override
   {
-    cdEvents_->push_back(EventCD(ex, ey, polarity, shorten_time(sensor_time)));
-    maxSizeCD_ = std::max(cdEvents_->size(), maxSizeCD_);
+    const E e(ex, ey, polarity, static_cast<decltype(E::t)>(relative_time(sensor_time)));
+    if (numOutCD_ < outCDSize_) {
+      outCD_[numOutCD_++] = e;
+    } else {
+      if (!cdEvents_) {
+        cdEvents_ = new_buffer<E>();  // output buffer has overflowed
+      }
+      cdEvents_->push_back(e);
+      maxSizeCD_ = std::max(cdEvents_->size(), maxSizeCD_);
+    }
     numCDEvents_[std::min(polarity, uint8_t(1))]++;
   }
 
   bool eventExtTrigger(uint64_t sensor_time, uint8_t edge, uint8_t id) override
   {
-    extTrigEvents_->push_back(EventExtTrig(
-      static_cast<int16_t>(edge), static_cast<int64_t>(sensor_time), static_cast<int16_t>(id)));
-    maxSizeExtTrig_ = std::max(extTrigEvents_->size(), maxSizeExtTrig_);
+    const EventExtTrig e(
+      static_cast<int16_t>(edge), static_cast<int64_t>(sensor_time), static_cast<int16_t>(id));
+    if (numOutExtTrig_ < outExtTrigSize_) {
+      outExtTrig_[numOutExtTrig_++] = e;
+    } else {
+      if (!extTrigEvents_) {
+        extTrigEvents_ = new_buffer<EventExtTrig>();  // output buffer has overflowed
+      }
+      extTrigEvents_->push_back(e);
+      maxSizeExtTrig_ = std::max(extTrigEvents_->size(), maxSizeExtTrig_);
+    }
     numExtTrigEvents_[std::min(edge, uint8_t(1))]++;
     return (true);
   }
 
-  void finished() override {}
-  void rawData(const char *, size_t) override {}
-
   // own methods
   void reset_stored_events()
   {
-    delete cdEvents_;  // in case events have not been picked up
-    cdEvents_ = new std::vector<EventCD>();
-    delete extTrigEvents_;  // in case events have not been picked up
-    extTrigEvents_ = new std::vector<EventExtTrig>();
-    // TODO(Bernd): use hack here to avoid initializing the memory
-    cdEvents_->reserve(maxSizeCD_);
-    extTrigEvents_->reserve(maxSizeExtTrig_);
+    release_buffer(cdEvents_);  // in case events have not been picked up
+    release_buffer(extTrigEvents_);
+    if (outCD_ == nullptr) {
+      // when writing to external output buffers, allocate only on overflow
+      cdEvents_ = new_buffer<E>();
+      extTrigEvents_ = new_buffer<EventExtTrig>();
+    }
   }
-  uint64_t get_start_time() const { return (startTime_); }
-  pybind11::array_t<EventCD> get_cd_events()
+  void set_output_buffers(E * cd, size_t cdSize, EventExtTrig * trig, size_t trigSize)
+  {
+    outCD_ = cd;
+    outCDSize_ = cdSize;
+    numOutCD_ = 0;
+    outExtTrig_ = trig;
+    outExtTrigSize_ = trigSize;
+    numOutExtTrig_ = 0;
+  }
+  // returns number of events written to the output buffers
+  std::tuple<size_t, size_t> clear_output_buffers()
+  {
+    const std::tuple<size_t, size_t> n(numOutCD_, numOutExtTrig_);
+    set_output_buffers(nullptr, 0, nullptr, 0);
+    return (n);
+  }
+  pybind11::array_t<E> get_cd_events()
   {
     if (cdEvents_) {
       auto p = cdEvents_;
-      auto cap =
-        pybind11::capsule(p, [](void * v) { delete reinterpret_cast<std::vector<EventCD> *>(v); });
       cdEvents_ = 0;  // clear out
-      return (pybind11::array_t<EventCD>(p->size(), p->data(), cap));
+      return (to_array(p));
     }
-    return (pybind11::array_t<EventCD>());
+    return (pybind11::array_t<E>());
   }
   pybind11::array_t<EventExtTrig> get_ext_trig_events()
   {
     if (extTrigEvents_) {
       auto p = extTrigEvents_;
-      auto cap = pybind11::capsule(
-        p, [](void * v) { delete reinterpret_cast<std::vector<EventExtTrig> *>(v); });
       extTrigEvents_ = 0;  // clear out
-      return (pybind11::array_t<EventExtTrig>(p->size(), p->data(), cap));
+      return (to_array(p));
     }
     return (pybind11::array_t<EventExtTrig>());
   }
 
-  pybind11::list get_cd_event_packets() { return (pybind11::list()); }
-  pybind11::list get_ext_trig_event_packets() { return (pybind11::list()); }
-
-  size_t get_num_cd_off() const { return (numCDEvents_[0]); }
-  size_t get_num_cd_on() const { return (numCDEvents_[1]); }
-  size_t get_num_trigger_rising() const { return (numExtTrigEvents_[0]); }
-  size_t get_num_trigger_falling() const { return (numExtTrigEvents_[1]); }
-  void initialize(uint32_t, uint32_t) {}
-  void setHasSensorTimeSinceEpoch(bool b) { hasSensorTimeSinceEpoch_ = b; }
-  bool has_valid_start_time() const { return (hasStartTime_); }
-  int32_t shorten_time(uint64_t t)
+  size_t get_num_stored_cd_events() const { return (cdEvents_ ? cdEvents_->size() : 0); }
+  size_t get_num_stored_ext_trig_events() const
   {
-    if (hasSensorTimeSinceEpoch_) {
-      if (!hasStartTime_) {
-        startTime_ = t;
-        hasStartTime_ = true;
-      }
-      return (static_cast<int32_t>(t - startTime_));
-    }
-    return (static_cast<int32_t>(t - startTime_));
+    return (extTrigEvents_ ? extTrigEvents_->size() : 0);
   }
 
 private:
   // ------------ variables
-  bool hasStartTime_{false};
-  bool hasSensorTimeSinceEpoch_{false};
-  uint64_t startTime_{0};
-  size_t numCDEvents_[2] = {0, 0};
-  size_t numExtTrigEvents_[2] = {0, 0};
-  std::vector<EventCD> * cdEvents_{0};
+  std::vector<E> * cdEvents_{0};
   std::vector<EventExtTrig> * extTrigEvents_{0};
-  size_t maxSizeCD_{0};
-  size_t maxSizeExtTrig_{0};
+  E * outCD_{nullptr};  // external output buffer for CD events
+  size_t outCDSize_{0};
+  size_t numOutCD_{0};
+  EventExtTrig * outExtTrig_{nullptr};  // external output buffer for trigger events
+  size_t outExtTrigSize_{0};
+  size_t numOutExtTrig_{0};
 };
 
+using Accumulator = AccumulatorT<EventCD>;
+using Accumulator64 = AccumulatorT<EventCD64>;
+
 #endif  // EVENT_CAMERA_PY__ACCUMULATOR_H_
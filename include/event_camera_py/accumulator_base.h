@@ -0,0 +1,151 @@
+// -*-c++-*--------------------------------------------------------------------
+// Copyright 2026 Bernd Pfrommer <bernd.pfrommer@gmail.com>
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#ifndef EVENT_CAMERA_PY__ACCUMULATOR_BASE_H_
+#define EVENT_CAMERA_PY__ACCUMULATOR_BASE_H_
+
+#include <event_camera_codecs/decoder.h>
+#include <event_camera_py/buffer_pool.h>
+#include <event_camera_py/event_cd.h>
+#include <event_camera_py/event_ext_trig.h>
+#include <pybind11/numpy.h>
+#include <pybind11/pybind11.h>
+
+#include <memory>
+#include <stdexcept>
+#include <tuple>
+#include <vector>
+
+// Functionality shared by all accumulators: time stamp handling and
+// event counters. The Decoder template calls the accumulator methods
+// on the concrete type, so derived classes can hide any of the methods
+// below to provide their own implementation.
+class AccumulatorBase : public event_camera_codecs::EventProcessor
+{
+public:
+  // inherited from EventProcessor
+  void finished() override {}
+  void rawData(const char *, size_t) override {}
+
+  // own methods
+  void initialize(uint32_t, uint32_t) {}
+  uint64_t get_start_time() const { return (startTime_); }
+  bool has_valid_start_time() const { return (hasStartTime_); }
+  void setHasSensorTimeSinceEpoch(bool b) { hasSensorTimeSinceEpoch_ = b; }
+
+  pybind11::list get_cd_event_packets() { return (pybind11::list()); }
+  pybind11::list get_ext_trig_event_packets() { return (pybind11::list()); }
+  pybind11::tuple get_cd_event_packets_flat()
+  {
+    return (pybind11::make_tuple(pybind11::array_t<EventCD>(), pybind11::array_t<int64_t>()));
+  }
+
+  template <class E>
+  void set_output_buffers(E *, size_t, EventExtTrig *, size_t)
+  {
+    throw(std::runtime_error("this decoder cannot write to output buffers"));
+  }
+  std::tuple<size_t, size_t> clear_output_buffers() { return {0, 0}; }
+
+  // start time and counters, to checkpoint the decoder
+  pybind11::tuple get_state() const
+  {
+    return (pybind11::make_tuple(
+      hasStartTime_, hasSensorTimeSinceEpoch_, startTime_, numCDEvents_[0], numCDEvents_[1],
+      numExtTrigEvents_[0], numExtTrigEvents_[1]));
+  }
+  void set_state(pybind11::tuple state)
+  {
+    if (state.size() != 7) {
+      throw(std::runtime_error("invalid accumulator state!"));
+    }
+    hasStartTime_ = state[0].cast<bool>();
+    hasSensorTimeSinceEpoch_ = state[1].cast<bool>();
+    startTime_ = state[2].cast<uint64_t>();
+    numCDEvents_[0] = state[3].cast<size_t>();
+    numCDEvents_[1] = state[4].cast<size_t>();
+    numExtTrigEvents_[0] = state[5].cast<size_t>();
+    numExtTrigEvents_[1] = state[6].cast<size_t>();
+  }
+
+  size_t get_num_cd_off() const { return (numCDEvents_[0]); }
+  size_t get_num_cd_on() const { return (numCDEvents_[1]); }
+  size_t get_num_trigger_rising() const { return (numExtTrigEvents_[0]); }
+  size_t get_num_trigger_falling() const { return (numExtTrigEvents_[1]); }
+
+  // buffer statistics
+  size_t get_max_size_cd() const { return (maxSizeCD_); }
+  size_t get_max_size_ext_trig() const { return (maxSizeExtTrig_); }
+  size_t get_num_allocations() const { return (bufferPool_->get_num_allocations()); }
+  BufferPool & get_buffer_pool() { return (*bufferPool_); }
+
+  // event type that decode_into() writes to
+  using EventCDType = EventCD;
+  // whether get_cd_events() returns the events, which decode_many() relies on
+  static constexpr bool hasEventArrays = true;
+
+  int64_t relative_time(uint64_t t)
+  {
+    if (hasSensorTimeSinceEpoch_) {
+      if (!hasStartTime_) {
+        startTime_ = t;
+        hasStartTime_ = true;
+      }
+    }
+    return (static_cast<int64_t>(t - startTime_));
+  }
+
+  int32_t shorten_time(uint64_t t) { return (static_cast<int32_t>(relative_time(t))); }
+
+protected:
+  // returns an empty event buffer from the pool
+  template <class T>
+  BufferPool::Buffer<T> * new_buffer()
+  {
+    return (bufferPool_->get<T>());
+  }
+
+  // returns a buffer that has not been handed to python to the pool
+  template <class B>
+  void release_buffer(B *& p)
+  {
+    if (p) {
+      bufferPool_->put(p);
+      p = nullptr;
+    }
+  }
+
+  // hands the vector over to a numpy array that takes ownership
+  template <class T>
+  pybind11::array_t<T> to_array(std::vector<T> * p)
+  {
+    if (!p) {
+      return (pybind11::array_t<T>());
+    }
+    return (bufferPool_->to_array(p));
+  }
+
+  // ------------ variables
+  bool hasStartTime_{false};
+  bool hasSensorTimeSinceEpoch_{false};
+  uint64_t startTime_{0};
+  size_t numCDEvents_[2] = {0, 0};
+  size_t numExtTrigEvents_[2] = {0, 0};
+  size_t maxSizeCD_{0};       // largest number of CD events stored at a time
+  size_t maxSizeExtTrig_{0};  // largest number of trigger events stored at a time
+  std::shared_ptr<BufferPool> bufferPool_{std::make_shared<BufferPool>()};
+};
+
+#endif  // EVENT_CAMERA_PY__ACCUMULATOR_BASE_H_
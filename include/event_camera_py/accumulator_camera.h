@@ -0,0 +1,95 @@
+// -*-c++-*--------------------------------------------------------------------
+// Copyright 2026 Bernd Pfrommer <bernd.pfrommer@gmail.com>
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#ifndef EVENT_CAMERA_PY__ACCUMULATOR_CAMERA_H_
+#define EVENT_CAMERA_PY__ACCUMULATOR_CAMERA_H_
+
+#include <event_camera_py/accumulator_base.h>
+#include <event_camera_py/event_cd.h>
+#include <event_camera_py/event_ext_trig.h>
+
+#include <algorithm>
+#include <vector>
+
+// Events of one stream that wait to be merged with other streams. The
+// merge consumes the events from the front.
+template <class T>
+struct MergeQueue
+{
+  // drops the events that have been merged
+  void compact()
+  {
+    events.erase(events.begin(), events.begin() + pos);
+    pos = 0;
+  }
+  std::vector<T> events;
+  size_t pos{0};  // first event not yet merged
+  size_t end{0};  // end of the range currently being merged
+};
+
+// Collects the events of one camera of the MultiDecoder. The time stamps
+// are the sensor time plus the time offset of the camera.
+class AccumulatorCamera : public AccumulatorBase
+{
+public:
+  // inherited from EventProcessor
+  void eventCD(uint64_t sensor_time, uint16_t ex, uint16_t ey, uint8_t polarity) override
+  {
+    const int64_t t = static_cast<int64_t>(sensor_time) + timeOffset_;
+    cd_.events.emplace_back(ex, ey, polarity, camera_, t);
+    update_last_time(t);
+    numCDEvents_[std::min(polarity, uint8_t(1))]++;
+  }
+
+  bool eventExtTrigger(uint64_t sensor_time, uint8_t edge, uint8_t id) override
+  {
+    const int64_t t = static_cast<int64_t>(sensor_time) + timeOffset_;
+    extTrig_.events.emplace_back(static_cast<int16_t>(edge), t, static_cast<int16_t>(id), camera_);
+    update_last_time(t);
+    numExtTrigEvents_[std::min(edge, uint8_t(1))]++;
+    return (true);
+  }
+
+  // own methods
+  // the events are kept until they have been merged
+  void reset_stored_events() {}
+
+  void set_camera(uint8_t camera) { camera_ = camera; }
+  void set_time_offset(int64_t offset) { timeOffset_ = offset; }
+  int64_t get_time_offset() const { return (timeOffset_); }
+  bool has_last_time() const { return (hasLastTime_); }
+  int64_t get_last_time() const { return (lastTime_); }
+  MergeQueue<EventCDCamera> & get_cd_queue() { return (cd_); }
+  MergeQueue<EventExtTrigCamera> & get_ext_trig_queue() { return (extTrig_); }
+  size_t get_num_stored_cd_events() const { return (cd_.events.size() - cd_.pos); }
+  size_t get_num_stored_ext_trig_events() const { return (extTrig_.events.size() - extTrig_.pos); }
+
+private:
+  void update_last_time(int64_t t)
+  {
+    lastTime_ = hasLastTime_ ? std::max(t, lastTime_) : t;
+    hasLastTime_ = true;
+  }
+
+  // ------------ variables
+  uint8_t camera_{0};
+  int64_t timeOffset_{0};
+  bool hasLastTime_{false};
+  int64_t lastTime_{0};  // latest time of any event so far
+  MergeQueue<EventCDCamera> cd_;
+  MergeQueue<EventExtTrigCamera> extTrig_;
+};
+
+#endif  // EVENT_CAMERA_PY__ACCUMULATOR_CAMERA_H_
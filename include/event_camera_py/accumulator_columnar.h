@@ -0,0 +1,97 @@
+// -*-c++-*--------------------------------------------------------------------
+// Copyright 2026 Bernd Pfrommer <bernd.pfrommer@gmail.com>
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#ifndef EVENT_CAMERA_PY__ACCUMULATOR_COLUMNAR_H_
+#define EVENT_CAMERA_PY__ACCUMULATOR_COLUMNAR_H_
+
+#include <event_camera_codecs/decoder.h>
+#include <event_camera_codecs/decoder_factory.h>
+#include <event_camera_codecs/event_packet.h>
+#include <event_camera_py/accumulator_base.h>
+#include <event_camera_py/event_columns.h>
+#include <event_camera_py/event_ext_trig.h>
+#include <pybind11/numpy.h>
+#include <pybind11/pybind11.h>
+
+#include <vector>
+
+// Stores the CD events as a struct of arrays, i.e. with separate
+// contiguous arrays for x, y, p, and t. The columns are recycled
+// through the buffer pool, like the event buffers of the other
+// accumulators.
+class AccumulatorColumnar : public AccumulatorBase
+{
+public:
+  // inherited from EventProcessor
+  void eventCD(uint64_t sensor_time, uint16_t ex, uint16_t ey, uint8_t polarity) override
+  {
+    cdEvents_->push_back(ex, ey, static_cast<int8_t>(polarity), shorten_time(sensor_time));
+    numCDEvents_[std::min(polarity, uint8_t(1))]++;
+  }
+
+  bool eventExtTrigger(uint64_t sensor_time, uint8_t edge, uint8_t id) override
+  {
+    extTrigEvents_->push_back(EventExtTrig(
+      static_cast<int16_t>(edge), static_cast<int64_t>(sensor_time), static_cast<int16_t>(id)));
+    maxSizeExtTrig_ = std::max(extTrigEvents_->size(), maxSizeExtTrig_);
+    numExtTrigEvents_[std::min(edge, uint8_t(1))]++;
+    return (true);
+  }
+
+  // own methods
+  void reset_stored_events()
+  {
+    if (cdEvents_) {
+      maxSizeCD_ = std::max(cdEvents_->size(), maxSizeCD_);
+    }
+    release_buffer(cdEvents_);  // in case events have not been picked up
+    cdEvents_ = new_buffer<EventColumns>();
+    release_buffer(extTrigEvents_);  // in case events have not been picked up
+    extTrigEvents_ = new_buffer<EventExtTrig>();
+  }
+
+  pybind11::dict get_cd_events()
+  {
+    EventColumns * p = cdEvents_ ? cdEvents_ : new_buffer<EventColumns>();
+    maxSizeCD_ = std::max(p->size(), maxSizeCD_);
+    cdEvents_ = nullptr;  // clear out
+    // all column arrays share the same capsule, so the columns go back
+    // to the pool once the last of the arrays has been garbage collected
+    return (bufferPool_->to_dict(p));
+  }
+
+  pybind11::array_t<EventExtTrig> get_ext_trig_events()
+  {
+    if (extTrigEvents_) {
+      auto p = extTrigEvents_;
+      extTrigEvents_ = nullptr;  // clear out
+      return (to_array(p));
+    }
+    return (pybind11::array_t<EventExtTrig>());
+  }
+
+  size_t get_num_stored_cd_events() const { return (cdEvents_ ? cdEvents_->size() : 0); }
+  size_t get_num_stored_ext_trig_events() const
+  {
+    return (extTrigEvents_ ? extTrigEvents_->size() : 0);
+  }
+
+private:
+  // ------------ variables
+  EventColumns * cdEvents_{nullptr};
+  std::vector<EventExtTrig> * extTrigEvents_{nullptr};
+};
+
+#endif  // EVENT_CAMERA_PY__ACCUMULATOR_COLUMNAR_H_
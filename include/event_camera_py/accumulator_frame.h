@@ -0,0 +1,157 @@
+// -*-c++-*--------------------------------------------------------------------
+// Copyright 2026 Bernd Pfrommer <bernd.pfrommer@gmail.com>
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#ifndef EVENT_CAMERA_PY__ACCUMULATOR_FRAME_H_
+#define EVENT_CAMERA_PY__ACCUMULATOR_FRAME_H_
+
+#include <event_camera_codecs/decoder.h>
+#include <event_camera_codecs/decoder_factory.h>
+#include <event_camera_codecs/event_packet.h>
+#include <event_camera_py/accumulator_base.h>
+#include <event_camera_py/buffer_view.h>
+#include <event_camera_py/event_cd.h>
+#include <event_camera_py/event_ext_trig.h>
+#include <pybind11/numpy.h>
+#include <pybind11/pybind11.h>
+
+#include <string>
+#include <vector>
+
+// Renders the CD events directly into caller-provided images
+// (event counts and/or time surface) instead of storing them.
+class AccumulatorFrame : public AccumulatorBase
+{
+public:
+  // inherited from EventProcessor
+  void eventCD(uint64_t sensor_time, uint16_t ex, uint16_t ey, uint8_t polarity) override
+  {
+    const uint8_t p = std::min(polarity, uint8_t(1));
+    if (ex < width_ && ey < height_) {
+      const size_t idx = static_cast<size_t>(ey) * width_ + ex;
+      if (counts_.data) {
+        counts_.data[counts_.planeSize * p + idx]++;
+      }
+      if (timeSurface_.data) {
+        timeSurface_.data[timeSurface_.planeSize * p + idx] = static_cast<int64_t>(sensor_time);
+      }
+    }
+    numCDEvents_[p]++;
+  }
+
+  bool eventExtTrigger(uint64_t sensor_time, uint8_t edge, uint8_t id) override
+  {
+    extTrigEvents_->push_back(EventExtTrig(
+      static_cast<int16_t>(edge), static_cast<int64_t>(sensor_time), static_cast<int16_t>(id)));
+    numExtTrigEvents_[std::min(edge, uint8_t(1))]++;
+    return (true);
+  }
+
+  // own methods
+  void initialize(uint32_t width, uint32_t height)
+  {
+    if (width_ == 0) {
+      if (width == 0 || height == 0) {
+        throw(std::runtime_error("bad sensor resolution width or height"));
+      }
+      width_ = width;
+      height_ = height;
+    }
+    counts_.check(width_, height_);
+    timeSurface_.check(width_, height_);
+  }
+
+  void set_count_buffer(pybind11::object counts)
+  {
+    counts_.set(counts, "count buffer", width_, height_);
+  }
+  void set_time_surface_buffer(pybind11::object timeSurface)
+  {
+    timeSurface_.set(timeSurface, "time surface buffer", width_, height_);
+  }
+
+  void reset_stored_events()
+  {
+    release_buffer(extTrigEvents_);  // in case events have not been picked up
+    extTrigEvents_ = new_buffer<EventExtTrig>();
+  }
+
+  pybind11::array_t<EventCD> get_cd_events() { return (pybind11::array_t<EventCD>()); }
+  pybind11::array_t<EventExtTrig> get_ext_trig_events()
+  {
+    if (extTrigEvents_) {
+      auto p = extTrigEvents_;
+      extTrigEvents_ = nullptr;  // clear out
+      return (to_array(p));
+    }
+    return (pybind11::array_t<EventExtTrig>());
+  }
+
+  size_t get_num_stored_cd_events() const { return (0); }
+  size_t get_num_stored_ext_trig_events() const
+  {
+    return (extTrigEvents_ ? extTrigEvents_->size() : 0);
+  }
+
+private:
+  // Image of shape (height, width) or (2, height, width). In the latter case
+  // OFF events go to the first plane, ON events to the second plane.
+  template <class T>
+  struct Image
+  {
+    void set(pybind11::object obj, const std::string & n, uint32_t width, uint32_t height)
+    {
+      if (obj.is_none()) {
+        array = pybind11::array();
+        data = nullptr;
+        return;
+      }
+      pybind11::array a = pybind11::reinterpret_borrow<pybind11::array>(obj);
+      T * d = get_writeable_data<T>(a, n);
+      if (a.ndim() != 2 && !(a.ndim() == 3 && a.shape(0) == 2)) {
+        throw std::runtime_error(n + " must have shape (height, width) or (2, height, width)");
+      }
+      name = n;
+      array = a;  // holds a reference so the memory does not go away
+      data = d;
+      planeSize = a.ndim() == 3 ? static_cast<size_t>(a.shape(1) * a.shape(2)) : 0;
+      check(width, height);
+    }
+    void check(uint32_t width, uint32_t height) const
+    {
+      if (data && width != 0) {
+        const auto nd = array.ndim();
+        if (
+          static_cast<uint32_t>(array.shape(nd - 1)) != width ||
+          static_cast<uint32_t>(array.shape(nd - 2)) != height) {
+          throw std::runtime_error(
+            name + " does not match sensor resolution " + std::to_string(width) + "x" +
+            std::to_string(height));
+        }
+      }
+    }
+    std::string name;
+    pybind11::array array;
+    T * data{nullptr};
+    size_t planeSize{0};
+  };
+  // ------------ variables
+  Image<uint32_t> counts_;
+  Image<int64_t> timeSurface_;
+  std::vector<EventExtTrig> * extTrigEvents_{nullptr};
+  uint32_t width_{0};
+  uint32_t height_{0};
+};
+
+#endif  // EVENT_CAMERA_PY__ACCUMULATOR_FRAME_H_
@@ -19,37 +19,40 @@
 #include <event_camera_codecs/decoder.h>
 #include <event_camera_codecs/decoder_factory.h>
 #include <event_camera_codecs/event_packet.h>
+#include <event_camera_py/accumulator_base.h>
 #include <event_camera_py/event_cd.h>
 #include <event_camera_py/event_ext_trig.h>
+#include <event_camera_py/state_bytes.h>
 #include <pybind11/numpy.h>
 #include <pybind11/pybind11.h>
 
+#include <cstring>
 #include <string>
 #include <tuple>
 #include <vector>
 
-class AccumulatorUnique : public event_camera_codecs::EventProcessor
+class AccumulatorUnique : public AccumulatorBase
 {
 public:
+  static constexpr bool hasEventArrays = false;  // the events come in packets
+
   // inherited from EventProcessor
   void eventCD(uint64_t sensor_time, uint16_t ex, uint16_t ey, uint8_t polarity) override
   {
+    if (!cdEvents_) {
+      cdEvents_ = new_buffer<EventCD>();
+      packetStart_.push_back(0);
+    }
     if (pixelIsSet(ex, ey)) {
-      // an event already happend at this location, clear the image and create
+      // an event already happend at this location, clear the image and start
       // a new packet
       clearImage();
-      setPixel(ex, ey);  // mark the pixel in the freshly cleaned image
-      cdEvents_.push_back(new std::vector<EventCD>());
-      cdEvents_.back()->reserve(maxSizeCD_);
-    } else {
-      setPixel(ex, ey);
-    }
-    if (cdEvents_.empty()) {
-      cdEvents_.push_back(new std::vector<EventCD>());
+      if (static_cast<int64_t>(cdEvents_->size()) > packetStart_.back()) {
+        packetStart_.push_back(static_cast<int64_t>(cdEvents_->size()));
+      }
     }
-    cdEvents_.back()->push_back(EventCD(ex, ey, polarity, shorten_time(sensor_time)));
-
-    maxSizeCD_ = std::max(cdEvents_.back()->size(), maxSizeCD_);
+    setPixel(ex, ey);
+    cdEvents_->push_back(EventCD(ex, ey, polarity, shorten_time(sensor_time)));
     numCDEvents_[std::min(polarity, uint8_t(1))]++;
   }
 
@@ -58,31 +61,28 @@ public:
     // It is not yet clear what a good policy would be for the external triggers,
     // so just pass all of them in a single packet.
     if (extTrigEvents_.empty()) {
-      extTrigEvents_.push_back(new std::vector<EventExtTrig>());
-      extTrigEvents_.back()->reserve(maxSizeExtTrig_);
+      extTrigEvents_.push_back(new_buffer<EventExtTrig>());
     }
     extTrigEvents_.back()->push_back(EventExtTrig(
       static_cast<int16_t>(edge), static_cast<int64_t>(sensor_time), static_cast<int16_t>(id)));
+    numStoredExtTrigEvents_++;
 
     maxSizeExtTrig_ = std::max(extTrigEvents_.back()->size(), maxSizeExtTrig_);
     numExtTrigEvents_[std::min(edge, uint8_t(1))]++;
     return (true);
   }
-  void finished() override {}
-  void rawData(const char *, size_t) override {}
 
   void reset_stored_events()
   {
-    // In case nobody has ever picked up the packets, delete them since
+    // In case nobody has ever picked up the packets, recycle them since
     // no python object holds a pointer to it.
-    for (auto & p : cdEvents_) {
-      delete p;
-    }
-    cdEvents_.clear();
+    release_buffer(cdEvents_);
+    packetStart_.clear();
     for (auto & p : extTrigEvents_) {
-      delete p;
+      release_buffer(p);
     }
     extTrigEvents_.clear();
+    numStoredExtTrigEvents_ = 0;
   }
 
   pybind11::array_t<EventCD> get_cd_events() { return (pybind11::array_t<EventCD>()); }
@@ -97,9 +97,7 @@ public:
   {
     pybind11::list packetList;
     for (auto & p : *pkts) {
-      auto cap =
-        pybind11::capsule(p, [](void * v) { delete reinterpret_cast<std::vector<EventT> *>(v); });
-      packetList.append(pybind11::array_t<EventT>(p->size(), p->data(), cap));
+      packetList.append(to_array(p));
       // now throw away the pointer without deleting the memory, since
       // a python object now will manage the memory
       p = nullptr;
@@ -110,14 +108,18 @@ public:
 
   bool pixelIsSet(uint16_t ex, uint16_t ey) const
   {
-    const uint32_t offset = (ey * width_ + ex) / 8;
-    return (image_[offset] & (1 << (ex % 8)));
+    const uint32_t idx = ey * width_ + ex;
+    return (image_[idx / 8] & (1 << (idx % 8)));
   }
 
   void setPixel(uint16_t ex, uint16_t ey)
   {
-    const uint32_t offset = (ey * width_ + ex) / 8;
-    image_[offset] |= (1 << (ex % 8));
+    const uint32_t idx = ey * width_ + ex;
+    uint8_t & b = image_[idx / 8];
+    if (b == 0 && !fullClear_) {
+      dirty_.push_back(idx / 8);  // remember which bytes to clear
+    }
+    b |= (1 << (idx % 8));
   }
 
   void initialize(uint32_t width, uint32_t height)
@@ -131,43 +133,109 @@ public:
     }
   }
 
-  void clearImage() { memset(image_.data(), 0, image_.size()); }
+  // Only clears the bytes that have been touched since the last clear,
+  // so the cost is proportional to the packet size, not the sensor size.
+  void clearImage()
+  {
+    if (fullClear_) {
+      memset(image_.data(), 0, image_.size());
+      return;
+    }
+    for (const auto & offset : dirty_) {
+      image_[offset] = 0;
+    }
+    dirty_.clear();
+  }
 
-  uint64_t get_start_time() const { return (startTime_); }
-  bool has_valid_start_time() const { return (hasStartTime_); }
-  pybind11::list get_cd_event_packets() { return (get_event_packets(&cdEvents_)); }
-  pybind11::list get_ext_trig_event_packets() { return (get_event_packets(&extTrigEvents_)); }
+  pybind11::list get_cd_event_packets()
+  {
+    // the packets are views into a single array
+    auto [events, offsets] = take_cd_event_packets();
+    pybind11::list packetList;
+    const int64_t * off = offsets.data();
+    for (pybind11::ssize_t i = 0; i + 1 < offsets.size(); i++) {
+      packetList.append(events[pybind11::slice(off[i], off[i + 1], 1)]);
+    }
+    return (packetList);
+  }
 
-  size_t get_num_cd_off() const { return (numCDEvents_[0]); }
-  size_t get_num_cd_on() const { return (numCDEvents_[1]); }
-  size_t get_num_trigger_rising() const { return (numExtTrigEvents_[0]); }
-  size_t get_num_trigger_falling() const { return (numExtTrigEvents_[1]); }
-  void setHasSensorTimeSinceEpoch(bool b) { hasSensorTimeSinceEpoch_ = b; }
-  int32_t shorten_time(uint64_t t)
+  pybind11::tuple get_cd_event_packets_flat()
   {
-    if (hasSensorTimeSinceEpoch_) {
-      if (!hasStartTime_) {
-        startTime_ = t;
-        hasStartTime_ = true;
+    auto [events, offsets] = take_cd_event_packets();
+    return (pybind11::make_tuple(events, offsets));
+  }
+
+  pybind11::list get_ext_trig_event_packets()
+  {
+    numStoredExtTrigEvents_ = 0;
+    return (get_event_packets(&extTrigEvents_));
+  }
+  // the pixels of the current packet carry over to the next message
+  pybind11::tuple get_state() const
+  {
+    return (pybind11::make_tuple(
+      AccumulatorBase::get_state(), width_, to_state_bytes(image_), to_state_bytes(dirty_),
+      fullClear_));
+  }
+  void set_state(pybind11::tuple state)
+  {
+    if (state.size() != 5) {
+      throw(std::runtime_error("invalid unique accumulator state!"));
+    }
+    AccumulatorBase::set_state(state[0].cast<pybind11::tuple>());
+    width_ = state[1].cast<uint32_t>();
+    from_state_bytes(state[2], &image_);
+    from_state_bytes(state[3], &dirty_);
+    fullClear_ = state[4].cast<bool>();
+  }
+
+  // clear the whole image when starting a packet, as older releases did.
+  // Only useful for benchmarking.
+  void set_full_clear(bool fullClear)
+  {
+    dirty_.clear();
+    if (!fullClear) {
+      // keep the current packet, but track the bytes it has set so far
+      for (size_t i = 0; i < image_.size(); i++) {
+        if (image_[i] != 0) {
+          dirty_.push_back(static_cast<uint32_t>(i));
+        }
       }
-      return (static_cast<int32_t>(t - startTime_));
     }
-    return (static_cast<int32_t>(t - startTime_));
+    fullClear_ = fullClear;
   }
+  size_t get_num_stored_cd_events() const { return (cdEvents_ ? cdEvents_->size() : 0); }
+  size_t get_num_stored_ext_trig_events() const { return (numStoredExtTrigEvents_); }
 
 private:
+  // hands over the CD events and the packet offsets in CSR layout, i.e. the
+  // last offset is the total number of events
+  std::tuple<pybind11::array_t<EventCD>, pybind11::array_t<int64_t>> take_cd_event_packets()
+  {
+    if (!cdEvents_) {
+      pybind11::array_t<int64_t> offsets(1);
+      offsets.mutable_data()[0] = 0;
+      return {pybind11::array_t<EventCD>(0), offsets};
+    }
+    maxSizeCD_ = std::max(cdEvents_->size(), maxSizeCD_);
+    packetStart_.push_back(static_cast<int64_t>(cdEvents_->size()));
+    pybind11::array_t<int64_t> offsets(packetStart_.size(), packetStart_.data());
+    auto events = to_array(cdEvents_);
+    // python now owns the memory
+    cdEvents_ = nullptr;
+    packetStart_.clear();
+    return {events, offsets};
+  }
+
   // ------------ variables
-  bool hasStartTime_{false};
-  bool hasSensorTimeSinceEpoch_{false};
-  uint64_t startTime_{0};
-  size_t numCDEvents_[2] = {0, 0};
-  size_t numExtTrigEvents_[2] = {0, 0};
-  std::vector<std::vector<EventCD> *> cdEvents_;
+  size_t numStoredExtTrigEvents_{0};
+  std::vector<EventCD> * cdEvents_{nullptr};  // all packets, back to back
+  std::vector<int64_t> packetStart_;          // index of first event of each packet
   std::vector<std::vector<EventExtTrig> *> extTrigEvents_;
-  size_t maxSizeCD_{0};
-  size_t maxSizeExtTrig_{0};
   std::vector<uint8_t> image_;
+  std::vector<uint32_t> dirty_;  // offsets of non-zero bytes in image_
   uint32_t width_{0};
+  bool fullClear_{false};
 };
 
 #endif  // EVENT_CAMERA_PY__ACCUMULATOR_UNIQUE_H_
@@ -0,0 +1,262 @@
+// -*-c++-*--------------------------------------------------------------------
+// Copyright 2026 Bernd Pfrommer <bernd.pfrommer@gmail.com>
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#ifndef EVENT_CAMERA_PY__ACCUMULATOR_WINDOW_H_
+#define EVENT_CAMERA_PY__ACCUMULATOR_WINDOW_H_
+
+#include <event_camera_codecs/decoder.h>
+#include <event_camera_codecs/decoder_factory.h>
+#include <event_camera_codecs/event_packet.h>
+#include <event_camera_py/accumulator_base.h>
+#include <event_camera_py/event_cd.h>
+#include <event_camera_py/event_ext_trig.h>
+#include <pybind11/numpy.h>
+#include <pybind11/pybind11.h>
+
+#include <limits>
+#include <optional>
+#include <vector>
+
+// Slices the event stream into windows of either fixed duration, fixed
+// number of CD events, or between external trigger events. Windows extend
+// across message boundaries,
+// so every message is decoded exactly once, and the partial window at
+// the end of a message is carried over to the next message.
+class AccumulatorWindow : public AccumulatorBase
+{
+public:
+  ~AccumulatorWindow()
+  {
+    for (auto & w : windows_) {
+      clear_window(&w);
+    }
+    clear_window(&current_);
+  }
+
+  // inherited from EventProcessor
+  void eventCD(uint64_t sensor_time, uint16_t ex, uint16_t ey, uint8_t polarity) override
+  {
+    numCDEvents_[std::min(polarity, uint8_t(1))]++;
+    if (sensor_time >= windowEnd_ && !advance_window(sensor_time)) {
+      return;  // event is before start of first window
+    }
+    if (!current_.cd) {
+      current_.cd = new_buffer<EventCD>();
+      // for count windows this allocates exactly the final size
+      current_.cd->reserve(count_);
+    }
+    current_.cd->push_back(EventCD(ex, ey, polarity, shorten_time(sensor_time)));
+    maxSizeCD_ = std::max(current_.cd->size(), maxSizeCD_);
+    numStoredCDEvents_++;
+    if (current_.cd->size() == count_) {  // never true for time windows
+      end_count_window();
+    }
+  }
+
+  bool eventExtTrigger(uint64_t sensor_time, uint8_t edge, uint8_t id) override
+  {
+    numExtTrigEvents_[std::min(edge, uint8_t(1))]++;
+    if (sensor_time >= windowEnd_ && !advance_window(sensor_time)) {
+      return (true);
+    }
+    if (!current_.trig) {
+      current_.trig = new_buffer<EventExtTrig>();
+    }
+    current_.trig->push_back(EventExtTrig(
+      static_cast<int16_t>(edge), static_cast<int64_t>(sensor_time), static_cast<int16_t>(id)));
+    numStoredExtTrigEvents_++;
+    if (isTriggerWindow_ && is_window_trigger(edge, id)) {
+      // the trigger ends the window, and its time starts the next one
+      end_count_window();
+      windowStart_ = sensor_time;
+      hasWindow_ = true;
+      windowEnd_ = std::numeric_limits<uint64_t>::max();
+    }
+    return (true);
+  }
+
+  // own methods
+  void initialize(uint32_t, uint32_t)
+  {
+    if (length_ == 0 && count_ == 0 && !isTriggerWindow_) {
+      throw(std::runtime_error("window length, count, or trigger not set!"));
+    }
+  }
+
+  // windows are kept until picked up, so there is nothing to reset here
+  void reset_stored_events() {}
+
+  void set_time_window(uint64_t length, std::optional<uint64_t> startTime)
+  {
+    if (length == 0) {
+      throw(std::runtime_error("window length must be positive!"));
+    }
+    clear_windows();
+    length_ = length;
+    count_ = 0;
+    isTriggerWindow_ = false;
+    hasWindow_ = false;
+    windowEnd_ = 0;  // first event will start a window
+    userStartTime_ = startTime;
+  }
+
+  void set_count_window(size_t count)
+  {
+    if (count == 0) {
+      throw(std::runtime_error("window count must be positive!"));
+    }
+    clear_windows();
+    length_ = 0;
+    count_ = count;
+    isTriggerWindow_ = false;
+    hasWindow_ = false;
+    windowEnd_ = 0;  // first event will start a window
+    userStartTime_.reset();
+  }
+
+  void set_trigger_window(std::optional<uint8_t> edge, std::optional<uint8_t> id)
+  {
+    clear_windows();
+    length_ = 0;
+    count_ = 0;
+    isTriggerWindow_ = true;
+    triggerEdge_ = edge;
+    triggerId_ = id;
+    hasWindow_ = false;
+    windowEnd_ = 0;  // first event will start a window
+    userStartTime_.reset();
+  }
+
+  // Ends the current window even though it is incomplete,
+  // typically called when the end of the stream has been reached.
+  void flush()
+  {
+    if (current_.cd || current_.trig) {
+      if (count_ != 0 || isTriggerWindow_) {
+        end_count_window();
+      } else {
+        close_window();
+        windowStart_ += length_;
+        windowEnd_ = windowStart_ + length_;
+      }
+    }
+  }
+
+  pybind11::list get_windows()
+  {
+    pybind11::list windows;
+    for (auto & w : windows_) {
+      numStoredCDEvents_ -= w.cd ? w.cd->size() : 0;
+      numStoredExtTrigEvents_ -= w.trig ? w.trig->size() : 0;
+      windows.append(pybind11::make_tuple(w.startTime, to_array(w.cd), to_array(w.trig)));
+      w.cd = nullptr;  // python now owns the memory
+      w.trig = nullptr;
+    }
+    windows_.clear();
+    return (windows);
+  }
+
+  pybind11::array_t<EventCD> get_cd_events() { return (pybind11::array_t<EventCD>()); }
+  pybind11::array_t<EventExtTrig> get_ext_trig_events()
+  {
+    return (pybind11::array_t<EventExtTrig>());
+  }
+  size_t get_num_stored_cd_events() const { return (numStoredCDEvents_); }
+  size_t get_num_stored_ext_trig_events() const { return (numStoredExtTrigEvents_); }
+
+private:
+  struct Window
+  {
+    uint64_t startTime{0};
+    std::vector<EventCD> * cd{nullptr};  // null if window has no CD events
+    std::vector<EventExtTrig> * trig{nullptr};
+  };
+
+  // returns false if time is before the start of the first window
+  bool advance_window(uint64_t t)
+  {
+    if (!hasWindow_) {
+      windowStart_ = userStartTime_ ? *userStartTime_ : t;
+      if (t < windowStart_) {
+        return (false);
+      }
+      hasWindow_ = true;
+    }
+    if (count_ != 0 || isTriggerWindow_) {
+      // count and trigger windows are only ended by events
+      windowEnd_ = std::numeric_limits<uint64_t>::max();
+      return (true);
+    }
+    while (t >= windowStart_ + length_) {
+      close_window();  // also produces empty windows for gaps in the data
+      windowStart_ += length_;
+    }
+    windowEnd_ = windowStart_ + length_;
+    return (true);
+  }
+
+  void close_window()
+  {
+    current_.startTime = windowStart_;
+    windows_.push_back(current_);
+    current_ = Window();
+  }
+
+  void end_count_window()
+  {
+    close_window();
+    hasWindow_ = false;
+    windowEnd_ = 0;  // next event starts a new window
+  }
+
+  bool is_window_trigger(uint8_t edge, uint8_t id) const
+  {
+    return ((!triggerEdge_ || *triggerEdge_ == edge) && (!triggerId_ || *triggerId_ == id));
+  }
+
+  void clear_window(Window * w)
+  {
+    release_buffer(w->cd);
+    release_buffer(w->trig);
+  }
+
+  void clear_windows()
+  {
+    for (auto & w : windows_) {
+      clear_window(&w);
+    }
+    windows_.clear();
+    clear_window(&current_);
+    numStoredCDEvents_ = 0;
+    numStoredExtTrigEvents_ = 0;
+  }
+
+  // ------------ variables
+  uint64_t length_{0};                  // window duration, zero for count windows
+  size_t count_{0};                     // events per window, zero for time windows
+  bool isTriggerWindow_{false};         // windows end with a trigger event
+  std::optional<uint8_t> triggerEdge_;  // edge of the triggers that end windows, or any
+  std::optional<uint8_t> triggerId_;    // id of the triggers that end windows, or any
+  std::optional<uint64_t> userStartTime_;
+  bool hasWindow_{false};
+  uint64_t windowStart_{0};
+  uint64_t windowEnd_{0};
+  Window current_;
+  std::vector<Window> windows_;  // completed windows
+  size_t numStoredCDEvents_{0};
+  size_t numStoredExtTrigEvents_{0};
+};
+
+#endif  // EVENT_CAMERA_PY__ACCUMULATOR_WINDOW_H_
@@ -0,0 +1,294 @@
+// -*-c++-*--------------------------------------------------------------------
+// Copyright 2026 Bernd Pfrommer <bernd.pfrommer@gmail.com>
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#ifndef EVENT_CAMERA_PY__BUFFER_POOL_H_
+#define EVENT_CAMERA_PY__BUFFER_POOL_H_
+
+#include <event_camera_py/event_cd.h>
+#include <event_camera_py/event_columns.h>
+#include <event_camera_py/event_ext_trig.h>
+#include <pybind11/numpy.h>
+#include <pybind11/pybind11.h>
+
+#include <algorithm>
+#include <cstddef>
+#include <memory>
+#include <mutex>
+#include <type_traits>
+#include <unordered_map>
+#include <vector>
+
+// Pool of event buffers. The buffers are handed to numpy without a copy,
+// and return to the pool once numpy has garbage collected the array, so
+// later messages can reuse them. New buffers are reserved with a decaying
+// estimate of the recent buffer sizes rather than the all-time maximum,
+// and buffers that are oversized for the current rate are freed, such
+// that the memory shrinks again after a burst.
+//
+// The capsules of the numpy arrays hold a reference to the pool, so the pool
+// may outlive the decoder. Arrays can be garbage collected while the decoder
+// runs without the GIL, therefore all methods lock the pool.
+class BufferPool : public std::enable_shared_from_this<BufferPool>
+{
+public:
+  // the columnar CD events are pooled as a whole, all other events as vectors
+  template <class T>
+  using Buffer = std::conditional_t<std::is_same_v<T, EventColumns>, EventColumns, std::vector<T>>;
+
+  BufferPool() = default;
+  BufferPool(const BufferPool &) = delete;
+  BufferPool & operator=(const BufferPool &) = delete;
+  ~BufferPool()
+  {
+    free_all(&cd_);
+    free_all(&cd64_);
+    free_all(&extTrig_);
+    free_all(&columns_);
+  }
+
+  void set_limits(size_t maxPooledBytes, size_t maxPooledBuffers, double decay)
+  {
+    const std::lock_guard<std::mutex> lock(mutex_);
+    maxPooledBytes_ = maxPooledBytes;
+    maxPooledBuffers_ = maxPooledBuffers;
+    decay_ = decay;
+    trim(&cd_);
+    trim(&cd64_);
+    trim(&extTrig_);
+    trim(&columns_);
+  }
+
+  // returns an empty buffer, reserved for the expected number of events
+  template <class T>
+  Buffer<T> * get()
+  {
+    const std::lock_guard<std::mutex> lock(mutex_);
+    auto & s = slot<T>();
+    while (!s.free.empty()) {
+      Buffer<T> * v = s.free.back();
+      s.free.pop_back();
+      pooledBytes_ -= bytes_[v];
+      if (!is_oversized(s, v)) {
+        numReused_++;
+        return (v);
+      }
+      erase(v);
+    }
+    auto v = new Buffer<T>();
+    v->reserve(static_cast<size_t>(s.expectedSize));
+    numAllocations_++;
+    track(v);
+    return (v);
+  }
+
+  // takes back a buffer that is no longer needed
+  template <class T>
+  void put(std::vector<T> * v)
+  {
+    put_buffer<T>(v);
+  }
+  void put(EventColumns * v) { put_buffer<EventColumns>(v); }
+
+  // hands the buffer over to a numpy array. Once the array has been
+  // garbage collected, the buffer goes back to the pool.
+  template <class T>
+  pybind11::array_t<T> to_array(std::vector<T> * v)
+  {
+    {
+      const std::lock_guard<std::mutex> lock(mutex_);
+      update_expected_size(&slot<T>(), v->size());
+      track(v);
+    }
+    auto h = new Handle<T>{v, shared_from_this()};
+    auto cap = pybind11::capsule(h, [](void * p) {
+      auto h = reinterpret_cast<Handle<T> *>(p);
+      h->pool->put(h->buffer);
+      delete h;
+    });
+    return (pybind11::array_t<T>(v->size(), v->data(), cap));
+  }
+
+  // same as to_array(), but hands each column over to its own numpy array.
+  // The buffer goes back to the pool once all of the arrays are gone.
+  pybind11::dict to_dict(EventColumns * v)
+  {
+    {
+      const std::lock_guard<std::mutex> lock(mutex_);
+      update_expected_size(&columns_, v->size());
+      track(v);
+    }
+    auto h = new Handle<EventColumns>{v, shared_from_this()};
+    auto cap = pybind11::capsule(h, [](void * p) {
+      auto h = reinterpret_cast<Handle<EventColumns> *>(p);
+      h->pool->put(h->buffer);
+      delete h;
+    });
+    pybind11::dict d;
+    d["x"] = pybind11::array_t<uint16_t>(v->x.size(), v->x.data(), cap);
+    d["y"] = pybind11::array_t<uint16_t>(v->y.size(), v->y.data(), cap);
+    d["p"] = pybind11::array_t<int8_t>(v->p.size(), v->p.data(), cap);
+    d["t"] = pybind11::array_t<int32_t>(v->t.size(), v->t.data(), cap);
+    return (d);
+  }
+
+  pybind11::dict get_memory_usage()
+  {
+    const std::lock_guard<std::mutex> lock(mutex_);
+    pybind11::dict d;
+    d["current"] = currentBytes_;
+    d["peak"] = peakBytes_;
+    d["pooled"] = pooledBytes_;
+    d["num_buffers"] = bytes_.size();
+    d["num_pooled"] =
+      cd_.free.size() + cd64_.free.size() + extTrig_.free.size() + columns_.free.size();
+    d["num_reused"] = numReused_;
+    return (d);
+  }
+  void reset_peak()
+  {
+    const std::lock_guard<std::mutex> lock(mutex_);
+    peakBytes_ = currentBytes_;
+  }
+  size_t get_num_allocations()
+  {
+    const std::lock_guard<std::mutex> lock(mutex_);
+    return (numAllocations_);
+  }
+
+private:
+  template <class T>
+  struct Slot
+  {
+    std::vector<Buffer<T> *> free;
+    double expectedSize{0};  // decaying maximum of the recent buffer sizes
+  };
+  template <class T>
+  struct Handle
+  {
+    Buffer<T> * buffer;
+    std::shared_ptr<BufferPool> pool;
+  };
+
+  template <class T>
+  Slot<T> & slot()
+  {
+    if constexpr (std::is_same_v<T, EventCD>) {
+      return (cd_);
+    } else if constexpr (std::is_same_v<T, EventCD64>) {
+      return (cd64_);
+    } else if constexpr (std::is_same_v<T, EventColumns>) {
+      return (columns_);
+    } else {
+      static_assert(std::is_same_v<T, EventExtTrig>, "no buffer pool for this type");
+      return (extTrig_);
+    }
+  }
+
+  template <class T>
+  void put_buffer(Buffer<T> * v)
+  {
+    const std::lock_guard<std::mutex> lock(mutex_);
+    auto & s = slot<T>();
+    track(v);
+    const size_t b = bytes_[v];
+    if (
+      s.free.size() < maxPooledBuffers_ && pooledBytes_ + b <= maxPooledBytes_ &&
+      !is_oversized(s, v)) {
+      v->clear();
+      s.free.push_back(v);
+      pooledBytes_ += b;
+    } else {
+      erase(v);
+    }
+  }
+
+  template <class T>
+  void update_expected_size(Slot<T> * s, size_t size)
+  {
+    s->expectedSize = std::max(static_cast<double>(size), s->expectedSize * decay_);
+  }
+
+  // a buffer is oversized if it has more than twice the expected capacity
+  template <class T>
+  static bool is_oversized(const Slot<T> & s, const Buffer<T> * v)
+  {
+    return (v->capacity() > 2 * std::max(static_cast<size_t>(s.expectedSize), minCapacity));
+  }
+
+  template <class T>
+  static size_t capacity_bytes(const std::vector<T> * v)
+  {
+    return (v->capacity() * sizeof(T));
+  }
+  static size_t capacity_bytes(const EventColumns * v) { return (v->capacity_bytes()); }
+
+  // updates the memory accounting, buffers may have grown since the last call
+  template <class B>
+  void track(const B * v)
+  {
+    size_t & b = bytes_[v];
+    const size_t newBytes = capacity_bytes(v);
+    currentBytes_ = currentBytes_ + newBytes - b;
+    peakBytes_ = std::max(peakBytes_, currentBytes_);
+    b = newBytes;
+  }
+
+  template <class B>
+  void erase(B * v)
+  {
+    currentBytes_ -= bytes_[v];
+    bytes_.erase(v);
+    delete v;
+  }
+
+  template <class T>
+  void trim(Slot<T> * s)
+  {
+    while (!s->free.empty() &&
+           (s->free.size() > maxPooledBuffers_ || pooledBytes_ > maxPooledBytes_)) {
+      pooledBytes_ -= bytes_[s->free.back()];
+      erase(s->free.back());
+      s->free.pop_back();
+    }
+  }
+
+  template <class T>
+  static void free_all(Slot<T> * s)
+  {
+    for (auto v : s->free) {
+      delete v;
+    }
+    s->free.clear();
+  }
+
+  // ------------ variables
+  static constexpr size_t minCapacity = 1024;  // small buffers are never oversized
+  std::mutex mutex_;
+  Slot<EventCD> cd_;
+  Slot<EventCD64> cd64_;
+  Slot<EventExtTrig> extTrig_;
+  Slot<EventColumns> columns_;
+  std::unordered_map<const void *, size_t> bytes_;  // bytes accounted for each live buffer
+  size_t currentBytes_{0};
+  size_t peakBytes_{0};
+  size_t pooledBytes_{0};
+  size_t maxPooledBytes_{32 << 20};
+  size_t maxPooledBuffers_{8};
+  double decay_{0.9};
+  size_t numAllocations_{0};
+  size_t numReused_{0};
+};
+
+#endif  // EVENT_CAMERA_PY__BUFFER_POOL_H_
@@ -0,0 +1,72 @@
+// -*-c++-*--------------------------------------------------------------------
+// Copyright 2026 Bernd Pfrommer <bernd.pfrommer@gmail.com>
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#ifndef EVENT_CAMERA_PY__BUFFER_VIEW_H_
+#define EVENT_CAMERA_PY__BUFFER_VIEW_H_
+
+#include <pybind11/numpy.h>
+#include <pybind11/pybind11.h>
+
+#include <cstdint>
+#include <stdexcept>
+#include <string>
+
+// Read-only view of a python object that supports the buffer protocol
+// (bytes, array.array, numpy array...). The view keeps the underlying
+// memory alive until it is destroyed. Must be created and destroyed
+// while holding the GIL, but the data can be accessed without it.
+class BufferView
+{
+public:
+  explicit BufferView(pybind11::handle obj)
+  {
+    if (PyObject_GetBuffer(obj.ptr(), &view_, PyBUF_CONTIG_RO) != 0) {
+      throw std::runtime_error("cannot convert events to byte buffer");
+    }
+    valid_ = true;
+  }
+  BufferView(BufferView && v) noexcept : view_(v.view_), valid_(v.valid_) { v.valid_ = false; }
+  BufferView(const BufferView &) = delete;
+  BufferView & operator=(const BufferView &) = delete;
+  BufferView & operator=(BufferView &&) = delete;
+  ~BufferView()
+  {
+    if (valid_) {
+      PyBuffer_Release(&view_);
+    }
+  }
+  const uint8_t * data() const { return (reinterpret_cast<const uint8_t *>(view_.buf)); }
+  size_t size() const { return (static_cast<size_t>(view_.len)); }
+
+private:
+  Py_buffer view_;
+  bool valid_{false};
+};
+
+// Returns pointer to the memory of a writeable, C-contiguous numpy array of type T.
+// Must check explicitly, else pybind11 could silently write to a converted copy.
+template <class T>
+T * get_writeable_data(pybind11::array & a, const std::string & name)
+{
+  if (!pybind11::array_t<T, pybind11::array::c_style>::check_(a)) {
+    throw std::runtime_error(name + " must be contiguous array of matching dtype");
+  }
+  if (!a.writeable()) {
+    throw std::runtime_error(name + " is not writeable");
+  }
+  return (static_cast<T *>(a.mutable_data()));
+}
+
+#endif  // EVENT_CAMERA_PY__BUFFER_VIEW_H_
@@ -0,0 +1,133 @@
+// -*-c++-*--------------------------------------------------------------------
+// Copyright 2026 Bernd Pfrommer <bernd.pfrommer@gmail.com>
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#ifndef EVENT_CAMERA_PY__CDR_EVENT_PACKET_H_
+#define EVENT_CAMERA_PY__CDR_EVENT_PACKET_H_
+
+#include <cstdint>
+#include <cstring>
+#include <stdexcept>
+#include <string>
+#include <utility>
+
+// Fields of a serialized event_camera_msgs/msg/EventPacket that are needed
+// for decoding. The events point into the serialized buffer.
+struct CdrEventPacket
+{
+  std::string encoding;
+  uint32_t width{0};
+  uint32_t height{0};
+  uint64_t timeBase{0};
+  const uint8_t * events{nullptr};
+  size_t eventsSize{0};
+};
+
+// Minimal reader for the CDR format used by ROS2 for serialized messages.
+class CdrReader
+{
+public:
+  CdrReader(const uint8_t * buf, size_t size) : buf_(buf), size_(size)
+  {
+    // 4 byte encapsulation header: 0x00 0x00 is big, 0x00 0x01 is little endian
+    if (size < 4 || buf[0] != 0 || buf[1] > 1) {
+      throw std::runtime_error("serialized message has no valid CDR header!");
+    }
+    swap_ = (buf[1] == 1) != isLittleEndian();
+    pos_ = 4;
+  }
+
+  template <class T>
+  T read()
+  {
+    align(sizeof(T));
+    check(sizeof(T));
+    T v;
+    memcpy(&v, buf_ + pos_, sizeof(T));
+    pos_ += sizeof(T);
+    return (swap_ ? byte_swap(v) : v);
+  }
+
+  std::string read_string()
+  {
+    const uint32_t len = read<uint32_t>();  // includes the terminating null
+    check(len);
+    const std::string s(reinterpret_cast<const char *>(buf_ + pos_), len > 0 ? len - 1 : 0);
+    pos_ += len;
+    return (s);
+  }
+
+  // returns pointer into the buffer, no copy is made
+  const uint8_t * read_bytes(size_t * len)
+  {
+    *len = read<uint32_t>();
+    check(*len);
+    const uint8_t * p = buf_ + pos_;
+    pos_ += *len;
+    return (p);
+  }
+
+private:
+  static bool isLittleEndian()
+  {
+    const uint16_t one = 1;
+    return (*reinterpret_cast<const uint8_t *>(&one) == 1);
+  }
+
+  template <class T>
+  static T byte_swap(T v)
+  {
+    uint8_t b[sizeof(T)];
+    memcpy(b, &v, sizeof(T));
+    for (size_t i = 0; i < sizeof(T) / 2; i++) {
+      std::swap(b[i], b[sizeof(T) - 1 - i]);
+    }
+    memcpy(&v, b, sizeof(T));
+    return (v);
+  }
+
+  // alignment is relative to the end of the encapsulation header
+  void align(size_t n) { pos_ = 4 + ((pos_ - 4 + n - 1) / n) * n; }
+
+  void check(size_t n) const
+  {
+    if (pos_ + n > size_) {
+      throw std::runtime_error("serialized message is truncated!");
+    }
+  }
+
+  const uint8_t * buf_;
+  size_t size_;
+  size_t pos_{0};
+  bool swap_{false};
+};
+
+inline CdrEventPacket parse_cdr_event_packet(const uint8_t * buf, size_t size)
+{
+  CdrReader r(buf, size);
+  CdrEventPacket p;
+  r.read<int32_t>();   // header.stamp.sec
+  r.read<uint32_t>();  // header.stamp.nanosec
+  r.read_string();     // header.frame_id
+  p.height = r.read<uint32_t>();
+  p.width = r.read<uint32_t>();
+  r.read<uint64_t>();  // seq
+  p.timeBase = r.read<uint64_t>();
+  p.encoding = r.read_string();
+  r.read<uint8_t>();  // is_bigendian
+  p.events = r.read_bytes(&p.eventsSize);
+  return (p);
+}
+
+#endif  // EVENT_CAMERA_PY__CDR_EVENT_PACKET_H_
@@ -19,12 +19,20 @@
 #include <event_camera_codecs/decoder.h>
 #include <event_camera_codecs/decoder_factory.h>
 #include <event_camera_codecs/event_packet.h>
+#include <event_camera_py/buffer_view.h>
+#include <event_camera_py/cdr_event_packet.h>
+#include <event_camera_py/decoder_stats.h>
 #include <event_camera_py/event_cd.h>
 #include <event_camera_py/event_ext_trig.h>
+#include <event_camera_py/event_filter.h>
+#include <event_camera_py/time_shifter.h>
 #include <pybind11/numpy.h>
 #include <pybind11/pybind11.h>
 #include <pybind11/stl.h>
 
+#include <deque>
+#include <memory>
+#include <optional>
 #include <string>
 #include <tuple>
 #include <variant>
@@ -35,19 +43,54 @@ class Decoder
 {
 public:
   Decoder() = default;
+  Decoder(const Decoder &) = delete;  // the shifter and filter point to the accumulator
+  Decoder & operator=(const Decoder &) = delete;
   void decode(pybind11::object msg)
   {
-    pybind11::object eventsObj = get_attr<pybind11::object>(msg, "events");
-    Py_buffer view;
-    if (PyObject_GetBuffer(eventsObj.ptr(), &view, PyBUF_CONTIG_RO) != 0) {
-      throw std::runtime_error("cannot convert events to byte buffer");
-    }
-
+    const BufferView view(get_attr<pybind11::object>(msg, "events"));
     do_full_decode(
       get_attr<std::string>(msg, "encoding"), get_attr<uint32_t>(msg, "width"),
-      get_attr<uint32_t>(msg, "height"), get_attr<uint64_t>(msg, "time_base"),
-      reinterpret_cast<const uint8_t *>(view.buf), view.len);
-    PyBuffer_Release(&view);
+      get_attr<uint32_t>(msg, "height"), get_attr<uint64_t>(msg, "time_base"), view.data(),
+      view.size());
+  }
+
+  pybind11::tuple decode_many(pybind11::sequence msgs)
+  {
+    std::vector<Packet> packets;
+    packets.reserve(msgs.size());
+    for (const auto & m : msgs) {
+      const auto msg = pybind11::reinterpret_borrow<pybind11::object>(m);
+      BufferView view(get_attr<pybind11::object>(msg, "events"));
+      packets.push_back(Packet(
+        initialize_decoder(
+          get_attr<std::string>(msg, "encoding"), get_attr<uint32_t>(msg, "width"),
+          get_attr<uint32_t>(msg, "height")),
+        get_attr<uint64_t>(msg, "time_base"), std::move(view)));
+    }
+    return (decode_packets(packets));
+  }
+
+  std::tuple<size_t, size_t, bool> decode_into(
+    pybind11::object msg, pybind11::array cdEvents, pybind11::array extTrigEvents)
+  {
+    auto * cd = get_output_buffer<typename A::EventCDType>(cdEvents, "cd");
+    EventExtTrig * trig = get_output_buffer<EventExtTrig>(extTrigEvents, "trigger");
+    const BufferView view(get_attr<pybind11::object>(msg, "events"));
+    const auto encoding = get_attr<std::string>(msg, "encoding");
+    const auto width = get_attr<uint32_t>(msg, "width");
+    const auto height = get_attr<uint32_t>(msg, "height");
+    const auto timeBase = get_attr<uint64_t>(msg, "time_base");
+    accumulator_.set_output_buffers(cd, cdEvents.size(), trig, extTrigEvents.size());
+    try {
+      do_full_decode(encoding, width, height, timeBase, view.data(), view.size());
+    } catch (...) {
+      accumulator_.clear_output_buffers();
+      throw;
+    }
+    const auto [numCD, numExtTrig] = accumulator_.clear_output_buffers();
+    const bool overflow = accumulator_.get_num_stored_cd_events() != 0 ||
+                          accumulator_.get_num_stored_ext_trig_events() != 0;
+    return (std::tuple<size_t, size_t, bool>({numCD, numExtTrig, overflow}));
   }
 
   std::tuple<bool, uint64_t> decode_until(pybind11::object msg, uint64_t untilTime)
@@ -57,45 +100,55 @@ public:
       get_attr<uint32_t>(msg, "height"));
     accumulator_.setHasSensorTimeSinceEpoch(decoder->hasSensorTimeSinceEpoch());
     accumulator_.reset_stored_events();
-    decoder->setTimeBase(get_attr<uint64_t>(msg, "time_base"));
-    pybind11::object eventsObj = get_attr<pybind11::object>(msg, "events");
-    Py_buffer view;
-    if (PyObject_GetBuffer(eventsObj.ptr(), &view, PyBUF_CONTIG_RO) != 0) {
-      throw std::runtime_error("cannot convert events to byte buffer");
-    }
+    const uint64_t timeBase = get_attr<uint64_t>(msg, "time_base");
+    decoder->setTimeBase(timeBase);
+    const BufferView view(get_attr<pybind11::object>(msg, "events"));
     uint64_t nextTime{0};
-    const bool reachedTimeLimit = decoder->decodeUntil(
-      reinterpret_cast<const uint8_t *>(view.buf), view.len, &accumulator_, untilTime,
-      get_attr<uint64_t>(msg, "time_base"), &nextTime);
-    PyBuffer_Release(&view);
+    bool reachedTimeLimit{false};
+    const size_t numEvents = get_num_events();
+    uint64_t dt{0};
+    {
+      pybind11::gil_scoped_release release;
+      const auto t0 = DecoderStats::Clock::now();
+      // the codec works in unshifted time
+      const uint64_t offset = shifter_.get_time_offset();
+      reachedTimeLimit = decoder->decodeUntil(
+        view.data(), view.size(), &shifter_, untilTime > offset ? untilTime - offset : 0, timeBase,
+        &nextTime);
+      nextTime += offset;
+      messagePending_ = reachedTimeLimit;
+      if (!reachedTimeLimit) {
+        remember_message(timeBase, view.data(), view.size());
+      }
+      dt = DecoderStats::elapsed_since(t0);
+    }
+    // a message is counted once decode_until() is done with it
+    record_decode(reachedTimeLimit ? 0 : 1, reachedTimeLimit ? 0 : view.size(), numEvents, dt);
     return (std::tuple<bool, uint64_t>({reachedTimeLimit, nextTime}));
   }
 
   std::variant<uint64_t, pybind11::none> find_first_sensor_time(pybind11::object msg)
   {
-    auto decoder = initialize_decoder(
+    const BufferView view(get_attr<pybind11::object>(msg, "events"));
+    return (do_find_first_sensor_time(
       get_attr<std::string>(msg, "encoding"), get_attr<uint32_t>(msg, "width"),
-      get_attr<uint32_t>(msg, "height"));
+      get_attr<uint32_t>(msg, "height"), get_attr<uint64_t>(msg, "time_base"), view.data(),
+      view.size()));
+  }
 
-    pybind11::object eventsObj = get_attr<pybind11::object>(msg, "events");
-    Py_buffer view;
-    if (PyObject_GetBuffer(eventsObj.ptr(), &view, PyBUF_CONTIG_RO) != 0) {
-      throw std::runtime_error("cannot convert events to byte buffer");
-    }
-    decoder->setTimeBase(get_attr<uint64_t>(msg, "time_base"));
-    uint64_t firstTime{0};
-    const bool foundTime = decoder->findFirstSensorTime(
-      reinterpret_cast<const uint8_t *>(view.buf), view.len, &firstTime);
-    PyBuffer_Release(&view);
-    if (foundTime) {
-      if (!accumulator_.has_valid_start_time() && foundTime && decoder->hasSensorTimeSinceEpoch()) {
-        startTime_ = firstTime;
-        hasStartTime_ = true;
-      }
-      return (firstTime);
-    } else {
-      return (pybind11::cast<pybind11::none>(Py_None));
-    }
+  void decode_serialized(pybind11::object rawMsg)
+  {
+    const BufferView view(rawMsg);
+    const CdrEventPacket p = parse_cdr_event_packet(view.data(), view.size());
+    do_full_decode(p.encoding, p.width, p.height, p.timeBase, p.events, p.eventsSize);
+  }
+
+  std::variant<uint64_t, pybind11::none> find_first_sensor_time_serialized(pybind11::object rawMsg)
+  {
+    const BufferView view(rawMsg);
+    const CdrEventPacket p = parse_cdr_event_packet(view.data(), view.size());
+    return (
+      do_find_first_sensor_time(p.encoding, p.width, p.height, p.timeBase, p.events, p.eventsSize));
   }
 
   void decode_bytes(
@@ -117,6 +170,126 @@ public:
     do_full_decode(encoding, width, height, timeBase, buf, events.size());
   }
 
+  pybind11::tuple decode_bytes_many(
+    const std::string & encoding, uint16_t width, uint16_t height,
+    const std::vector<uint64_t> & timeBases, pybind11::sequence buffers)
+  {
+    if (timeBases.size() != buffers.size()) {
+      throw std::runtime_error("number of time bases and buffers must match");
+    }
+    auto decoder = initialize_decoder(encoding, width, height);
+    std::vector<Packet> packets;
+    packets.reserve(buffers.size());
+    for (size_t i = 0; i < timeBases.size(); i++) {
+      packets.push_back(Packet(decoder, timeBases[i], BufferView(buffers[i])));
+    }
+    return (decode_packets(packets));
+  }
+
+  void enable_state(bool enabled)
+  {
+    keepState_ = enabled;
+    if (!enabled) {
+      history_.clear();
+    }
+  }
+
+  pybind11::tuple get_state() const
+  {
+    if (messagePending_) {
+      throw std::runtime_error("cannot get state while a message is partially decoded");
+    }
+    if (!keepState_ && shifter_.has_last_time()) {
+      throw std::runtime_error("enable_state() must be called before decoding!");
+    }
+    // Only the messages from the last one with a time stamp onward are
+    // needed to bring a fresh codec up to the current state.
+    size_t first = 0;
+    if (!history_.empty()) {
+      DecoderFactoryType f;
+      auto decoder = f.getInstance(encoding_, width_, height_);
+      decoder->setTimeMultiplier(1);
+      first = history_.size();
+      uint64_t t;
+      while (first > 0 && !decoder->findFirstSensorTime(
+                            history_[first - 1].data.data(), history_[first - 1].data.size(), &t)) {
+        first--;
+      }
+      if (first == 0 && shifter_.has_last_time()) {
+        throw std::runtime_error("decoder state not found in recent messages!");
+      }
+      first = first > 0 ? first - 1 : 0;
+    }
+    pybind11::list messages;
+    for (size_t i = first; i < history_.size(); i++) {
+      const auto & m = history_[i];
+      messages.append(
+        pybind11::make_tuple(
+          m.timeBase,
+          pybind11::bytes(reinterpret_cast<const char *>(m.data.data()), m.data.size())));
+    }
+    return (pybind11::make_tuple(
+      stateVersion, encoding_, width_, height_, messages, shifter_.has_last_time(),
+      shifter_.get_last_time(), hasStartTime_, startTime_, accumulator_.get_state(),
+      filter_.get_state()));
+  }
+
+  void set_state(pybind11::tuple state)
+  {
+    if (state.size() != 11 || state[0].cast<int>() != stateVersion) {
+      throw std::runtime_error("invalid decoder state!");
+    }
+    reset_codec();
+    keepState_ = true;  // the restored decoder can be saved again
+    encoding_ = state[1].cast<std::string>();
+    width_ = state[2].cast<uint32_t>();
+    height_ = state[3].cast<uint32_t>();
+    const auto messages = state[4].cast<pybind11::list>();
+    if (!messages.empty()) {
+      auto decoder = initialize_decoder(encoding_, width_, height_);
+      for (const auto & m : messages) {
+        const auto msg = m.cast<pybind11::tuple>();
+        const BufferView view(msg[1]);
+        replay_message(decoder, msg[0].cast<uint64_t>(), view.data(), view.size());
+      }
+      accumulator_.reset_stored_events();
+    }
+    if (state[5].cast<bool>()) {
+      align_time(state[6].cast<uint64_t>());
+    }
+    hasStartTime_ = state[7].cast<bool>();
+    startTime_ = state[8].cast<uint64_t>();
+    accumulator_.set_state(state[9].cast<pybind11::tuple>());
+    filter_.set_state(state[10].cast<pybind11::tuple>());
+  }
+
+  std::optional<uint64_t> prime(pybind11::sequence msgs, std::optional<uint64_t> lastTime)
+  {
+    // the events of the priming messages are not counted, but any other
+    // accumulator state (e.g. the pixels of the current unique packet) is kept
+    const auto accumulatorState = accumulator_.AccumulatorBase::get_state();
+    const auto filterCounters = filter_.get_counters();
+    reset_codec();
+    for (const auto & m : msgs) {
+      const auto msg = pybind11::reinterpret_borrow<pybind11::object>(m);
+      const BufferView view(get_attr<pybind11::object>(msg, "events"));
+      auto decoder = initialize_decoder(
+        get_attr<std::string>(msg, "encoding"), get_attr<uint32_t>(msg, "width"),
+        get_attr<uint32_t>(msg, "height"));
+      replay_message(decoder, get_attr<uint64_t>(msg, "time_base"), view.data(), view.size());
+    }
+    accumulator_.reset_stored_events();
+    accumulator_.AccumulatorBase::set_state(accumulatorState);
+    filter_.set_counters(filterCounters);
+    if (lastTime) {
+      align_time(*lastTime);
+    }
+    if (shifter_.has_last_time()) {
+      return (shifter_.get_last_time());
+    }
+    return (std::nullopt);
+  }
+
   std::variant<uint64_t, pybind11::none> get_start_time() const
   {
     // return cached start time or accumulator start time, or None
@@ -129,30 +302,132 @@ public:
     return pybind11::cast<pybind11::none>(Py_None);
   }
 
-  pybind11::array_t<EventCD> get_cd_events() { return (accumulator_.get_cd_events()); }
-  pybind11::array_t<EventExtTrig> get_ext_trig_events()
+  // the return types depend on the accumulator, e.g. a dict of arrays for columnar output
+  auto get_cd_events()
   {
+    const DecoderStats::ScopedTimer timer(&stats_.handoffTime);
+    return (accumulator_.get_cd_events());
+  }
+  auto get_ext_trig_events()
+  {
+    const DecoderStats::ScopedTimer timer(&stats_.handoffTime);
     return (accumulator_.get_ext_trig_events());
-  };
-  pybind11::list get_cd_event_packets() { return (accumulator_.get_cd_event_packets()); }
+  }
+  pybind11::list get_cd_event_packets()
+  {
+    const DecoderStats::ScopedTimer timer(&stats_.handoffTime);
+    return (accumulator_.get_cd_event_packets());
+  }
+  pybind11::tuple get_cd_event_packets_flat()
+  {
+    const DecoderStats::ScopedTimer timer(&stats_.handoffTime);
+    return (accumulator_.get_cd_event_packets_flat());
+  }
   pybind11::list get_ext_trig_event_packets()
   {
+    const DecoderStats::ScopedTimer timer(&stats_.handoffTime);
     return (accumulator_.get_ext_trig_event_packets());
   }
 
+  pybind11::dict get_stats() const
+  {
+    pybind11::dict d;
+    d["num_messages"] = stats_.numMessages;
+    d["num_bytes"] = stats_.numBytes;
+    d["decode_time"] = stats_.decodeTime * 1e-9;
+    d["handoff_time"] = stats_.handoffTime * 1e-9;
+    d["max_size_cd"] = accumulator_.get_max_size_cd();
+    d["max_size_ext_trig"] = accumulator_.get_max_size_ext_trig();
+    d["num_allocations"] = accumulator_.get_num_allocations();
+    return (d);
+  }
+  void reset_stats()
+  {
+    stats_ = DecoderStats();
+    accumulator_.get_buffer_pool().reset_peak();
+  }
+  void set_buffer_pool(size_t maxPooledBytes, size_t maxPooledBuffers, double decay)
+  {
+    if (decay < 0 || decay > 1) {
+      throw std::runtime_error("decay must be between 0 and 1!");
+    }
+    accumulator_.get_buffer_pool().set_limits(maxPooledBytes, maxPooledBuffers, decay);
+  }
+  pybind11::dict get_memory_usage() { return (accumulator_.get_buffer_pool().get_memory_usage()); }
+  void set_stats_callback(pybind11::object callback) { statsCallback_ = callback; }
+
+  A & get_accumulator() { return (accumulator_); }
+  EventFilter<A> & get_filter() { return (filter_); }
+
   size_t get_num_cd_off() const { return (accumulator_.get_num_cd_off()); }
   size_t get_num_cd_on() const { return (accumulator_.get_num_cd_on()); }
   size_t get_num_trigger_rising() const { return (accumulator_.get_num_trigger_rising()); }
   size_t get_num_trigger_falling() const { return (accumulator_.get_num_trigger_falling()); }
+  size_t get_num_cd_dropped() const { return (filter_.get_num_dropped()); }
+  size_t get_num_cd_hot_pixel() const { return (filter_.get_num_hot_pixel()); }
+  size_t get_num_cd_noise() const { return (filter_.get_num_noise()); }
 
 private:
-  using DecoderType = event_camera_codecs::Decoder<event_camera_codecs::EventPacket, A>;
+  using ProcessorType = TimeShifter<EventFilter<A>>;
+  using DecoderType = event_camera_codecs::Decoder<event_camera_codecs::EventPacket, ProcessorType>;
+  using DecoderFactoryType =
+    event_camera_codecs::DecoderFactory<event_camera_codecs::EventPacket, ProcessorType>;
+  static constexpr int stateVersion = 7;
+  static constexpr size_t maxHistorySize = 8;  // number of messages kept for get_state()
+  struct Message
+  {
+    uint64_t timeBase{0};
+    std::vector<uint8_t> data;
+  };
+  struct Packet
+  {
+    Packet(DecoderType * d, uint64_t t, BufferView && v)
+    : decoder(d), timeBase(t), view(std::move(v))
+    {
+    }
+    DecoderType * decoder;
+    uint64_t timeBase;
+    BufferView view;
+  };
+
+  template <class T>
+  static T * get_output_buffer(pybind11::array & a, const char * name)
+  {
+    if (a.ndim() != 1) {
+      throw std::runtime_error(std::string(name) + " output buffer must be 1-D array");
+    }
+    return (get_writeable_data<T>(a, std::string(name) + " output buffer"));
+  }
+
   template <class T>
   static T get_attr(pybind11::object msg, const char * name)
   {
     return (pybind11::getattr(msg, name)).cast<T>();
   }
 
+  std::variant<uint64_t, pybind11::none> do_find_first_sensor_time(
+    const std::string & encoding, uint32_t width, uint32_t height, uint64_t timeBase,
+    const uint8_t * buf, size_t bufSize)
+  {
+    auto decoder = initialize_decoder(encoding, width, height);
+    decoder->setTimeBase(timeBase);
+    uint64_t firstTime{0};
+    bool foundTime{false};
+    {
+      pybind11::gil_scoped_release release;
+      foundTime = decoder->findFirstSensorTime(buf, bufSize, &firstTime);
+    }
+    if (foundTime) {
+      firstTime += shifter_.get_time_offset();
+      if (!accumulator_.has_valid_start_time() && decoder->hasSensorTimeSinceEpoch()) {
+        startTime_ = firstTime;
+        hasStartTime_ = true;
+      }
+      return (firstTime);
+    }
+    return (pybind11::cast<pybind11::none>(Py_None));
+  }
+
   void do_full_decode(
     const std::string & encoding, uint16_t width, uint16_t height, uint64_t timeBase,
     const uint8_t * buf, size_t bufSize)
@@ -161,14 +436,144 @@ private:
     decoder->setTimeBase(timeBase);
     accumulator_.setHasSensorTimeSinceEpoch(decoder->hasSensorTimeSinceEpoch());
     accumulator_.reset_stored_events();
-    decoder->decode(buf, bufSize, &accumulator_);
+    const size_t numEvents = get_num_events();
+    uint64_t dt{0};
+    {
+      // The codec and the accumulator do not touch any python objects,
+      // so let other python threads (e.g. other decoders) run meanwhile.
+      pybind11::gil_scoped_release release;
+      const auto t0 = DecoderStats::Clock::now();
+      messagePending_ = false;
+      decoder->decode(buf, bufSize, &shifter_);
+      remember_message(timeBase, buf, bufSize);
+      dt = DecoderStats::elapsed_since(t0);
+    }
+    record_decode(1, bufSize, numEvents, dt);
+  }
+
+  size_t get_num_events() const
+  {
+    return (
+      accumulator_.get_num_cd_off() + accumulator_.get_num_cd_on() +
+      accumulator_.get_num_trigger_rising() + accumulator_.get_num_trigger_falling());
+  }
+
+  // updates the statistics and calls the user's callback after decoding
+  void record_decode(size_t numMessages, size_t numBytes, size_t numEventsBefore, uint64_t dt)
+  {
+    stats_.numMessages += numMessages;
+    stats_.numBytes += numBytes;
+    stats_.decodeTime += dt;
+    if (!statsCallback_.is_none()) {
+      statsCallback_(numBytes, get_num_events() - numEventsBefore, dt * 1e-9);
+    }
+  }
+
+  // starts over with a fresh codec
+  void reset_codec()
+  {
+    decoderFactory_ = std::make_unique<DecoderFactoryType>();
+    history_.clear();
+    messagePending_ = false;
+    shifter_.set_time_offset(0);
+    shifter_.set_last_time(false, 0);
+  }
+
+  // decodes a message only to advance the codec state, the events are dropped
+  void replay_message(DecoderType * decoder, uint64_t timeBase, const uint8_t * buf, size_t bufSize)
+  {
+    decoder->setTimeBase(timeBase);
+    accumulator_.setHasSensorTimeSinceEpoch(decoder->hasSensorTimeSinceEpoch());
+    accumulator_.reset_stored_events();
+    decoder->decode(buf, bufSize, &shifter_);
+    remember_message(timeBase, buf, bufSize);
+  }
+
+  // shifts the sensor time such that the last event seen has time lastTime
+  void align_time(uint64_t lastTime)
+  {
+    if (shifter_.has_last_time()) {
+      shifter_.set_time_offset(lastTime - shifter_.get_last_time());
+    }
+    shifter_.set_last_time(true, lastTime);
+  }
+
+  // keeps a copy of the most recent messages such that get_state() can provide them
+  void remember_message(uint64_t timeBase, const uint8_t * buf, size_t bufSize)
+  {
+    if (!keepState_) {
+      return;
+    }
+    if (history_.size() < maxHistorySize) {
+      history_.emplace_back();
+    } else {
+      history_.push_back(std::move(history_.front()));  // recycle the memory
+      history_.pop_front();
+    }
+    history_.back().timeBase = timeBase;
+    history_.back().data.assign(buf, buf + bufSize);
+  }
+
+  pybind11::tuple decode_packets(const std::vector<Packet> & packets)
+  {
+    if constexpr (!A::hasEventArrays) {
+      throw std::runtime_error("this decoder cannot decode batches, use decode() instead!");
+    }
+    // offsets[i] is the index of the first event of packet i, the
+    // last element holds the total number of events (CSR layout)
+    pybind11::array_t<int64_t> cdOffsets(packets.size() + 1);
+    pybind11::array_t<int64_t> trigOffsets(packets.size() + 1);
+    int64_t * cdOff = cdOffsets.mutable_data();
+    int64_t * trigOff = trigOffsets.mutable_data();
+    cdOff[0] = 0;
+    trigOff[0] = 0;
+    accumulator_.reset_stored_events();
+    std::vector<std::tuple<size_t, uint64_t>> numEventsAndTime(packets.size());
+    {
+      pybind11::gil_scoped_release release;
+      for (size_t i = 0; i < packets.size(); i++) {
+        const Packet & p = packets[i];
+        const auto t0 = DecoderStats::Clock::now();
+        const size_t numEvents = get_num_events();
+        p.decoder->setTimeBase(p.timeBase);
+        accumulator_.setHasSensorTimeSinceEpoch(p.decoder->hasSensorTimeSinceEpoch());
+        messagePending_ = false;
+        p.decoder->decode(p.view.data(), p.view.size(), &shifter_);
+        if (i + maxHistorySize >= packets.size()) {
+          // earlier packets would drop out of the history anyway
+          remember_message(p.timeBase, p.view.data(), p.view.size());
+        }
+        cdOff[i + 1] = static_cast<int64_t>(accumulator_.get_num_stored_cd_events());
+        trigOff[i + 1] = static_cast<int64_t>(accumulator_.get_num_stored_ext_trig_events());
+        numEventsAndTime[i] = {numEvents, DecoderStats::elapsed_since(t0)};
+      }
+    }
+    // the callback must be called with the GIL held
+    for (size_t i = 0; i < packets.size(); i++) {
+      const size_t numEvents = std::get<0>(numEventsAndTime[i]);
+      const size_t n =
+        (i + 1 < packets.size() ? std::get<0>(numEventsAndTime[i + 1]) : get_num_events()) -
+        numEvents;
+      stats_.numMessages++;
+      stats_.numBytes += packets[i].view.size();
+      stats_.decodeTime += std::get<1>(numEventsAndTime[i]);
+      if (!statsCallback_.is_none()) {
+        statsCallback_(packets[i].view.size(), n, std::get<1>(numEventsAndTime[i]) * 1e-9);
+      }
+    }
+    return (pybind11::make_tuple(
+      accumulator_.get_cd_events(), accumulator_.get_ext_trig_events(), cdOffsets, trigOffsets));
   }
 
   DecoderType * initialize_decoder(const std::string & encoding, uint32_t width, uint32_t height)
   {
     accumulator_.initialize(width, height);
+    filter_.initialize(width, height);
+    encoding_ = encoding;
+    width_ = width;
+    height_ = height;
     // this will only create a decoder on the first call, subsequently return instance
-    auto decoder = decoderFactory_.getInstance(encoding, width, height);
+    auto decoder = decoderFactory_->getInstance(encoding, width, height);
     if (!decoder) {
       throw(std::runtime_error("no decoder for encoding " + encoding));
     }
@@ -177,10 +582,20 @@ private:
   }
 
   // ------------ variables
-  event_camera_codecs::DecoderFactory<event_camera_codecs::EventPacket, A> decoderFactory_;
+  std::unique_ptr<DecoderFactoryType> decoderFactory_{std::make_unique<DecoderFactoryType>()};
   A accumulator_;
+  EventFilter<A> filter_{&accumulator_};
+  ProcessorType shifter_{&filter_};
   uint64_t startTime_{0};
   bool hasStartTime_{false};
+  std::string encoding_;
+  uint32_t width_{0};
+  uint32_t height_{0};
+  std::deque<Message> history_;  // most recent messages, for get_state()
+  bool keepState_{false};        // whether to fill the history
+  bool messagePending_{false};   // true while decode_until() is in the middle of a message
+  DecoderStats stats_;
+  pybind11::object statsCallback_{pybind11::none()};
 };
 
 #endif  // EVENT_CAMERA_PY__DECODER_H_
@@ -0,0 +1,50 @@
+// -*-c++-*--------------------------------------------------------------------
+// Copyright 2026 Bernd Pfrommer <bernd.pfrommer@gmail.com>
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#ifndef EVENT_CAMERA_PY__DECODER_STATS_H_
+#define EVENT_CAMERA_PY__DECODER_STATS_H_
+
+#include <chrono>
+#include <cstdint>
+
+// Performance counters of the decoder. Times are in nanoseconds.
+struct DecoderStats
+{
+  using Clock = std::chrono::steady_clock;
+
+  static uint64_t elapsed_since(Clock::time_point t0)
+  {
+    return (std::chrono::duration_cast<std::chrono::nanoseconds>(Clock::now() - t0).count());
+  }
+
+  // adds the time elapsed during its lifetime to a counter
+  class ScopedTimer
+  {
+  public:
+    explicit ScopedTimer(uint64_t * t) : t_(t), start_(Clock::now()) {}
+    ~ScopedTimer() { *t_ += elapsed_since(start_); }
+
+  private:
+    uint64_t * t_;
+    Clock::time_point start_;
+  };
+
+  uint64_t numMessages{0};
+  uint64_t numBytes{0};
+  uint64_t decodeTime{0};   // time spent in the codec and the accumulator
+  uint64_t handoffTime{0};  // time spent handing the events over to python
+};
+
+#endif  // EVENT_CAMERA_PY__DECODER_STATS_H_
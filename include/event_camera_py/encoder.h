@@ -0,0 +1,267 @@
+// -*-c++-*--------------------------------------------------------------------
+// Copyright 2026 Bernd Pfrommer <bernd.pfrommer@gmail.com>
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#ifndef EVENT_CAMERA_PY__ENCODER_H_
+#define EVENT_CAMERA_PY__ENCODER_H_
+
+#include <event_camera_py/event_cd.h>
+#include <event_camera_py/event_ext_trig.h>
+#include <pybind11/numpy.h>
+#include <pybind11/pybind11.h>
+
+#include <cstddef>
+#include <cstdint>
+#include <memory>
+#include <optional>
+#include <stdexcept>
+#include <string>
+#include <vector>
+
+// Encoder for the evt3 format of the Metavision cameras. Consecutive CD events
+// with the same time, row, and polarity are packed into vector words.
+class Evt3Encoder
+{
+public:
+  using Word = uint16_t;
+  // upper bound on words per event, except for time gaps: time, row, column
+  static constexpr size_t wordsPerEvent = 3;
+
+  explicit Evt3Encoder(std::vector<Word> * out) : out_(out) {}
+
+  void eventCD(uint64_t t, uint16_t x, uint16_t y, uint8_t p)
+  {
+    if (
+      numVect_ != 0 && t == vectT_ && y == vectY_ && p == vectP_ && x > lastX_ && x < vectX_ + 12) {
+      vectMask_ |= 1 << (x - vectX_);  // extends the current vector
+      lastX_ = x;
+      numVect_++;
+      return;
+    }
+    flush();
+    vectT_ = t;
+    vectY_ = y;
+    vectP_ = p;
+    vectX_ = x;
+    lastX_ = x;
+    vectMask_ = 1;
+    numVect_ = 1;
+  }
+
+  void eventExtTrigger(uint64_t t, uint8_t edge, uint8_t id)
+  {
+    flush();
+    set_time(t);
+    out_->push_back((0xA << 12) | ((id & 0xF) << 8) | (edge & 1));
+  }
+
+  void flush()
+  {
+    if (numVect_ == 0) {
+      return;
+    }
+    set_time(vectT_);
+    if (!hasY_ || vectY_ != y_) {
+      out_->push_back((0x0 << 12) | vectY_);  // EVT_ADDR_Y
+      y_ = vectY_;
+      hasY_ = true;
+    }
+    if (numVect_ == 1) {
+      out_->push_back((0x2 << 12) | (vectP_ << 11) | vectX_);  // EVT_ADDR_X
+    } else {
+      out_->push_back((0x3 << 12) | (vectP_ << 11) | vectX_);  // VECT_BASE_X
+      out_->push_back((0x4 << 12) | vectMask_);                // VECT_12
+    }
+    numVect_ = 0;
+  }
+
+private:
+  void set_time(uint64_t t)
+  {
+    const uint64_t high = t >> 12;
+    if (!hasTime_ || high != high_) {
+      // Decoders detect the rollover of the 12 bit time high field by a
+      // backward jump, so long gaps must be bridged by intermediate words.
+      while (hasTime_ && high > high_ + 2047) {
+        high_ += 2047;
+        out_->push_back((0x8 << 12) | (high_ & 0xFFF));
+      }
+      out_->push_back((0x8 << 12) | (high & 0xFFF));  // EVT_TIME_HIGH
+      high_ = high;
+      hasTime_ = true;
+      hasLow_ = false;
+    }
+    const uint16_t low = t & 0xFFF;
+    if (!hasLow_ || low != low_) {
+      out_->push_back((0x6 << 12) | low);  // EVT_TIME_LOW
+      low_ = low;
+      hasLow_ = true;
+    }
+  }
+
+  std::vector<Word> * out_;
+  bool hasTime_{false};
+  bool hasLow_{false};
+  bool hasY_{false};
+  uint64_t high_{0};
+  uint16_t low_{0};
+  uint16_t y_{0};
+  // CD events waiting to be written as a vector
+  size_t numVect_{0};
+  uint64_t vectT_{0};
+  uint16_t vectX_{0};
+  uint16_t vectY_{0};
+  uint8_t vectP_{0};
+  uint16_t vectMask_{0};
+  uint16_t lastX_{0};
+};
+
+// Encoder for the evt2 format of the Metavision cameras.
+class Evt2Encoder
+{
+public:
+  using Word = uint32_t;
+  // upper bound on words per event: time high, event
+  static constexpr size_t wordsPerEvent = 2;
+
+  explicit Evt2Encoder(std::vector<Word> * out) : out_(out) {}
+
+  void eventCD(uint64_t t, uint16_t x, uint16_t y, uint8_t p)
+  {
+    set_time(t);
+    out_->push_back((uint32_t(p) << 28) | (uint32_t(t & 0x3F) << 22) | (uint32_t(x) << 11) | y);
+  }
+
+  void eventExtTrigger(uint64_t t, uint8_t edge, uint8_t id)
+  {
+    set_time(t);
+    out_->push_back(
+      (0xAU << 28) | (uint32_t(t & 0x3F) << 22) | (uint32_t(id & 0x1F) << 8) | (edge & 1));
+  }
+
+  void flush() {}
+
+private:
+  void set_time(uint64_t t)
+  {
+    const uint64_t high = t >> 6;
+    if (!hasTime_ || high != high_) {
+      out_->push_back((0x8U << 28) | (high & 0x0FFFFFFF));  // EVT_TIME_HIGH
+      high_ = high;
+      hasTime_ = true;
+    }
+  }
+
+  std::vector<Word> * out_;
+  bool hasTime_{false};
+  uint64_t high_{0};
+};
+
+// Encodes CD and trigger events, which must be sorted by time, into a byte stream.
+// The encoded stream always starts with a time stamp, such that it can be
+// decoded by a fresh decoder.
+template <class Enc, class E>
+std::unique_ptr<std::vector<typename Enc::Word>> encode_stream(
+  const E * cd, size_t numCD, const EventExtTrig * trig, size_t numTrig)
+{
+  auto out = std::make_unique<std::vector<typename Enc::Word>>();
+  out->reserve(Enc::wordsPerEvent * (numCD + numTrig) + 16);  // avoids reallocation in most cases
+  Enc enc(out.get());
+  size_t i = 0;
+  size_t j = 0;
+  int64_t lastTime = 0;
+  while (i < numCD || j < numTrig) {
+    const bool isCD = j >= numTrig || (i < numCD && cd[i].t <= trig[j].t);
+    const int64_t t = isCD ? cd[i].t : trig[j].t;
+    if (t < lastTime) {
+      throw std::runtime_error("events must be sorted by time and have non-negative time!");
+    }
+    lastTime = t;
+    if (isCD) {
+      const E & e = cd[i++];
+      if (e.x >= 2048 || e.y >= 2048) {
+        throw std::runtime_error("event coordinates must be less than 2048!");
+      }
+      enc.eventCD(t, e.x, e.y, e.p != 0);
+    } else {
+      const EventExtTrig & e = trig[j++];
+      enc.eventExtTrigger(t, e.p != 0, static_cast<uint8_t>(e.id));
+    }
+  }
+  enc.flush();
+  return (out);
+}
+
+// runs the encoder and hands the words over to a numpy byte array
+template <class Enc, class E>
+pybind11::array_t<uint8_t> encode_to_array(
+  const E * cd, size_t numCD, const EventExtTrig * trig, size_t numTrig)
+{
+  using Words = std::vector<typename Enc::Word>;
+  std::unique_ptr<Words> v;
+  {
+    pybind11::gil_scoped_release release;
+    v = encode_stream<Enc>(cd, numCD, trig, numTrig);
+  }
+  uint8_t * data = reinterpret_cast<uint8_t *>(v->data());
+  const size_t size = v->size() * sizeof(typename Enc::Word);
+  auto cap = pybind11::capsule(v.get(), [](void * p) { delete reinterpret_cast<Words *>(p); });
+  v.release();  // now owned by the capsule
+  return (pybind11::array_t<uint8_t>(size, data, cap));
+}
+
+template <class E>
+pybind11::array_t<uint8_t> encode_as(
+  const std::string & encoding, const E * cd, size_t numCD, const EventExtTrig * trig,
+  size_t numTrig)
+{
+  if (encoding == "evt3") {
+    return (encode_to_array<Evt3Encoder>(cd, numCD, trig, numTrig));
+  }
+  if (encoding == "evt2") {
+    return (encode_to_array<Evt2Encoder>(cd, numCD, trig, numTrig));
+  }
+  throw std::runtime_error("no encoder for encoding " + encoding);
+}
+
+inline pybind11::array_t<uint8_t> encode_events(
+  const std::string & encoding, pybind11::array cd, std::optional<pybind11::array> trig)
+{
+  using TrigArray = pybind11::array_t<EventExtTrig, pybind11::array::c_style>;
+  const EventExtTrig * trigData = nullptr;
+  size_t numTrig = 0;
+  TrigArray trigArray;
+  if (trig) {
+    if (!pybind11::isinstance<TrigArray>(*trig) || trig->ndim() != 1) {
+      throw std::runtime_error("trigger events must be 1-D array of dtype EventExtTrig");
+    }
+    trigArray = pybind11::reinterpret_borrow<TrigArray>(*trig);
+    trigData = trigArray.data();
+    numTrig = trigArray.size();
+  }
+  if (cd.ndim() != 1) {
+    throw std::runtime_error("CD events must be 1-D array");
+  }
+  if (pybind11::isinstance<pybind11::array_t<EventCD, pybind11::array::c_style>>(cd)) {
+    const auto a = pybind11::reinterpret_borrow<pybind11::array_t<EventCD>>(cd);
+    return (encode_as(encoding, a.data(), a.size(), trigData, numTrig));
+  }
+  if (pybind11::isinstance<pybind11::array_t<EventCD64, pybind11::array::c_style>>(cd)) {
+    const auto a = pybind11::reinterpret_borrow<pybind11::array_t<EventCD64>>(cd);
+    return (encode_as(encoding, a.data(), a.size(), trigData, numTrig));
+  }
+  throw std::runtime_error("CD events must be contiguous array of dtype EventCD or EventCD64");
+}
+
+#endif  // EVENT_CAMERA_PY__ENCODER_H_
@@ -29,4 +29,33 @@ struct EventCD
   int8_t p;
   int32_t t;
 };
+
+// same as EventCD, but with 64 bit time stamps that do not roll over
+struct EventCD64
+{
+  explicit EventCD64(uint16_t xa = 0, uint16_t ya = 0, int8_t pa = 0, int64_t ta = 0)
+  : x(xa), y(ya), p(pa), t(ta)
+  {
+  }
+  uint16_t x;
+  uint16_t y;
+  int8_t p;
+  int64_t t;
+};
+
+// same as EventCD64, plus the index of the camera, for merged streams.
+// The camera field fills the padding, so the size is the same.
+struct EventCDCamera
+{
+  explicit EventCDCamera(
+    uint16_t xa = 0, uint16_t ya = 0, int8_t pa = 0, uint8_t ca = 0, int64_t ta = 0)
+  : x(xa), y(ya), p(pa), camera(ca), t(ta)
+  {
+  }
+  uint16_t x;
+  uint16_t y;
+  int8_t p;
+  uint8_t camera;
+  int64_t t;
+};
 #endif  // EVENT_CAMERA_PY__EVENT_CD_H_
@@ -0,0 +1,62 @@
+// -*-c++-*--------------------------------------------------------------------
+// Copyright 2026 Bernd Pfrommer <bernd.pfrommer@gmail.com>
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#ifndef EVENT_CAMERA_PY__EVENT_COLUMNS_H_
+#define EVENT_CAMERA_PY__EVENT_COLUMNS_H_
+
+#include <cstddef>
+#include <cstdint>
+#include <vector>
+
+// CD events as a struct of arrays, i.e. with separate contiguous
+// arrays for x, y, p, and t. All columns always have the same length.
+struct EventColumns
+{
+  void push_back(uint16_t ex, uint16_t ey, int8_t polarity, int32_t ta)
+  {
+    x.push_back(ex);
+    y.push_back(ey);
+    p.push_back(polarity);
+    t.push_back(ta);
+  }
+  void reserve(size_t n)
+  {
+    x.reserve(n);
+    y.reserve(n);
+    p.reserve(n);
+    t.reserve(n);
+  }
+  void clear()
+  {
+    x.clear();
+    y.clear();
+    p.clear();
+    t.clear();
+  }
+  size_t size() const { return (t.size()); }
+  size_t capacity() const { return (t.capacity()); }
+  size_t capacity_bytes() const
+  {
+    return (
+      x.capacity() * sizeof(uint16_t) + y.capacity() * sizeof(uint16_t) +
+      p.capacity() * sizeof(int8_t) + t.capacity() * sizeof(int32_t));
+  }
+  std::vector<uint16_t> x;
+  std::vector<uint16_t> y;
+  std::vector<int8_t> p;
+  std::vector<int32_t> t;
+};
+
+#endif  // EVENT_CAMERA_PY__EVENT_COLUMNS_H_
@@ -21,8 +21,21 @@
 struct EventExtTrig
 {
   explicit EventExtTrig(int16_t e = 0, int64_t ta = 0, int16_t ida = 0) : p(e), t(ta), id(ida) {}
-  int16_t p;   // edge (rising or faling)
+  int16_t p;   // edge: 0 = rising, 1 = falling
   int64_t t;   // time stamp
   int16_t id;  // source of trigger signal
 };
+
+// same as EventExtTrig, plus the index of the camera, for merged streams
+struct EventExtTrigCamera
+{
+  explicit EventExtTrigCamera(int16_t e = 0, int64_t ta = 0, int16_t ida = 0, uint8_t ca = 0)
+  : p(e), t(ta), id(ida), camera(ca)
+  {
+  }
+  int16_t p;
+  int64_t t;
+  int16_t id;
+  uint8_t camera;
+};
 #endif  // EVENT_CAMERA_PY__EVENT_EXT_TRIG_H_
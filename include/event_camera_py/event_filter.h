@@ -0,0 +1,369 @@
+// -*-c++-*--------------------------------------------------------------------
+// Copyright 2026 Bernd Pfrommer <bernd.pfrommer@gmail.com>
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#ifndef EVENT_CAMERA_PY__EVENT_FILTER_H_
+#define EVENT_CAMERA_PY__EVENT_FILTER_H_
+
+#include <event_camera_py/state_bytes.h>
+#include <pybind11/numpy.h>
+#include <pybind11/pybind11.h>
+#include <pybind11/stl.h>
+
+#include <algorithm>
+#include <cstddef>
+#include <cstdint>
+#include <limits>
+#include <optional>
+#include <stdexcept>
+#include <tuple>
+#include <vector>
+
+// Sits between the TimeShifter and the accumulator and drops the CD events
+// that the user is not interested in, such that they are never stored:
+//  - events outside a region of interest, of the wrong polarity, or outside a time range
+//  - events from hot pixels (the hot pixel mask can be loaded or learned from the event rate)
+//  - background activity noise, i.e. events without a recent event in the 8-neighborhood
+// Optionally, the coordinates of the remaining events are then mapped through a lookup
+// table, e.g. to undistort or downscale them, which may drop more events.
+// External trigger events are passed through unfiltered.
+template <class A>
+class EventFilter
+{
+public:
+  using Roi = std::tuple<uint16_t, uint16_t, uint16_t, uint16_t>;  // x, y, width, height
+  explicit EventFilter(A * accumulator) : accumulator_(accumulator) {}
+
+  // same interface as the EventProcessor, but called without virtual dispatch
+  void eventCD(uint64_t sensor_time, uint16_t ex, uint16_t ey, uint8_t polarity)
+  {
+    if (isActive_ && (!keep(sensor_time, ex, ey, polarity) || !remap(&ex, &ey))) {
+      numDropped_++;
+      return;
+    }
+    accumulator_->A::eventCD(sensor_time, ex, ey, polarity);
+  }
+  bool eventExtTrigger(uint64_t sensor_time, uint8_t edge, uint8_t id)
+  {
+    return (accumulator_->A::eventExtTrigger(sensor_time, edge, id));
+  }
+  void finished() { accumulator_->A::finished(); }
+  void rawData(const char * data, size_t len) { accumulator_->A::rawData(data, len); }
+
+  // own methods
+  void initialize(uint32_t width, uint32_t height)
+  {
+    if (width == width_ && height == height_) {
+      return;
+    }
+    if (!hotPixels_.empty()) {
+      throw std::runtime_error("hot pixel mask does not match sensor resolution!");
+    }
+    if (!remap_.empty()) {
+      throw std::runtime_error("remap table does not match sensor resolution!");
+    }
+    width_ = width;
+    height_ = height;
+    allocate_maps();
+  }
+
+  void set_filter(
+    std::optional<Roi> roi, std::optional<uint8_t> polarity, std::optional<uint64_t> tMin,
+    std::optional<uint64_t> tMax)
+  {
+    if (polarity && *polarity > 1) {
+      throw std::runtime_error("polarity must be 0 (OFF) or 1 (ON)!");
+    }
+    if (tMin && tMax && *tMin > *tMax) {
+      throw std::runtime_error("t_min must not be larger than t_max!");
+    }
+    roiX_ = roi ? std::get<0>(*roi) : 0;
+    roiY_ = roi ? std::get<1>(*roi) : 0;
+    roiWidth_ = roi ? std::get<2>(*roi) : std::numeric_limits<uint32_t>::max();
+    roiHeight_ = roi ? std::get<3>(*roi) : std::numeric_limits<uint32_t>::max();
+    polarity_ = polarity ? *polarity : anyPolarity;
+    tMin_ = tMin ? *tMin : 0;
+    tMax_ = tMax ? *tMax : std::numeric_limits<uint64_t>::max();
+    update_active();
+  }
+
+  void set_noise_filter(std::optional<uint64_t> dt)
+  {
+    noiseDt_ = dt ? *dt : 0;
+    allocate_maps();
+    update_active();
+  }
+
+  void set_hot_pixel_mask(pybind11::object mask)
+  {
+    if (mask.is_none()) {
+      hotPixels_.clear();
+    } else {
+      auto m = pybind11::array_t<uint8_t, pybind11::array::c_style | pybind11::array::forcecast>(
+        mask.cast<pybind11::array>());
+      if (m.ndim() != 2) {
+        throw std::runtime_error("hot pixel mask must have shape (height, width)!");
+      }
+      const uint32_t height = m.shape(0);
+      const uint32_t width = m.shape(1);
+      if (width_ != 0 && (width != width_ || height != height_)) {
+        throw std::runtime_error("hot pixel mask does not match sensor resolution!");
+      }
+      width_ = width;
+      height_ = height;
+      hotPixels_.assign(m.data(), m.data() + m.size());
+      allocate_maps();
+    }
+    learnDuration_ = 0;
+    update_active();
+  }
+
+  pybind11::object get_hot_pixel_mask() const
+  {
+    if (hotPixels_.empty()) {
+      return (pybind11::none());
+    }
+    pybind11::array_t<bool> mask({height_, width_});
+    std::copy(hotPixels_.begin(), hotPixels_.end(), mask.mutable_data());
+    return (std::move(mask));
+  }
+
+  void learn_hot_pixels(uint64_t duration, double maxRate)
+  {
+    if (duration == 0) {
+      throw std::runtime_error("learning duration must be positive!");
+    }
+    hotPixels_.clear();
+    learnDuration_ = duration;
+    learnMaxCount_ = static_cast<uint64_t>(maxRate * duration * 1e-6);
+    learnStart_.reset();
+    allocate_maps();
+    update_active();
+  }
+  bool is_learning_hot_pixels() const { return (learnDuration_ != 0); }
+
+  void set_remap(pybind11::object mapX, pybind11::object mapY)
+  {
+    if (mapX.is_none() || mapY.is_none()) {
+      if (!mapX.is_none() || !mapY.is_none()) {
+        throw std::runtime_error("map_x and map_y must both be None or both be arrays!");
+      }
+      remap_.clear();
+      update_active();
+      return;
+    }
+    using Map = pybind11::array_t<int32_t, pybind11::array::c_style | pybind11::array::forcecast>;
+    const Map mx(mapX.cast<pybind11::array>());
+    const Map my(mapY.cast<pybind11::array>());
+    if (
+      mx.ndim() != 2 || my.ndim() != 2 || mx.shape(0) != my.shape(0) ||
+      mx.shape(1) != my.shape(1)) {
+      throw std::runtime_error("map_x and map_y must have the same shape (height, width)!");
+    }
+    const uint32_t height = mx.shape(0);
+    const uint32_t width = mx.shape(1);
+    if (width_ != 0 && (width != width_ || height != height_)) {
+      throw std::runtime_error("remap table does not match sensor resolution!");
+    }
+    std::vector<uint32_t> table(mx.size());
+    const int32_t * x = mx.data();
+    const int32_t * y = my.data();
+    for (size_t i = 0; i < table.size(); i++) {
+      if (x[i] < 0 || y[i] < 0) {
+        table[i] = invalidPixel;
+      } else if (static_cast<uint32_t>(x[i]) >= width || static_cast<uint32_t>(y[i]) >= height) {
+        throw std::runtime_error("remapped coordinates must be within sensor resolution!");
+      } else {
+        table[i] = (static_cast<uint32_t>(y[i]) << 16) | static_cast<uint32_t>(x[i]);
+      }
+    }
+    remap_ = std::move(table);
+    width_ = width;
+    height_ = height;
+    allocate_maps();
+    update_active();
+  }
+
+  size_t get_num_dropped() const { return (numDropped_); }
+  size_t get_num_hot_pixel() const { return (numHotPixel_); }
+  size_t get_num_noise() const { return (numNoise_); }
+
+  // the settings, the state of the hot pixel and noise filters, the remap table,
+  // and the counters, to checkpoint the decoder
+  pybind11::tuple get_state() const
+  {
+    return (pybind11::make_tuple(
+      roiX_, roiY_, roiWidth_, roiHeight_, polarity_, tMin_, tMax_, numDropped_, numHotPixel_,
+      numNoise_, width_, height_, to_state_bytes(hotPixels_), to_state_bytes(pixelCount_),
+      learnDuration_, learnMaxCount_, learnStart_, noiseDt_, to_state_bytes(lastTime_),
+      to_state_bytes(remap_)));
+  }
+  void set_state(pybind11::tuple state)
+  {
+    if (state.size() != 20) {
+      throw(std::runtime_error("invalid filter state!"));
+    }
+    roiX_ = state[0].cast<uint32_t>();
+    roiY_ = state[1].cast<uint32_t>();
+    roiWidth_ = state[2].cast<uint32_t>();
+    roiHeight_ = state[3].cast<uint32_t>();
+    polarity_ = state[4].cast<uint8_t>();
+    tMin_ = state[5].cast<uint64_t>();
+    tMax_ = state[6].cast<uint64_t>();
+    numDropped_ = state[7].cast<size_t>();
+    numHotPixel_ = state[8].cast<size_t>();
+    numNoise_ = state[9].cast<size_t>();
+    width_ = state[10].cast<uint32_t>();
+    height_ = state[11].cast<uint32_t>();
+    from_state_bytes(state[12], &hotPixels_);
+    from_state_bytes(state[13], &pixelCount_);
+    learnDuration_ = state[14].cast<uint64_t>();
+    learnMaxCount_ = state[15].cast<uint64_t>();
+    learnStart_ = state[16].cast<std::optional<uint64_t>>();
+    noiseDt_ = state[17].cast<uint64_t>();
+    from_state_bytes(state[18], &lastTime_);
+    from_state_bytes(state[19], &remap_);
+    update_active();
+  }
+
+  // only the counters, such that priming the decoder does not count events
+  std::tuple<size_t, size_t, size_t> get_counters() const
+  {
+    return {numDropped_, numHotPixel_, numNoise_};
+  }
+  void set_counters(const std::tuple<size_t, size_t, size_t> & counters)
+  {
+    std::tie(numDropped_, numHotPixel_, numNoise_) = counters;
+  }
+
+private:
+  bool keep(uint64_t t, uint16_t ex, uint16_t ey, uint8_t polarity)
+  {
+    // the unsigned subtraction wraps around for coordinates left of/above the roi
+    if (
+      t < tMin_ || t >= tMax_ || static_cast<uint32_t>(ex) - roiX_ >= roiWidth_ ||
+      static_cast<uint32_t>(ey) - roiY_ >= roiHeight_ ||
+      (polarity_ != anyPolarity && std::min(polarity, uint8_t(1)) != polarity_)) {
+      return (false);
+    }
+    if (learnDuration_ != 0) {
+      learn(t, ex, ey);
+    }
+    if (!hotPixels_.empty() && hotPixels_[ey * width_ + ex]) {
+      numHotPixel_++;
+      return (false);
+    }
+    if (noiseDt_ != 0 && !has_support(t, ex, ey)) {
+      numNoise_++;
+      return (false);
+    }
+    return (true);
+  }
+
+  // returns false if the pixel is marked invalid in the remap table
+  bool remap(uint16_t * ex, uint16_t * ey) const
+  {
+    if (remap_.empty()) {
+      return (true);
+    }
+    const uint32_t xy = remap_[*ey * width_ + *ex];
+    if (xy == invalidPixel) {
+      return (false);
+    }
+    *ex = static_cast<uint16_t>(xy & 0xFFFF);
+    *ey = static_cast<uint16_t>(xy >> 16);
+    return (true);
+  }
+
+  void learn(uint64_t t, uint16_t ex, uint16_t ey)
+  {
+    if (!learnStart_) {
+      learnStart_ = t;
+    }
+    if (t < *learnStart_ + learnDuration_) {
+      pixelCount_[ey * width_ + ex]++;
+      return;
+    }
+    // learning is complete, pixels that fired too often go into the mask
+    hotPixels_.resize(pixelCount_.size());
+    for (size_t i = 0; i < pixelCount_.size(); i++) {
+      hotPixels_[i] = pixelCount_[i] > learnMaxCount_;
+    }
+    pixelCount_.clear();
+    learnDuration_ = 0;
+  }
+
+  bool has_support(uint64_t t, uint16_t ex, uint16_t ey)
+  {
+    // the map has a border of one pixel, so the neighbors need no bounds check
+    const ptrdiff_t stride = width_ + 2;
+    uint64_t * p = &lastTime_[(ey + 1) * stride + ex + 1];
+    const uint64_t tn = t > noiseDt_ ? t - noiseDt_ : 0;  // neighbor events must be newer
+    const bool support = p[-stride - 1] > tn || p[-stride] > tn || p[-stride + 1] > tn ||
+                         p[-1] > tn || p[1] > tn || p[stride - 1] > tn || p[stride] > tn ||
+                         p[stride + 1] > tn;
+    *p = t;
+    return (support);
+  }
+
+  void allocate_maps()
+  {
+    if (width_ == 0) {
+      return;  // the sensor resolution is not known yet
+    }
+    // a time of zero means no event has been seen yet
+    lastTime_.assign(noiseDt_ != 0 ? (width_ + 2) * (height_ + 2) : 0, 0);
+    pixelCount_.assign(learnDuration_ != 0 ? width_ * height_ : 0, 0);
+  }
+
+  void update_active()
+  {
+    isActive_ = roiWidth_ != std::numeric_limits<uint32_t>::max() ||
+                roiHeight_ != std::numeric_limits<uint32_t>::max() || polarity_ != anyPolarity ||
+                tMin_ != 0 || tMax_ != std::numeric_limits<uint64_t>::max() ||
+                !hotPixels_.empty() || learnDuration_ != 0 || noiseDt_ != 0 || !remap_.empty();
+  }
+
+  static constexpr uint8_t anyPolarity = 2;
+  static constexpr uint32_t invalidPixel = 0xFFFFFFFF;
+  A * accumulator_{nullptr};
+  bool isActive_{false};
+  uint32_t width_{0};
+  uint32_t height_{0};
+  // region of interest, polarity, and time range
+  uint32_t roiX_{0};
+  uint32_t roiY_{0};
+  uint32_t roiWidth_{std::numeric_limits<uint32_t>::max()};
+  uint32_t roiHeight_{std::numeric_limits<uint32_t>::max()};
+  uint8_t polarity_{anyPolarity};
+  uint64_t tMin_{0};
+  uint64_t tMax_{std::numeric_limits<uint64_t>::max()};
+  // hot pixels
+  std::vector<uint8_t> hotPixels_;    // non-zero for hot pixels, empty if no mask
+  std::vector<uint32_t> pixelCount_;  // number of events per pixel while learning
+  uint64_t learnDuration_{0};         // zero if not learning
+  uint64_t learnMaxCount_{0};
+  std::optional<uint64_t> learnStart_;
+  // background activity filter
+  uint64_t noiseDt_{0};             // zero if the noise filter is off
+  std::vector<uint64_t> lastTime_;  // time of last event per pixel
+  // output coordinates (y << 16 | x) for each pixel, empty if there is no remapping
+  std::vector<uint32_t> remap_;
+  // counters
+  size_t numDropped_{0};
+  size_t numHotPixel_{0};
+  size_t numNoise_{0};
+};
+
+#endif  // EVENT_CAMERA_PY__EVENT_FILTER_H_
@@ -0,0 +1,291 @@
+// -*-c++-*--------------------------------------------------------------------
+// Copyright 2026 Bernd Pfrommer <bernd.pfrommer@gmail.com>
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#ifndef EVENT_CAMERA_PY__MULTI_DECODER_H_
+#define EVENT_CAMERA_PY__MULTI_DECODER_H_
+
+#include <event_camera_py/accumulator_camera.h>
+#include <event_camera_py/decoder.h>
+#include <event_camera_py/event_cd.h>
+#include <event_camera_py/event_ext_trig.h>
+#include <pybind11/numpy.h>
+#include <pybind11/pybind11.h>
+
+#include <algorithm>
+#include <limits>
+#include <memory>
+#include <optional>
+#include <stdexcept>
+#include <string>
+#include <vector>
+
+// Decodes the streams of several cameras and merges them into a single
+// stream, ordered by time and sliced into windows of fixed duration.
+// A window is complete once every camera has delivered an event at or
+// after the end of the window. Each camera has its own codec, so the
+// messages of the cameras may arrive in any order.
+class MultiDecoder
+{
+public:
+  explicit MultiDecoder(size_t numCameras)
+  {
+    if (numCameras == 0 || numCameras > 256) {
+      throw std::runtime_error("number of cameras must be between 1 and 256!");
+    }
+    for (size_t i = 0; i < numCameras; i++) {
+      decoders_.push_back(std::make_unique<CameraDecoder>());
+      decoders_.back()->get_accumulator().set_camera(static_cast<uint8_t>(i));
+    }
+  }
+  MultiDecoder(const MultiDecoder &) = delete;
+  MultiDecoder & operator=(const MultiDecoder &) = delete;
+  ~MultiDecoder() { clear_windows(); }
+
+  size_t get_num_cameras() const { return (decoders_.size()); }
+
+  void set_time_offset(size_t camera, int64_t offset)
+  {
+    get_decoder(camera).get_accumulator().set_time_offset(offset);
+  }
+  int64_t get_time_offset(size_t camera)
+  {
+    return (get_decoder(camera).get_accumulator().get_time_offset());
+  }
+
+  void set_time_window(uint64_t length, std::optional<int64_t> startTime)
+  {
+    if (length == 0) {
+      throw(std::runtime_error("window length must be positive!"));
+    }
+    clear_windows();
+    length_ = static_cast<int64_t>(length);
+    hasWindow_ = false;
+    userStartTime_ = startTime;
+  }
+
+  void decode(size_t camera, pybind11::object msg)
+  {
+    if (length_ == 0) {
+      throw(std::runtime_error("window length not set!"));
+    }
+    get_decoder(camera).decode(msg);
+    pybind11::gil_scoped_release release;
+    merge(false);
+  }
+
+  // completes all windows with pending events, even if not all cameras have
+  // progressed that far, typically called at the end of the streams
+  void flush()
+  {
+    pybind11::gil_scoped_release release;
+    merge(true);
+  }
+
+  pybind11::list get_windows()
+  {
+    pybind11::list windows;
+    for (auto & w : windows_) {
+      windows.append(pybind11::make_tuple(w.startTime, to_array(w.cd), to_array(w.trig)));
+      w.cd = nullptr;  // python now owns the memory
+      w.trig = nullptr;
+    }
+    windows_.clear();
+    return (windows);
+  }
+
+  size_t get_num_cd_off(size_t camera) { return (get_decoder(camera).get_num_cd_off()); }
+  size_t get_num_cd_on(size_t camera) { return (get_decoder(camera).get_num_cd_on()); }
+  size_t get_num_trigger_rising(size_t camera)
+  {
+    return (get_decoder(camera).get_num_trigger_rising());
+  }
+  size_t get_num_trigger_falling(size_t camera)
+  {
+    return (get_decoder(camera).get_num_trigger_falling());
+  }
+
+private:
+  using CameraDecoder = Decoder<AccumulatorCamera>;
+  struct Window
+  {
+    int64_t startTime{0};
+    std::vector<EventCDCamera> * cd{nullptr};  // null if window has no CD events
+    std::vector<EventExtTrigCamera> * trig{nullptr};
+  };
+
+  CameraDecoder & get_decoder(size_t camera)
+  {
+    if (camera >= decoders_.size()) {
+      throw std::runtime_error("invalid camera index: " + std::to_string(camera));
+    }
+    return (*decoders_[camera]);
+  }
+
+  template <class T>
+  static pybind11::array_t<T> to_array(std::vector<T> * p)
+  {
+    if (!p) {
+      return (pybind11::array_t<T>());
+    }
+    auto cap = pybind11::capsule(p, [](void * v) { delete reinterpret_cast<std::vector<T> *>(v); });
+    return (pybind11::array_t<T>(p->size(), p->data(), cap));
+  }
+
+  void merge(bool flush)
+  {
+    // Future events of a camera cannot be earlier than its latest event,
+    // so windows up to the earliest of the latest times are complete.
+    int64_t limit = std::numeric_limits<int64_t>::max();
+    int64_t first = std::numeric_limits<int64_t>::max();
+    int64_t last = std::numeric_limits<int64_t>::min();
+    for (auto & d : decoders_) {
+      auto & a = d->get_accumulator();
+      if (!a.has_last_time()) {
+        if (!flush) {
+          return;  // camera has not delivered any events yet
+        }
+        continue;
+      }
+      limit = std::min(limit, a.get_last_time());
+      last = std::max(last, a.get_last_time());
+      first = std::min(first, front_time(a.get_cd_queue()));
+      first = std::min(first, front_time(a.get_ext_trig_queue()));
+    }
+    if (last == std::numeric_limits<int64_t>::min()) {
+      return;  // no events at all
+    }
+    if (!hasWindow_) {
+      windowStart_ = userStartTime_ ? *userStartTime_ : first;
+      hasWindow_ = true;
+      for (auto & d : decoders_) {
+        drop_before(&d->get_accumulator().get_cd_queue(), windowStart_);
+        drop_before(&d->get_accumulator().get_ext_trig_queue(), windowStart_);
+      }
+    }
+    if (flush) {
+      // the last window ends after the latest event of all cameras
+      while (windowStart_ <= last) {
+        close_window();
+      }
+    } else {
+      while (windowStart_ + length_ <= limit) {
+        close_window();
+      }
+    }
+    for (auto & d : decoders_) {
+      d->get_accumulator().get_cd_queue().compact();
+      d->get_accumulator().get_ext_trig_queue().compact();
+    }
+  }
+
+  void close_window()
+  {
+    const int64_t end = windowStart_ + length_;
+    std::vector<MergeQueue<EventCDCamera> *> cd;
+    std::vector<MergeQueue<EventExtTrigCamera> *> trig;
+    for (auto & d : decoders_) {
+      cd.push_back(&d->get_accumulator().get_cd_queue());
+      trig.push_back(&d->get_accumulator().get_ext_trig_queue());
+    }
+    windows_.push_back(Window{windowStart_, merge_until(cd, end), merge_until(trig, end)});
+    windowStart_ = end;
+  }
+
+  // K-way merge of the events with time before end. Each queue is sorted, so
+  // whole runs of events are copied until another queue has an earlier event.
+  // Events with the same time are ordered by camera.
+  template <class T>
+  static std::vector<T> * merge_until(const std::vector<MergeQueue<T> *> & queues, int64_t end)
+  {
+    const auto before = [](const T & e, int64_t t) { return (e.t < t); };
+    const auto after = [](int64_t t, const T & e) { return (t < e.t); };
+    size_t n = 0;
+    for (auto q : queues) {
+      const auto begin = q->events.begin();
+      q->end = std::lower_bound(begin + q->pos, q->events.end(), end, before) - begin;
+      n += q->end - q->pos;
+    }
+    if (n == 0) {
+      return (nullptr);
+    }
+    auto out = new std::vector<T>();
+    out->reserve(n);
+    constexpr size_t none = std::numeric_limits<size_t>::max();
+    while (out->size() < n) {
+      // find the queues with the earliest and second earliest event. The
+      // number of cameras is small, so a linear search beats a heap.
+      size_t best = none;
+      size_t second = none;
+      for (size_t i = 0; i < queues.size(); i++) {
+        const MergeQueue<T> & q = *queues[i];
+        if (q.pos == q.end) {
+          continue;
+        }
+        const int64_t t = q.events[q.pos].t;
+        if (best == none || t < queues[best]->events[queues[best]->pos].t) {
+          second = best;
+          best = i;
+        } else if (second == none || t < queues[second]->events[queues[second]->pos].t) {
+          second = i;
+        }
+      }
+      MergeQueue<T> & q = *queues[best];
+      const auto first = q.events.begin() + q.pos;
+      auto last = q.events.begin() + q.end;
+      if (second != none) {
+        // on equal time, the camera with the lower index goes first
+        const int64_t t2 = queues[second]->events[queues[second]->pos].t;
+        last = best < second ? std::upper_bound(first, last, t2, after)
+                             : std::lower_bound(first, last, t2, before);
+      }
+      out->insert(out->end(), first, last);
+      q.pos = last - q.events.begin();
+    }
+    return (out);
+  }
+
+  template <class T>
+  static int64_t front_time(const MergeQueue<T> & q)
+  {
+    return (q.pos < q.events.size() ? q.events[q.pos].t : std::numeric_limits<int64_t>::max());
+  }
+
+  template <class T>
+  static void drop_before(MergeQueue<T> * q, int64_t t)
+  {
+    while (q->pos < q->events.size() && q->events[q->pos].t < t) {
+      q->pos++;
+    }
+  }
+
+  void clear_windows()
+  {
+    for (auto & w : windows_) {
+      delete w.cd;
+      delete w.trig;
+    }
+    windows_.clear();
+  }
+
+  // ------------ variables
+  std::vector<std::unique_ptr<CameraDecoder>> decoders_;
+  int64_t length_{0};  // window duration
+  std::optional<int64_t> userStartTime_;
+  bool hasWindow_{false};
+  int64_t windowStart_{0};
+  std::vector<Window> windows_;  // completed windows
+};
+
+#endif  // EVENT_CAMERA_PY__MULTI_DECODER_H_
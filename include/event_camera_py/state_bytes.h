@@ -0,0 +1,41 @@
+// -*-c++-*--------------------------------------------------------------------
+// Copyright 2026 Bernd Pfrommer <bernd.pfrommer@gmail.com>
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#ifndef EVENT_CAMERA_PY__STATE_BYTES_H_
+#define EVENT_CAMERA_PY__STATE_BYTES_H_
+
+#include <pybind11/pybind11.h>
+
+#include <cstring>
+#include <string>
+#include <vector>
+
+// Conversion of vectors to and from python bytes, for saving the
+// decoder state.
+template <class T>
+pybind11::bytes to_state_bytes(const std::vector<T> & v)
+{
+  return (pybind11::bytes(reinterpret_cast<const char *>(v.data()), v.size() * sizeof(T)));
+}
+
+template <class T>
+void from_state_bytes(pybind11::handle b, std::vector<T> * v)
+{
+  const std::string s = b.cast<std::string>();
+  v->resize(s.size() / sizeof(T));
+  std::memcpy(v->data(), s.data(), v->size() * sizeof(T));
+}
+
+#endif  // EVENT_CAMERA_PY__STATE_BYTES_H_
@@ -0,0 +1,69 @@
+// -*-c++-*--------------------------------------------------------------------
+// Copyright 2026 Bernd Pfrommer <bernd.pfrommer@gmail.com>
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+#ifndef EVENT_CAMERA_PY__TIME_SHIFTER_H_
+#define EVENT_CAMERA_PY__TIME_SHIFTER_H_
+
+#include <event_camera_codecs/decoder.h>
+
+#include <cstdint>
+
+// Sits between the codec and the next processing stage (e.g. the accumulator)
+// and adds a time offset to the sensor time. The offset is only non-zero after
+// the decoder state has been restored, to make up for the sensor time rollovers
+// that the freshly created codec has not seen. Also remembers the time of the
+// last event.
+template <class A>
+class TimeShifter : public event_camera_codecs::EventProcessor
+{
+public:
+  explicit TimeShifter(A * accumulator) : accumulator_(accumulator) {}
+
+  // inherited from EventProcessor
+  void eventCD(uint64_t sensor_time, uint16_t ex, uint16_t ey, uint8_t polarity) override
+  {
+    lastTime_ = sensor_time + offset_;
+    hasLastTime_ = true;
+    // qualified calls avoid the virtual dispatch
+    accumulator_->A::eventCD(lastTime_, ex, ey, polarity);
+  }
+  bool eventExtTrigger(uint64_t sensor_time, uint8_t edge, uint8_t id) override
+  {
+    lastTime_ = sensor_time + offset_;
+    hasLastTime_ = true;
+    return (accumulator_->A::eventExtTrigger(lastTime_, edge, id));
+  }
+  void finished() override { accumulator_->A::finished(); }
+  void rawData(const char * data, size_t len) override { accumulator_->A::rawData(data, len); }
+
+  // own methods
+  uint64_t get_time_offset() const { return (offset_); }
+  void set_time_offset(uint64_t offset) { offset_ = offset; }
+  bool has_last_time() const { return (hasLastTime_); }
+  uint64_t get_last_time() const { return (lastTime_); }
+  void set_last_time(bool hasLastTime, uint64_t lastTime)
+  {
+    hasLastTime_ = hasLastTime;
+    lastTime_ = lastTime;
+  }
+
+private:
+  A * accumulator_{nullptr};
+  uint64_t offset_{0};
+  uint64_t lastTime_{0};
+  bool hasLastTime_{false};
+};
+
+#endif  // EVENT_CAMERA_PY__TIME_SHIFTER_H_
@@ -15,25 +15,35 @@
 
 #include <event_camera_codecs/decoder.h>
 #include <event_camera_py/accumulator.h>
+#include <event_camera_py/accumulator_columnar.h>
+#include <event_camera_py/accumulator_frame.h>
 #include <event_camera_py/accumulator_unique.h>
+#include <event_camera_py/accumulator_window.h>
 #include <event_camera_py/decoder.h>
+#include <event_camera_py/encoder.h>
+#include <event_camera_py/multi_decoder.h>
 #include <pybind11/numpy.h>
 #include <pybind11/pybind11.h>
 
 #include <cstdint>
 #include <iostream>
+#include <memory>
+#include <optional>
 #include <string>
 
 template <typename A>
-void declare_decoder(pybind11::module & m, std::string typestr)
+pybind11::class_<Decoder<A>> declare_decoder(pybind11::module & m, std::string typestr)
 {
   using MyDecoder = Decoder<A>;
   const std::string pyName = typestr + "Decoder";
-  pybind11::class_<MyDecoder>(m, pyName.c_str())
+  return pybind11::class_<MyDecoder>(m, pyName.c_str())
     .def(pybind11::init<>(), R"pbdoc(
         Decoder() -> None
 
-        Instantiates decoder object.
+        Instantiates decoder object. The decoding methods release the python GIL
+        while the codec is running, so separate decoder instances can decode
+        concurrently in different threads. A single decoder instance must
+        not be used by more than one thread at a time.
         )pbdoc")
     .def("decode", &MyDecoder::decode, R"pbdoc(
         decode(msg) -> None
@@ -45,6 +55,25 @@ void declare_decoder(pybind11::module & m, std::string typestr)
         :param msg: event packet msg to decode
         :type msg:  event_camera_msgs/msgs/EventPacket
         )pbdoc")
+    .def("decode_many", &MyDecoder::decode_many, R"pbdoc(
+        decode_many(msgs) -> tuple[numpy.ndarray['EventCD'], numpy.ndarray['EventExtTrig'],
+                                   numpy.ndarray[int64], numpy.ndarray[int64]]
+
+        Decodes a batch of event messages with a single call. The messages
+        are decoded in order, just as if decode() had been called for each of them,
+        so they must be consecutive messages of the same sensor.
+        The events of all messages are returned in one contiguous array, along
+        with offset arrays of length len(msgs) + 1. The events of message i
+        are cd_events[cd_offsets[i]:cd_offsets[i + 1]]. Events that have not been
+        fetched before the call are discarded.
+        Not supported by the UniqueDecoder, whose events come in packets.
+
+        :param msgs: event packet messages to decode
+        :type msgs:  list[event_camera_msgs/msgs/EventPacket]
+        :return: tuple with cd events, trigger events, cd offsets, trigger offsets
+        :rtype: tuple[numpy.ndarray[EventCD], numpy.ndarray[EventExtTrig],
+                      numpy.ndarray[int64], numpy.ndarray[int64]]
+        )pbdoc")
     .def("decode_bytes", &MyDecoder::decode_bytes, R"pbdoc(
         decode_bytes(encoding, width, height, time_base, buffer) -> None
 
@@ -80,6 +109,50 @@ void declare_decoder(pybind11::module & m, std::string typestr)
         :param buffer: Buffer with encoded events to be processed, as provided by the message.
         :type buffer: numpy.ndarray dtype uint8_t
         )pbdoc")
+    .def("decode_bytes_many", &MyDecoder::decode_bytes_many, R"pbdoc(
+        decode_bytes_many(encoding, width, height, time_bases, buffers)
+          -> tuple[numpy.ndarray['EventCD'], numpy.ndarray['EventExtTrig'],
+                   numpy.ndarray[int64], numpy.ndarray[int64]]
+
+        Same as decode_many(), but takes the message content as separate arguments.
+
+        :param encoding: Encoding string (e.g. "evt3") as provided by the messages.
+        :type encoding: str
+        :param width: sensor width in pixels
+        :type width: uint16_t
+        :param height: sensor height in pixels
+        :type height: uint16_t
+        :param time_bases: Time base of each buffer as provided by the messages.
+        :type time_bases: list[uint64_t]
+        :param buffers: Buffers with encoded events (bytes or numpy arrays of type uint8).
+        :type buffers: list[bytes]
+        :return: tuple with cd events, trigger events, cd offsets, trigger offsets
+        :rtype: tuple[numpy.ndarray[EventCD], numpy.ndarray[EventExtTrig],
+                      numpy.ndarray[int64], numpy.ndarray[int64]]
+        )pbdoc")
+    .def("decode_into", &MyDecoder::decode_into, R"pbdoc(
+        decode_into(msg, cd_events, ext_trig_events) -> tuple[uint64_t, uint64_t, Boolean]
+
+        Decodes event message like decode(), but writes the decoded events into
+        caller-provided arrays, starting at index 0. The arrays must be writeable,
+        contiguous 1-D numpy arrays of dtype EventCD (EventCD64 for the Time64Decoder)
+        and EventExtTrig, e.g. numpy.empty(1000000, dtype=EventCD). Slices of larger
+        arrays (such as a ring buffer) can be passed as well. Reusing the arrays avoids any memory
+        allocation. If an array is too small to hold all events, the overflow flag
+        is set and the remaining events can be fetched via get_cd_events() and
+        get_ext_trig_events().
+        Not supported by the UniqueDecoder.
+
+        :param msg: event packet message to decode
+        :type msg:  event_camera_msgs/msgs/EventPacket
+        :param cd_events: array to which the CD events are written
+        :type cd_events: numpy.ndarray[EventCD]
+        :param ext_trig_events: array to which the trigger events are written
+        :type ext_trig_events: numpy.ndarray[EventExtTrig]
+        :return: tuple with number of CD events written, number of trigger events
+          written, and overflow flag
+        :rtype: tuple[uint64_t, uint64_t, boolean]
+        )pbdoc")
     .def("decode_until", &MyDecoder::decode_until, R"pbdoc(
         decode_until(msg, until_time) -> tuple[Boolean, uint64_t]
 
@@ -108,6 +181,29 @@ void declare_decoder(pybind11::module & m, std::string typestr)
         :return: sensor time
         :rtype:  uint64_t or None if not found
         )pbdoc")
+    .def("decode_serialized", &MyDecoder::decode_serialized, R"pbdoc(
+        decode_serialized(raw_msg) -> None
+
+        Same as decode(), but takes the serialized (CDR) message, e.g. as returned by
+        rosbag2_py.SequentialReader.read_next(). The encoding, geometry and time base
+        are parsed directly from the serialized message, and the events are
+        decoded in place without copying. This avoids deserializing the message in python.
+
+        :param raw_msg: serialized event_camera_msgs/msg/EventPacket message
+        :type raw_msg:  bytes or other object supporting the buffer protocol
+        )pbdoc")
+    .def(
+      "find_first_sensor_time_serialized", &MyDecoder::find_first_sensor_time_serialized,
+      R"pbdoc(
+        find_first_sensor_time_serialized(raw_msg) -> uint64|None
+
+        Same as find_first_sensor_time(), but takes the serialized (CDR) message.
+
+        :param raw_msg: serialized event_camera_msgs/msg/EventPacket message
+        :type raw_msg:  bytes or other object supporting the buffer protocol
+        :return: sensor time
+        :rtype:  uint64_t or None if not found
+        )pbdoc")
     .def("get_start_time", &MyDecoder::get_start_time, R"pbdoc(
         get_start_time() -> uint64|None
         
@@ -117,6 +213,7 @@ void declare_decoder(pybind11::module & m, std::string typestr)
         usec since begin of the epoch. This start time can be added to the
         time stamp of the event array to get absolute time stamps, but beware of
         the event time stamp rollover after 2^31 microseconds (about 35 minutes).
+        The Time64Decoder produces 64 bit time stamps that do not roll over.
 
         :return: time since start of epoch of first event, or None if not available
         :rtype: uint64_t
@@ -127,10 +224,12 @@ void declare_decoder(pybind11::module & m, std::string typestr)
         Fetches decoded change detected (CD) events. Will clear out decoded events, to be
         called only *once*. If not called, events will be lost the next time decode() is called.
         The returned structured numpy array has fields 'x', 'y', 't', 'p'. Event time is a signed
-        32 bit integer representing microseconds.
+        32 bit integer representing microseconds, except for the Time64Decoder, which returns
+        events of dtype EventCD64 with a signed 64 bit time. The ColumnarDecoder instead returns a dict
+        with separate contiguous arrays for 'x' (uint16), 'y' (uint16), 'p' (int8) and 't' (int32).
 
         :return: array of detected events in the same format as the metavision SDK uses.
-        :rtype: numpy.ndarray[EventCD]
+        :rtype: numpy.ndarray[EventCD] or dict[str, numpy.ndarray]
         )pbdoc")
     .def("get_ext_trig_events", &MyDecoder::get_ext_trig_events, R"pbdoc(
         get_ext_trig_events() -> numpy.ndarray['EventExtTrig']
@@ -155,6 +254,20 @@ void declare_decoder(pybind11::module & m, std::string typestr)
         :return: list of detected event packets
         :rtype: list[numpy.ndarray[EventCD]]
         )pbdoc")
+    .def("get_cd_event_packets_flat", &MyDecoder::get_cd_event_packets_flat, R"pbdoc(
+        get_cd_event_packets_flat() -> tuple[numpy.ndarray['EventCD'], numpy.ndarray[int64]]
+
+        *Only used in combination with Unique Decoder!*
+        Same as get_cd_event_packets(), but returns all packets in a single contiguous array,
+        together with an array of packet offsets: packet i comprises the events
+        events[offsets[i]:offsets[i + 1]], and the last offset is the total number of events.
+        As for get_cd_event_packets(), the events within each packet do not overlap spatially.
+        This avoids creating a python object per packet, and allows processing all packets
+        with a single vectorized call.
+
+        :return: tuple with CD events and packet offsets
+        :rtype: tuple[numpy.ndarray[EventCD], numpy.ndarray[int64]]
+        )pbdoc")
     .def("get_ext_trig_event_packets", &MyDecoder::get_ext_trig_event_packets, R"pbdoc(
         get_ext_trig_event_packets() -> list[numpy.ndarray['EventExtTrig']]
 
@@ -183,17 +296,285 @@ void declare_decoder(pybind11::module & m, std::string typestr)
     .def("get_num_trigger_rising", &MyDecoder::get_num_trigger_rising, R"pbdoc(
         get_num_trigger_rising() -> uint64_t
     
-        :return: cumulative number of rising edge external trigger events.
+        :return: cumulative number of rising edge external trigger events, i.e. with p = 0.
         :rtype: uint64_t
         )pbdoc")
     .def("get_num_trigger_falling", &MyDecoder::get_num_trigger_falling, R"pbdoc(
         get_num_trigger_falling() -> uint64_t
     
-        :return: cumulative number of falling edge external trigger events.
+        :return: cumulative number of falling edge external trigger events, i.e. with p = 1.
+        :rtype: uint64_t
+        )pbdoc")
+    .def("get_stats", &MyDecoder::get_stats, R"pbdoc(
+        get_stats() -> dict
+
+        Returns performance statistics, cumulative since the decoder was created or
+        reset_stats() was called:
+
+        - num_messages: number of messages decoded
+        - num_bytes: number of encoded bytes decoded
+        - decode_time: time (sec) spent in the codec and in storing the events
+        - handoff_time: time (sec) spent handing the events over to python, i.e. in
+          get_cd_events(), get_ext_trig_events() etc.
+        - max_size_cd: largest number of CD events stored at a time (buffer high water mark)
+        - max_size_ext_trig: same for trigger events
+        - num_allocations: number of event buffers allocated (not counting reused buffers)
+
+        :return: dictionary with statistics
+        :rtype: dict
+        )pbdoc")
+    .def("reset_stats", &MyDecoder::reset_stats, R"pbdoc(
+        reset_stats() -> None
+
+        Resets the message, byte, and time statistics reported by get_stats(),
+        and the peak memory reported by get_memory_usage().
+        )pbdoc")
+    .def(
+      "set_buffer_pool", &MyDecoder::set_buffer_pool, pybind11::arg("max_pooled_bytes") = 32 << 20,
+      pybind11::arg("max_pooled_buffers") = 8, pybind11::arg("decay") = 0.9, R"pbdoc(
+        set_buffer_pool(max_pooled_bytes=32MiB, max_pooled_buffers=8, decay=0.9) -> None
+
+        Configures the pool of event buffers. Buffers that have been handed to python
+        return to the pool when their numpy arrays are garbage collected, and are
+        reused for the next messages. New buffers are reserved for the largest
+        recent number of events, an estimate that decays by a factor for each
+        buffer handed over. Buffers with more than twice that capacity are freed,
+        such that the memory shrinks again after a burst of events.
+
+        :param max_pooled_bytes: maximum number of bytes kept in unused buffers, 0 disables pooling.
+        :type max_pooled_bytes: int
+        :param max_pooled_buffers: maximum number of unused buffers kept per event type.
+        :type max_pooled_buffers: int
+        :param decay: decay of the buffer size estimate, in [0, 1]. 1 never shrinks.
+        :type decay: float
+        )pbdoc")
+    .def("get_memory_usage", &MyDecoder::get_memory_usage, R"pbdoc(
+        get_memory_usage() -> dict
+
+        Returns the memory used by the event buffers of this decoder:
+
+        - current: bytes in all buffers, including those owned by numpy arrays that
+          are still alive, and the unused buffers in the pool
+        - peak: maximum of current since the decoder was created or reset_stats() was
+          called. Sampled whenever a buffer changes hands.
+        - pooled: bytes in unused buffers
+        - num_buffers: number of buffers
+        - num_pooled: number of unused buffers
+        - num_reused: number of times a buffer has been taken from the pool
+
+        :return: dictionary with memory usage
+        :rtype: dict
+        )pbdoc")
+    .def("set_stats_callback", &MyDecoder::set_stats_callback, pybind11::arg("callback"), R"pbdoc(
+        set_stats_callback(callback) -> None
+
+        Sets a function that is called after each message has been decoded, e.g. to
+        record a histogram of the decoding latency. It is called as
+        callback(num_bytes, num_events, decode_time), where num_events is the number of
+        CD and trigger events that have been stored, and decode_time is in seconds. For
+        decode_until(), the callback is called for each call, with num_bytes zero until
+        the message has been decoded completely.
+
+        :param callback: function to call, or None to remove the callback.
+        :type callback: callable or None
+        )pbdoc")
+    .def("get_num_cd_dropped", &MyDecoder::get_num_cd_dropped, R"pbdoc(
+        get_num_cd_dropped() -> uint64_t
+
+        :return: cumulative number of CD events dropped by the filters, including noise and hot pixels.
         :rtype: uint64_t
+        )pbdoc")
+    .def("get_num_cd_hot_pixel", &MyDecoder::get_num_cd_hot_pixel, R"pbdoc(
+        get_num_cd_hot_pixel() -> uint64_t
+
+        :return: cumulative number of CD events dropped because they came from hot pixels.
+        :rtype: uint64_t
+        )pbdoc")
+    .def("get_num_cd_noise", &MyDecoder::get_num_cd_noise, R"pbdoc(
+        get_num_cd_noise() -> uint64_t
+
+        :return: cumulative number of CD events dropped by the noise filter.
+        :rtype: uint64_t
+        )pbdoc")
+    .def(
+      "set_filter",
+      [](
+        MyDecoder & d, std::optional<typename EventFilter<A>::Roi> roi,
+        std::optional<uint8_t> polarity, std::optional<uint64_t> tMin,
+        std::optional<uint64_t> tMax) { d.get_filter().set_filter(roi, polarity, tMin, tMax); },
+      pybind11::arg("roi") = pybind11::none(), pybind11::arg("polarity") = pybind11::none(),
+      pybind11::arg("t_min") = pybind11::none(), pybind11::arg("t_max") = pybind11::none(),
+      R"pbdoc(
+        set_filter(roi=None, polarity=None, t_min=None, t_max=None) -> None
+
+        Configures the filter that drops CD events while decoding, before they are stored.
+        Only the events that pass all given criteria are kept, and are counted by
+        get_num_cd_on() and get_num_cd_off(). The dropped events are counted by
+        get_num_cd_dropped(). External trigger events are not filtered. Call without
+        arguments to switch the filter off.
+
+        :param roi: region of interest (x, y, width, height) in sensor coordinates
+        :type roi: tuple[int, int, int, int] or None
+        :param polarity: polarity to keep, 0 (OFF) or 1 (ON)
+        :type polarity: int or None
+        :param t_min: sensor time (usec, same as for decode_until()) of the first event to keep
+        :type t_min: uint64_t or None
+        :param t_max: events with sensor time at or beyond t_max are dropped
+        :type t_max: uint64_t or None
+        )pbdoc")
+    .def(
+      "set_noise_filter",
+      [](MyDecoder & d, std::optional<uint64_t> dt) { d.get_filter().set_noise_filter(dt); },
+      pybind11::arg("dt") = pybind11::none(), R"pbdoc(
+        set_noise_filter(dt=None) -> None
+
+        Enables the background activity filter, which drops CD events that have no
+        supporting event at any of the 8 neighboring pixels within the last dt usec.
+        Only events that pass set_filter() and the hot pixel mask support their neighbors.
+        Dropped events are counted by get_num_cd_noise().
+
+        :param dt: length of the support time window in usec, None to switch the filter off.
+        :type dt: uint64_t or None
+        )pbdoc")
+    .def(
+      "set_hot_pixel_mask",
+      [](MyDecoder & d, pybind11::object mask) { d.get_filter().set_hot_pixel_mask(mask); },
+      pybind11::arg("mask"), R"pbdoc(
+        set_hot_pixel_mask(mask) -> None
+
+        Sets the mask of hot pixels whose CD events are dropped. Dropped events are counted
+        by get_num_cd_hot_pixel().
+
+        :param mask: array of shape (height, width) that is non-zero for hot pixels,
+                     or None to remove the mask.
+        :type mask: numpy.ndarray[bool] or None
+        )pbdoc")
+    .def(
+      "get_hot_pixel_mask", [](MyDecoder & d) { return (d.get_filter().get_hot_pixel_mask()); },
+      R"pbdoc(
+        get_hot_pixel_mask() -> numpy.ndarray[bool]
+
+        :return: hot pixel mask of shape (height, width), or None if there is no mask
+                 (yet, when still learning).
+        :rtype: numpy.ndarray[bool] or None
+        )pbdoc")
+    .def(
+      "learn_hot_pixels",
+      [](MyDecoder & d, uint64_t duration, double maxRate) {
+        d.get_filter().learn_hot_pixels(duration, maxRate);
+      },
+      pybind11::arg("duration"), pybind11::arg("max_rate"), R"pbdoc(
+        learn_hot_pixels(duration, max_rate) -> None
+
+        Learns the hot pixel mask from the events decoded next. During the given
+        sensor time duration the events are counted per pixel (and are not dropped).
+        Afterwards, the pixels whose event rate exceeded max_rate are masked, as with
+        set_hot_pixel_mask(). The mask can be retrieved with get_hot_pixel_mask(), e.g.
+        to save and load it for the next recording.
+
+        :param duration: learning duration in usec of sensor time
+        :type duration: uint64_t
+        :param max_rate: maximum event rate (Hz) of a pixel that is not hot
+        :type max_rate: float
+        )pbdoc")
+    .def(
+      "set_remap",
+      [](MyDecoder & d, pybind11::object mapX, pybind11::object mapY) {
+        d.get_filter().set_remap(mapX, mapY);
+      },
+      pybind11::arg("map_x"), pybind11::arg("map_y"), R"pbdoc(
+        set_remap(map_x, map_y) -> None
+
+        Sets a lookup table that maps the sensor coordinates of each CD event to output
+        coordinates as the events are decoded, e.g. to undistort or to downscale them.
+        For the pixel (x, y), the event is stored with coordinates (map_x[y, x], map_y[y, x]),
+        or dropped if either is negative. The output coordinates must lie within the sensor
+        resolution. The remapping happens after all filters (see set_filter()), which
+        therefore work on sensor coordinates. Dropped events are counted by
+        get_num_cd_dropped().
+
+        :param map_x: output x coordinate for each pixel, shape (height, width), or None
+                      to switch remapping off.
+        :type map_x: numpy.ndarray[int32] or None
+        :param map_y: output y coordinate for each pixel, shape (height, width), or None
+        :type map_y: numpy.ndarray[int32] or None
         )pbdoc");
 }
 
+// only for decoders whose accumulators can save the state they carry across messages
+template <typename A>
+pybind11::class_<Decoder<A>> declare_state(pybind11::class_<Decoder<A>> c)
+{
+  using MyDecoder = Decoder<A>;
+  return c
+    .def("enable_state", &MyDecoder::enable_state, pybind11::arg("enabled") = true, R"pbdoc(
+        enable_state(enabled=True) -> None
+
+        Makes the decoder keep copies of the most recent messages (at most 8), which
+        get_state() needs to save the codec state. Must be called before decoding
+        the first message, unless the decoder has been restored with set_state() or
+        unpickled, which enables it already. Disabled by default to avoid copying
+        every message.
+
+        :param enabled: whether get_state() should be supported
+        :type enabled: bool
+        )pbdoc")
+    .def("get_state", &MyDecoder::get_state, R"pbdoc(
+        get_state() -> tuple
+
+        Returns the decoder state as a tuple of python objects. It comprises the codec
+        state (as a copy of the most recent message(s), which are replayed
+        by set_state()), the start time, the filter settings (including the hot pixel
+        mask, the learning and noise filter state, and the remap table), and the
+        cumulative event counters. Restoring the state into a new decoder, possibly in
+        a different process, and continuing with the next message gives the same
+        results as continuing with this decoder. Can not be called while
+        decode_until() is in the middle of a message, or if messages have been decoded
+        before enable_state() was called. Decoders can also be pickled, which uses the
+        same state.
+
+        :return: decoder state
+        :rtype: tuple
+        )pbdoc")
+    .def("set_state", &MyDecoder::set_state, R"pbdoc(
+        set_state(state) -> None
+
+        Restores the decoder state previously obtained with get_state(). Any events that
+        have not been fetched yet are lost.
+
+        :param state: decoder state
+        :type state: tuple
+        )pbdoc")
+    .def(
+      "prime", &MyDecoder::prime, pybind11::arg("msgs"),
+      pybind11::arg("last_sensor_time") = pybind11::none(), R"pbdoc(
+        prime(msgs, last_sensor_time=None) -> uint64_t|None
+
+        Resets the codec and decodes the given messages only to establish the codec state,
+        such that decoding can start in the middle of a stream with the message that
+        follows them. The events of the priming messages are dropped and not counted.
+        The first priming message must contain a time stamp. Since a fresh codec does
+        not know about earlier rollovers of the sensor time, the sensor time can be
+        corrected by passing the sensor time of the last event in the priming messages,
+        e.g. as found in the TimeIndex.
+
+        :param msgs: consecutive messages that precede the first message to decode
+        :type msgs: list[event_camera_msgs/msgs/EventPacket]
+        :param last_sensor_time: sensor time (usec) of the last event in msgs, or None
+        :type last_sensor_time: uint64_t or None
+        :return: sensor time of the last event in msgs, or None if there were no events
+        :rtype: uint64_t or None
+        )pbdoc")
+    .def(
+      pybind11::pickle(
+        [](const MyDecoder & d) { return (d.get_state()); },
+        [](pybind11::tuple state) {
+          auto d = std::make_unique<MyDecoder>();
+          d->set_state(state);
+          return (d);
+        }));
+}
+
 PYBIND11_MODULE(_event_camera_py, m)
 {
   pybind11::options options;
@@ -203,8 +584,296 @@ PYBIND11_MODULE(_event_camera_py, m)
     )pbdoc";
 
   PYBIND11_NUMPY_DTYPE(EventCD, x, y, p, t);
+  PYBIND11_NUMPY_DTYPE(EventCD64, x, y, p, t);
   PYBIND11_NUMPY_DTYPE(EventExtTrig, p, t, id);
+  PYBIND11_NUMPY_DTYPE(EventCDCamera, x, y, p, camera, t);
+  PYBIND11_NUMPY_DTYPE(EventExtTrigCamera, p, t, id, camera);
+  m.attr("EventCD") = pybind11::dtype::of<EventCD>();
+  m.attr("EventCD64") = pybind11::dtype::of<EventCD64>();
+  m.attr("EventExtTrig") = pybind11::dtype::of<EventExtTrig>();
+  m.attr("EventCDCamera") = pybind11::dtype::of<EventCDCamera>();
+  m.attr("EventExtTrigCamera") = pybind11::dtype::of<EventExtTrigCamera>();
+
+  m.def(
+    "encode_events", &encode_events, pybind11::arg("encoding"), pybind11::arg("cd_events"),
+    pybind11::arg("ext_trig_events") = pybind11::none(), R"pbdoc(
+        encode_events(encoding, cd_events, ext_trig_events=None) -> numpy.ndarray[uint8]
+
+        Encodes CD and trigger events into the evt3 or evt2 format, e.g. to write filtered
+        events back in compact form, or to produce test input for the decoders. The events
+        must be sorted by time, with the time ('t' field) being the sensor time in usec.
+        The encoded data starts with a time stamp, so it can be decoded on its own or
+        appended to previously encoded data. Note that the evt3 sensor time rolls over
+        every 2^24 usec: a fresh decoder restores times only modulo 2^24.
+
+        :param encoding: 'evt3' or 'evt2'
+        :type encoding: str
+        :param cd_events: CD events, x and y must be less than 2048.
+        :type cd_events: numpy.ndarray[EventCD] or numpy.ndarray[EventCD64]
+        :param ext_trig_events: external trigger events, or None
+        :type ext_trig_events: numpy.ndarray[EventExtTrig]
+        :return: encoded events, to be used e.g. as the events of an EventPacket message
+        :rtype: numpy.ndarray[uint8]
+        )pbdoc");
+
+  declare_state(declare_decoder<Accumulator>(m, ""));
+  declare_state(declare_decoder<Accumulator64>(m, "Time64"));
+  declare_state(declare_decoder<AccumulatorUnique>(m, "Unique"))
+    .def(
+      "set_full_clear",
+      [](Decoder<AccumulatorUnique> & d, bool fullClear) {
+        d.get_accumulator().set_full_clear(fullClear);
+      },
+      pybind11::arg("full_clear"), R"pbdoc(
+        set_full_clear(full_clear) -> None
+
+        *Only used in combination with Unique Decoder!*
+        If enabled, the whole pixel bitmap is cleared when a new packet starts, as older
+        releases did, instead of only the bytes that have been touched. The packets are
+        the same either way. Only useful for comparing the performance of both methods.
 
-  declare_decoder<Accumulator>(m, "");
-  declare_decoder<AccumulatorUnique>(m, "Unique");
+        :param full_clear: whether to clear the whole bitmap
+        :type full_clear: bool
+        )pbdoc");
+  declare_state(declare_decoder<AccumulatorColumnar>(m, "Columnar"));
+  declare_decoder<AccumulatorFrame>(m, "Frame")
+    .def(
+      "set_count_buffer",
+      [](Decoder<AccumulatorFrame> & d, pybind11::object counts) {
+        d.get_accumulator().set_count_buffer(counts);
+      },
+      R"pbdoc(
+        set_count_buffer(counts) -> None
+
+        *Only used in combination with Frame Decoder!*
+        Sets the image into which the CD events are counted while decoding. The
+        decoder adds to the counts, so the image must be cleared by the caller,
+        e.g. with counts[:] = 0. The image must be a writeable, contiguous numpy array
+        of dtype uint32 and shape (height, width) or (2, height, width). For the
+        latter, OFF events are counted in counts[0] and ON events in counts[1].
+        No CD events are returned by get_cd_events().
+
+        :param counts: image with event counts, or None to stop counting.
+        :type counts: numpy.ndarray[uint32]
+        )pbdoc")
+    .def(
+      "set_time_surface_buffer",
+      [](Decoder<AccumulatorFrame> & d, pybind11::object timeSurface) {
+        d.get_accumulator().set_time_surface_buffer(timeSurface);
+      },
+      R"pbdoc(
+        set_time_surface_buffer(time_surface) -> None
+
+        *Only used in combination with Frame Decoder!*
+        Sets the image into which the sensor time (in usec, same as for decode_until())
+        of the most recent CD event at each pixel is written while decoding.
+        The image must be a writeable, contiguous numpy array of dtype int64 and shape
+        (height, width) or (2, height, width). For the latter, OFF events go to
+        time_surface[0] and ON events to time_surface[1].
+
+        :param time_surface: time surface image, or None to stop updating it.
+        :type time_surface: numpy.ndarray[int64]
+        )pbdoc");
+  declare_decoder<AccumulatorWindow>(m, "Windowed")
+    .def(
+      "set_time_window",
+      [](Decoder<AccumulatorWindow> & d, uint64_t length, std::optional<uint64_t> startTime) {
+        d.get_accumulator().set_time_window(length, startTime);
+      },
+      pybind11::arg("length"), pybind11::arg("start_time") = pybind11::none(), R"pbdoc(
+        set_time_window(length, start_time=None) -> None
+
+        *Only used in combination with Windowed Decoder!*
+        Configures the decoder to slice the event stream into consecutive windows of
+        fixed duration, based on sensor time. Must be called before decoding. Discards
+        all windows that have not been fetched yet.
+
+        :param length: window duration in usec.
+        :type length: uint64_t
+        :param start_time: sensor time (usec) at which the first window starts. Events
+                           before it are dropped. If None, the first window starts with
+                           the first event.
+        :type start_time: uint64_t or None
+        )pbdoc")
+    .def(
+      "set_count_window",
+      [](Decoder<AccumulatorWindow> & d, size_t count) {
+        d.get_accumulator().set_count_window(count);
+      },
+      pybind11::arg("count"), R"pbdoc(
+        set_count_window(count) -> None
+
+        *Only used in combination with Windowed Decoder!*
+        Configures the decoder to slice the event stream into consecutive windows with a
+        fixed number of CD events. The window ends exactly after the given number of CD
+        events, even in the middle of a message. The rest of the message goes to the
+        following window(s). Trigger events are attached to the window that is current
+        when they arrive. Must be called before decoding. Discards all windows that have
+        not been fetched yet.
+
+        :param count: number of CD events per window
+        :type count: uint64_t
+        )pbdoc")
+    .def(
+      "set_trigger_window",
+      [](Decoder<AccumulatorWindow> & d, std::optional<uint8_t> edge, std::optional<uint8_t> id) {
+        d.get_accumulator().set_trigger_window(edge, id);
+      },
+      pybind11::arg("edge") = pybind11::none(), pybind11::arg("trigger_id") = pybind11::none(),
+      R"pbdoc(
+        set_trigger_window(edge=None, trigger_id=None) -> None
+
+        *Only used in combination with Windowed Decoder!*
+        Configures the decoder to slice the event stream at external trigger events,
+        e.g. to align the events with the frames of a triggered camera. A window ends
+        right after a trigger event with matching edge and id, which is the last
+        trigger event of the window, and the next window starts at the time of that
+        trigger. The first window starts with the first event. Must be called before
+        decoding. Discards all windows that have not been fetched yet.
+
+        :param edge: edge (field p of the trigger events) that ends a window: 0 for rising,
+                     1 for falling, None for any.
+        :type edge: int or None
+        :param trigger_id: id of the trigger events that end a window, None for any.
+        :type trigger_id: int or None
+        )pbdoc")
+    .def(
+      "get_windows",
+      [](Decoder<AccumulatorWindow> & d) { return d.get_accumulator().get_windows(); },
+      R"pbdoc(
+        get_windows() -> list[tuple[uint64_t, numpy.ndarray['EventCD'], numpy.ndarray['EventExtTrig']]]
+
+        *Only used in combination with Windowed Decoder!*
+        Fetches the windows that have been completed so far, and clears them out. Unlike
+        with the other decoders, the events are not lost when decode() is called again,
+        and the incomplete window at the end of a message is continued with the next
+        message. Windows without events (gaps in the data) are returned as well.
+
+        :return: list of tuples with window start (sensor time in usec), cd events, and
+                 trigger events. For count windows, the window start is the sensor
+                 time of the first (CD or trigger) event in the window, for trigger
+                 windows the time of the trigger that ended the previous window.
+        :rtype: list[tuple[uint64_t, numpy.ndarray[EventCD], numpy.ndarray[EventExtTrig]]]
+        )pbdoc")
+    .def("flush", [](Decoder<AccumulatorWindow> & d) { d.get_accumulator().flush(); }, R"pbdoc(
+        flush() -> None
+
+        *Only used in combination with Windowed Decoder!*
+        Completes the current window even though its time is not up yet, such that it
+        can be fetched with get_windows(). Call at the end of the stream.
+        )pbdoc");
+
+  pybind11::class_<MultiDecoder>(m, "MultiDecoder")
+    .def(pybind11::init<size_t>(), pybind11::arg("num_cameras"), R"pbdoc(
+        MultiDecoder(num_cameras)
+
+        Decodes the event streams of several cameras and merges them into a single
+        stream that is ordered by time, with the index of the camera in each event.
+        Each camera has its own codec, and the messages of the cameras can be passed
+        in any order. The merged events are sliced into windows of fixed duration. A
+        window is complete once all cameras have delivered events past its end.
+
+        :param num_cameras: number of cameras (at most 256)
+        :type num_cameras: int
+        )pbdoc")
+    .def("get_num_cameras", &MultiDecoder::get_num_cameras, R"pbdoc(
+        get_num_cameras() -> int
+
+        :return: number of cameras
+        :rtype: int
+        )pbdoc")
+    .def(
+      "set_time_offset", &MultiDecoder::set_time_offset, pybind11::arg("camera"),
+      pybind11::arg("offset"), R"pbdoc(
+        set_time_offset(camera, offset) -> None
+
+        Sets the offset that is added to the sensor time of a camera, to bring the
+        clocks of the cameras into agreement. Must be called before decoding.
+
+        :param camera: index of the camera
+        :type camera: int
+        :param offset: time offset in usec, can be negative
+        :type offset: int64_t
+        )pbdoc")
+    .def("get_time_offset", &MultiDecoder::get_time_offset, pybind11::arg("camera"), R"pbdoc(
+        get_time_offset(camera) -> int64_t
+
+        :param camera: index of the camera
+        :type camera: int
+        :return: time offset of the camera in usec
+        :rtype: int64_t
+        )pbdoc")
+    .def(
+      "set_time_window", &MultiDecoder::set_time_window, pybind11::arg("length"),
+      pybind11::arg("start_time") = pybind11::none(), R"pbdoc(
+        set_time_window(length, start_time=None) -> None
+
+        Configures the duration of the windows. Must be called before decoding.
+        Discards all windows that have not been fetched yet.
+
+        :param length: window duration in usec.
+        :type length: uint64_t
+        :param start_time: time (usec, including the offset) at which the first window
+                           starts. Events before it are dropped. If None, the first
+                           window starts with the earliest event once all cameras have
+                           delivered events.
+        :type start_time: int64_t or None
+        )pbdoc")
+    .def("decode", &MultiDecoder::decode, pybind11::arg("camera"), pybind11::arg("msg"), R"pbdoc(
+        decode(camera, msg) -> None
+
+        Decodes a message of a camera and merges the events of all cameras into
+        windows as far as the windows are complete.
+
+        :param camera: index of the camera that produced the message
+        :type camera: int
+        :param msg: event packet message to decode
+        :type msg: event_camera_msgs/msg/EventPacket
+        )pbdoc")
+    .def("get_windows", &MultiDecoder::get_windows, R"pbdoc(
+        get_windows() -> list[tuple[int64_t, numpy.ndarray['EventCDCamera'], numpy.ndarray['EventExtTrigCamera']]]
+
+        Fetches the windows that have been completed so far, and clears them out. The
+        events within a window are ordered by time, and by camera index for equal time.
+        Their time is the sensor time plus the offset of the camera. Windows without
+        events are returned as well.
+
+        :return: list of tuples with window start (usec), CD events, and trigger events.
+        :rtype: list[tuple[int64_t, numpy.ndarray[EventCDCamera], numpy.ndarray[EventExtTrigCamera]]]
+        )pbdoc")
+    .def("flush", &MultiDecoder::flush, R"pbdoc(
+        flush() -> None
+
+        Completes all windows that hold events, even though some cameras may not have
+        progressed that far. Call at the end of the streams. Events that arrive later
+        with times before the end of the completed windows go to the next window.
+        )pbdoc")
+    .def("get_num_cd_off", &MultiDecoder::get_num_cd_off, pybind11::arg("camera"), R"pbdoc(
+        get_num_cd_off(camera) -> uint64_t
+
+        :return: cumulative number of OFF events of the camera.
+        :rtype: uint64_t
+        )pbdoc")
+    .def("get_num_cd_on", &MultiDecoder::get_num_cd_on, pybind11::arg("camera"), R"pbdoc(
+        get_num_cd_on(camera) -> uint64_t
+
+        :return: cumulative number of ON events of the camera.
+        :rtype: uint64_t
+        )pbdoc")
+    .def(
+      "get_num_trigger_rising", &MultiDecoder::get_num_trigger_rising, pybind11::arg("camera"),
+      R"pbdoc(
+        get_num_trigger_rising(camera) -> uint64_t
+
+        :return: cumulative number of rising edge external trigger events of the camera.
+        :rtype: uint64_t
+        )pbdoc")
+    .def(
+      "get_num_trigger_falling", &MultiDecoder::get_num_trigger_falling, pybind11::arg("camera"),
+      R"pbdoc(
+        get_num_trigger_falling(camera) -> uint64_t
+
+        :return: cumulative number of falling edge external trigger events of the camera.
+        :rtype: uint64_t
+        )pbdoc");
 }
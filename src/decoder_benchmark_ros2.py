@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+# -----------------------------------------------------------------------------
+# Copyright 2026 Bernd Pfrommer <bernd.pfrommer@gmail.com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+#
+"""
+Benchmark the decoders and compare the results against a baseline.
+
+Runs each benchmark on the messages of the given bags and on synthetic
+streams of several event rates and message durations. Throughput (Mev/s)
+always refers to the events contained in the input, also for benchmarks
+like find_first_sensor_time that do not decode all of them.
+
+Typical use when checking a release:
+
+  decoder_benchmark_ros2.py --output baseline.json        # on the old release
+  decoder_benchmark_ros2.py --baseline baseline.json      # on the new release
+
+The script only relies on the decoder API of older releases. Benchmarks and
+synthetic inputs that need functionality a release lacks are skipped there,
+and show up as "new" when comparing against its baseline. Each result is the
+median of several runs. The exit code is 1 if a regression has been found.
+"""
+
+import argparse
+import datetime
+import json
+import math
+import platform
+import sys
+import time
+
+import numpy as np
+
+from bag_reader_ros2 import BagReader
+from event_camera_py import Decoder  # noqa: I100  (suppress flake8 error)
+from event_camera_py import UniqueDecoder
+
+try:
+    from event_camera_py import SyntheticEventStream
+except ImportError:  # older releases
+    SyntheticEventStream = None
+
+SCHEMA_VERSION = 1
+
+
+class Input:
+    """Messages to run the benchmarks on, with the buffers prepared for all decode calls."""
+
+    def __init__(self, name, msgs):
+        self.name = name
+        self.msgs = msgs
+        self.buffers = [bytes(msg.events) for msg in msgs]
+        self.arrays = [np.frombuffer(b, dtype=np.uint8) for b in self.buffers]
+        self.num_bytes = sum(len(b) for b in self.buffers)
+        decoder = Decoder()
+        for msg in msgs:
+            decoder.decode(msg)
+        self.num_events = (
+            decoder.get_num_cd_on()
+            + decoder.get_num_cd_off()
+            + decoder.get_num_trigger_rising()
+            + decoder.get_num_trigger_falling()
+        )
+        self.start_time = Decoder().find_first_sensor_time(msgs[0]) or 0
+
+
+def load_bag(fname, topic):
+    bag = BagReader(fname, topic)
+    msgs = []
+    while bag.has_next():
+        msgs.append(bag.read_next()[1])
+    return Input(f'bag:{fname}', msgs)
+
+
+def make_synthetic(event_rate, message_duration, num_events):
+    stream = SyntheticEventStream(event_rate=event_rate, trigger_frequency=1000.0, seed=0)
+    num_messages = max(round(num_events / (event_rate * message_duration * 1e-6)), 1)
+    # replay at least 64ms of distinct data, such that the input does not fit into the cache
+    base = 4096 // math.gcd(message_duration, 4096)  # shortest sequence that can be replayed
+    num_unique = base * max(65536 // (base * message_duration), 1)
+    if num_unique >= num_messages:
+        num_unique = 0
+    msgs = list(stream.messages(num_messages, message_duration, num_unique=num_unique))
+    return Input(f'synthetic:{event_rate * 1e-6:g}Mevs:{message_duration}us', msgs)
+
+
+def bench_decode(decoder, inp, i, state):
+    decoder.decode(inp.msgs[i])
+    decoder.get_cd_events()
+    decoder.get_ext_trig_events()
+
+
+def bench_decode_bytes(decoder, inp, i, state):
+    msg = inp.msgs[i]
+    decoder.decode_bytes(msg.encoding, msg.width, msg.height, msg.time_base, inp.buffers[i])
+    decoder.get_cd_events()
+    decoder.get_ext_trig_events()
+
+
+def bench_decode_array(decoder, inp, i, state):
+    msg = inp.msgs[i]
+    decoder.decode_array(msg.encoding, msg.width, msg.height, msg.time_base, inp.arrays[i])
+    decoder.get_cd_events()
+    decoder.get_ext_trig_events()
+
+
+def bench_decode_until(decoder, inp, i, state):
+    # windows of 1ms, each message is decoded in several pieces
+    reached = True
+    while reached:
+        reached, next_time = decoder.decode_until(inp.msgs[i], state['until'])
+        decoder.get_cd_events()
+        decoder.get_ext_trig_events()
+        while reached and state['until'] <= next_time:
+            state['until'] += 1000
+
+
+def bench_unique_decode(decoder, inp, i, state):
+    decoder.decode(inp.msgs[i])
+    decoder.get_cd_event_packets()
+    decoder.get_ext_trig_event_packets()
+
+
+def bench_find_first_sensor_time(decoder, inp, i, state):
+    decoder.find_first_sensor_time(inp.msgs[i])
+
+
+# name: (decoder class, method under test, benchmark function)
+BENCHMARKS = {
+    'decode': (Decoder, 'decode', bench_decode),
+    'decode_bytes': (Decoder, 'decode_bytes', bench_decode_bytes),
+    'decode_array': (Decoder, 'decode_array', bench_decode_array),
+    'decode_until': (Decoder, 'decode_until', bench_decode_until),
+    'unique_decode': (UniqueDecoder, 'decode', bench_unique_decode),
+    'find_first_sensor_time': (Decoder, 'find_first_sensor_time', bench_find_first_sensor_time),
+}
+
+
+def is_supported(name):
+    """Check if the installed release has the method a benchmark needs."""
+    decoder_class, method, _ = BENCHMARKS[name]
+    return hasattr(decoder_class, method)
+
+
+def run_pass(decoder_class, bench, inp):
+    decoder = decoder_class()
+    state = {'until': inp.start_time + 1000}
+    latencies = np.zeros(len(inp.msgs), dtype=np.int64)
+    t_start = time.perf_counter_ns()
+    for i in range(len(inp.msgs)):
+        t0 = time.perf_counter_ns()
+        bench(decoder, inp, i, state)
+        latencies[i] = time.perf_counter_ns() - t0
+    return time.perf_counter_ns() - t_start, latencies
+
+
+def run_benchmark(name, inp, repeat, min_time):
+    decoder_class, _, bench = BENCHMARKS[name]
+    # a run makes several passes over short inputs, such that it is long enough to time
+    dt, _ = run_pass(decoder_class, bench, inp)
+    num_passes = max(math.ceil(min_time * 1e9 / max(dt, 1)), 1)
+    runs = []
+    for _ in range(repeat):
+        passes = [run_pass(decoder_class, bench, inp) for _ in range(num_passes)]
+        dt = sum(p[0] for p in passes)
+        latencies = np.concatenate([p[1] for p in passes])
+        runs.append((dt, latencies))
+    # use the median run, it is less sensitive to the timing noise than the best one
+    runs.sort(key=lambda run: run[0])
+    dt, latencies = runs[len(runs) // 2]
+    return {
+        'benchmark': name,
+        'input': inp.name,
+        'num_messages': len(inp.msgs),
+        'num_events': inp.num_events,
+        'num_bytes': inp.num_bytes,
+        'num_passes': num_passes,
+        'time': dt * 1e-9,
+        'mevs': inp.num_events * num_passes / max(dt, 1) * 1e3,
+        'latency_median_us': float(np.median(latencies)) * 1e-3,
+        'latency_p99_us': float(np.percentile(latencies, 99)) * 1e-3,
+        'latency_max_us': float(np.max(latencies)) * 1e-3,
+    }
+
+
+def result_key(r):
+    return f'{r["benchmark"]}@{r["input"]}'
+
+
+def compare(results, baseline, tolerance, latency_tolerance, log):
+    """
+    Compare results against a baseline.
+
+    :return: list of keys of the benchmarks that regressed
+    """
+    base = {result_key(r): r for r in baseline['results']}
+    regressions = []
+    print(f'{"benchmark":52s} {"Mev/s":>9s} {"base":>9s} {"ratio":>6s}  p99 ratio', file=log)
+    for r in results:
+        key = result_key(r)
+        b = base.pop(key, None)
+        if b is None:
+            print(f'{key:52s} {r["mevs"]:9.2f} {"new":>9s}', file=log)
+            continue
+        ratio = r['mevs'] / max(b['mevs'], 1e-12)
+        lat_ratio = r['latency_p99_us'] / max(b['latency_p99_us'], 1e-12)
+        flags = []
+        if ratio < 1 - tolerance:
+            flags.append('THROUGHPUT')
+        if lat_ratio > 1 + latency_tolerance:
+            flags.append('LATENCY')
+        if flags:
+            regressions.append(key)
+        print(
+            f'{key:52s} {r["mevs"]:9.2f} {b["mevs"]:9.2f} {ratio:6.2f} {lat_ratio:9.2f}',
+            'REGRESSION: ' + ', '.join(flags) if flags else '',
+            file=log,
+        )
+    if base:
+        print(f'{len(base)} benchmarks of the baseline have not been run', file=log)
+    return regressions
+
+
+def host_info():
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'numpy': np.__version__,
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='benchmark the decoders.')
+    parser.add_argument('--bag', action='append', help='bag to read events from (repeatable)')
+    parser.add_argument('--topic', help='ros topic to read', default='/event_camera/events')
+    parser.add_argument('--repeat', type=int, default=9, help='number of runs per benchmark')
+    parser.add_argument(
+        '--min-time', type=float, default=0.2, help='minimum duration (sec) of a run'
+    )
+    parser.add_argument(
+        '--benchmarks', nargs='+', choices=list(BENCHMARKS), default=list(BENCHMARKS)
+    )
+    parser.add_argument(
+        '--rates',
+        type=float,
+        nargs='+',
+        default=[1e6, 10e6, 50e6],
+        help='event rates (events/sec) of the synthetic inputs',
+    )
+    parser.add_argument(
+        '--durations',
+        type=int,
+        nargs='+',
+        default=[256, 1024, 4096],
+        help='message durations (usec) of the synthetic inputs',
+    )
+    parser.add_argument(
+        '--num-events', type=float, default=2e6, help='number of events per synthetic input'
+    )
+    parser.add_argument('--no-synthetic', action='store_true', help='only use the bags')
+    parser.add_argument('--output', help='file to write the json results to, - for stdout')
+    parser.add_argument('--baseline', help='json results to compare against')
+    parser.add_argument(
+        '--tolerance', type=float, default=0.2, help='allowed relative drop of the throughput'
+    )
+    parser.add_argument(
+        '--latency-tolerance',
+        type=float,
+        default=0.5,
+        help='allowed relative increase of the 99th percentile latency',
+    )
+    args = parser.parse_args()
+    log = sys.stderr if args.output == '-' else sys.stdout
+
+    inputs = [load_bag(bag, args.topic) for bag in (args.bag or ['tests/test_events_1'])]
+    if SyntheticEventStream is None and not args.no_synthetic:
+        print('skipping synthetic inputs, not supported by this release', file=log)
+    elif not args.no_synthetic:
+        for rate in args.rates:
+            for duration in args.durations:
+                inputs.append(make_synthetic(rate, duration, int(args.num_events)))
+
+    benchmarks = []
+    for name in args.benchmarks:
+        if is_supported(name):
+            benchmarks.append(name)
+        else:
+            print(f'skipping benchmark {name}, not supported by this release', file=log)
+
+    results = []
+    for inp in inputs:
+        for name in benchmarks:
+            r = run_benchmark(name, inp, args.repeat, args.min_time)
+            results.append(r)
+            print(
+                f'{result_key(r):52s} rate: {r["mevs"]:8.2f} Mevs',
+                f'latency median: {r["latency_median_us"]:8.1f}us',
+                f'p99: {r["latency_p99_us"]:8.1f}us',
+                file=log,
+            )
+
+    report = {
+        'schema_version': SCHEMA_VERSION,
+        'created': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'host': host_info(),
+        'config': {
+            'repeat': args.repeat,
+            'min_time': args.min_time,
+            'num_events': args.num_events,
+            'rates': args.rates,
+            'durations': args.durations,
+        },
+        'results': results,
+    }
+    if args.output == '-':
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    elif args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance, args.latency_tolerance, log)
+        if regressions:
+            print(f'found {len(regressions)} regressions!', file=log)
+            sys.exit(1)
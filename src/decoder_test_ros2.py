@@ -20,10 +20,10 @@
 import argparse
 import time
 
-from bag_reader_ros2 import BagReader
 import numpy as np
 
-from event_camera_py import Decoder  # noqa: I100  (suppress flake8 error)
+from event_camera_py import BagReader  # noqa: I100  (suppress flake8 error)
+from event_camera_py import Decoder
 from event_camera_py import UniqueDecoder
 
 
@@ -49,18 +49,24 @@ def print_stats(decoder, t0, t1):
         f'Total trigger events: {n_trig} in time: ',
         f'{dt:3f} rate: {rate_trig * 1e-6} Mevs',
     )
+    stats = decoder.get_stats()
+    print(
+        f'Decoded {stats["num_messages"]} messages with {stats["num_bytes"]} bytes,',
+        f'decode time: {stats["decode_time"]:3f} handoff time: {stats["handoff_time"]:3f}',
+        f'decode rate: {(n_cd + n_trig) / max(stats["decode_time"], 1e-9) * 1e-6} Mevs',
+    )
 
 
 def test_decoder(fname, topic):
-    bag = BagReader(fname, topic)
     decoder = Decoder()
 
     t0 = time.time()
-    while bag.has_next():
-        topic, msg, t_rec = bag.read_next()
-        decoder.decode(msg)
-        _ = decoder.get_cd_events()
-        _ = decoder.get_ext_trig_event_packets()
+    # messages are read and deserialized in the background while decoding
+    with BagReader(fname, topic, ros_version=2) as bag:
+        for topic, msg, t_rec in bag:
+            decoder.decode(msg)
+            _ = decoder.get_cd_events()
+            _ = decoder.get_ext_trig_event_packets()
     t1 = time.time()
     print('decoder sensor start time: ', decoder.get_start_time())
     print_stats(decoder, t0, t1)
@@ -79,17 +85,16 @@ def verify_unique(packets) -> bool:
 
 
 def test_unique_decoder(fname, topic):
-    bag = BagReader(fname, topic)
     decoder = UniqueDecoder()
     t0 = time.time()
-    while bag.has_next():
-        topic, msg, t_rec = bag.read_next()
-        decoder.decode(msg)
-        cd_event_packets = decoder.get_cd_event_packets()
-        _ = decoder.get_ext_trig_event_packets()
-        # print(cd_event_packets)
-        if not verify_unique(cd_event_packets):
-            raise Exception('packet indexes is not unique')
+    with BagReader(fname, topic, ros_version=2) as bag:
+        for topic, msg, t_rec in bag:
+            decoder.decode(msg)
+            cd_event_packets = decoder.get_cd_event_packets()
+            _ = decoder.get_ext_trig_event_packets()
+            # print(cd_event_packets)
+            if not verify_unique(cd_event_packets):
+                raise Exception('packet indexes is not unique')
 
     t1 = time.time()
     print_stats(decoder, t0, t1)
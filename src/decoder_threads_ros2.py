@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -----------------------------------------------------------------------------
+# Copyright 2026 Bernd Pfrommer <bernd.pfrommer@gmail.com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+#
+"""Benchmark decoding with multiple decoders running in parallel threads."""
+
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import time
+
+from bag_reader_ros2 import BagReader
+
+from event_camera_py import Decoder  # noqa: I100  (suppress flake8 error)
+
+
+def load_messages(fname, topic):
+    bag = BagReader(fname, topic)
+    msgs = []
+    while bag.has_next():
+        msgs.append(bag.read_next()[1])
+    return msgs
+
+
+def decode_all(msgs, repeat):
+    # Every repetition uses a fresh decoder such that the stream
+    # is decoded from the start, like a camera would deliver it.
+    num_events = 0
+    for _ in range(repeat):
+        decoder = Decoder()
+        for msg in msgs:
+            decoder.decode(msg)
+            _ = decoder.get_cd_events()
+            _ = decoder.get_ext_trig_events()
+        num_events += decoder.get_num_cd_on() + decoder.get_num_cd_off()
+    return num_events
+
+
+def run_benchmark(msgs, num_threads, repeat):
+    with ThreadPoolExecutor(max_workers=num_threads) as pool:
+        t0 = time.perf_counter()
+        futures = [pool.submit(decode_all, msgs, repeat) for _ in range(num_threads)]
+        num_events = sum(f.result() for f in futures)
+        dt = time.perf_counter() - t0
+    return num_events, dt
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='benchmark decoding with multiple threads.')
+    parser.add_argument('--bag', required=True, help='bag file to read events from')
+    parser.add_argument('--topic', help='ros topic to read', default='/event_camera/events')
+    parser.add_argument(
+        '--threads', default='1,2,4,8', help='comma separated list of thread counts'
+    )
+    parser.add_argument(
+        '--repeat', type=int, default=10, help='number of times each thread decodes the bag'
+    )
+    args = parser.parse_args()
+
+    msgs = load_messages(args.bag, args.topic)
+    base_rate = None
+    for num_threads in [int(n) for n in args.threads.split(',')]:
+        num_events, dt = run_benchmark(msgs, num_threads, args.repeat)
+        rate = num_events / dt * 1e-6
+        base_rate = rate if base_rate is None else base_rate
+        print(
+            f'threads: {num_threads:2d} events: {num_events} time: {dt:.3f}s',
+            f'rate: {rate:.2f} Mevs speedup: {rate / base_rate:.2f}',
+        )
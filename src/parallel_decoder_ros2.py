@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+# -----------------------------------------------------------------------------
+# Copyright 2026 Bernd Pfrommer <bernd.pfrommer@gmail.com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+#
+"""Decode a bag with a pool of processes and report the decoding rate."""
+
+import argparse
+
+from event_camera_py import ParallelBagDecoder
+from event_camera_py import TimeIndex
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='decode bag with multiple processes.')
+    parser.add_argument('--bag', required=True, help='bag file to read events from')
+    parser.add_argument('--topic', help='ros topic to read', default='/event_camera/events')
+    parser.add_argument('--workers', type=int, default=None, help='number of processes')
+    parser.add_argument('--chunk', type=int, default=1000, help='messages per chunk')
+    args = parser.parse_args()
+
+    index_file = TimeIndex.sidecar_path(args.bag)
+    try:
+        index = TimeIndex.load(index_file)
+        print('using time index ', index_file)
+    except FileNotFoundError:
+        index = None
+    decoder = ParallelBagDecoder(
+        args.bag, args.topic, num_workers=args.workers, messages_per_chunk=args.chunk, index=index
+    )
+    for _ in decoder.decode():
+        pass
+    print(f'ON  events: {decoder.get_num_cd_on()} OFF events: {decoder.get_num_cd_off()}')
+    print(
+        f'RISE trigger events: {decoder.get_num_trigger_rising()}',
+        f'FALL trigger events: {decoder.get_num_trigger_falling()}',
+    )
+    print(f'rate: {decoder.get_rate():.2f} Mevs')
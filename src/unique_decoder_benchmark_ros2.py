@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -----------------------------------------------------------------------------
+# Copyright 2026 Bernd Pfrommer <bernd.pfrommer@gmail.com>
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+#
+"""
+Benchmark the UniqueDecoder against the plain Decoder.
+
+The "full clear" variant clears the whole pixel bitmap when a packet
+starts, as releases before the dirty list did, so the gain of clearing
+only the touched bytes can be measured with the same build.
+"""
+
+import argparse
+import time
+
+from bag_reader_ros2 import BagReader
+
+from event_camera_py import Decoder  # noqa: I100  (suppress flake8 error)
+from event_camera_py import UniqueDecoder
+
+
+def load_messages(fname, topic):
+    bag = BagReader(fname, topic)
+    msgs = []
+    while bag.has_next():
+        msgs.append(bag.read_next()[1])
+    return msgs
+
+
+def decode_plain(msgs):
+    decoder = Decoder()
+    for msg in msgs:
+        decoder.decode(msg)
+        _ = decoder.get_cd_events()
+        _ = decoder.get_ext_trig_events()
+    return decoder, 0
+
+
+def decode_unique(msgs, full_clear=False):
+    decoder = UniqueDecoder()
+    decoder.set_full_clear(full_clear)
+    num_packets = 0
+    for msg in msgs:
+        decoder.decode(msg)
+        num_packets += len(decoder.get_cd_event_packets())
+        _ = decoder.get_ext_trig_event_packets()
+    return decoder, num_packets
+
+
+def decode_unique_full_clear(msgs):
+    return decode_unique(msgs, full_clear=True)
+
+
+def decode_unique_flat(msgs):
+    decoder = UniqueDecoder()
+    num_packets = 0
+    for msg in msgs:
+        decoder.decode(msg)
+        num_packets += decoder.get_cd_event_packets_flat()[1].shape[0] - 1
+        _ = decoder.get_ext_trig_event_packets()
+    return decoder, num_packets
+
+
+def run_benchmark(decode, msgs, repeat):
+    # use the best of several runs to reduce the timing noise
+    best_dt = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        decoder, num_packets = decode(msgs)
+        dt = time.perf_counter() - t0
+        best_dt = dt if best_dt is None else min(dt, best_dt)
+    num_events = decoder.get_num_cd_on() + decoder.get_num_cd_off()
+    return num_events, num_packets, best_dt
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='benchmark the unique decoder.')
+    parser.add_argument('--bag', default='tests/test_events_1', help='bag to read events from')
+    parser.add_argument('--topic', help='ros topic to read', default='/event_camera/events')
+    parser.add_argument('--repeat', type=int, default=10, help='number of runs per decoder')
+    args = parser.parse_args()
+
+    msgs = load_messages(args.bag, args.topic)
+    for name, decode in (
+        ('Decoder', decode_plain),
+        ('UniqueDecoder', decode_unique),
+        ('full clear', decode_unique_full_clear),
+        ('flat', decode_unique_flat),
+    ):
+        num_events, num_packets, dt = run_benchmark(decode, msgs, args.repeat)
+        print(
+            f'{name:>14s} events: {num_events} packets: {num_packets:6d}',
+            f'time: {dt:.4f}s rate: {num_events / dt * 1e-6:7.2f} Mevs',
+        )
@@ -15,6 +15,9 @@
 #
 
 import os
+import pickle
+import tempfile
+from types import SimpleNamespace
 
 # ------- hack to work around nosetest changing the module path
 import os.path
@@ -24,9 +27,28 @@ sys.path = [os.path.abspath(os.path.dirname(__file__))] + sys.path
 # ------- end of hack
 
 from event_counter import EventCounter  # noqa: E402  (suppress flake8 error)
+import numpy as np  # noqa: E402  (suppress flake8 error)
 import test_verify  # noqa: E402  (suppress flake8 error)
 
-from event_camera_py import Decoder  # noqa: I100, E402  (suppress flake8 error)
+from event_camera_py import BagReader as PrefetchingBagReader  # noqa: I100, E402
+from event_camera_py import ColumnarDecoder  # noqa: E402  (suppress flake8 error)
+from event_camera_py import Decoder  # noqa: E402  (suppress flake8 error)
+from event_camera_py import encode_events  # noqa: E402  (suppress flake8 error)
+from event_camera_py import EventCD  # noqa: E402  (suppress flake8 error)
+from event_camera_py import EventCD64  # noqa: E402  (suppress flake8 error)
+from event_camera_py import EventCDCamera  # noqa: E402  (suppress flake8 error)
+from event_camera_py import EventExtTrig  # noqa: E402  (suppress flake8 error)
+from event_camera_py import EventExtTrigCamera  # noqa: E402  (suppress flake8 error)
+from event_camera_py import FrameDecoder  # noqa: E402  (suppress flake8 error)
+from event_camera_py import MultiDecoder  # noqa: E402  (suppress flake8 error)
+from event_camera_py import iter_count_windows  # noqa: E402  (suppress flake8 error)
+from event_camera_py import iter_trigger_windows  # noqa: E402  (suppress flake8 error)
+from event_camera_py import iter_windows  # noqa: E402  (suppress flake8 error)
+from event_camera_py import ParallelBagDecoder  # noqa: E402  (suppress flake8 error)
+from event_camera_py import RawFileDecoder  # noqa: E402  (suppress flake8 error)
+from event_camera_py import SyntheticEventStream  # noqa: E402  (suppress flake8 error)
+from event_camera_py import Time64Decoder  # noqa: E402  (suppress flake8 error)
+from event_camera_py import TimeIndex  # noqa: E402  (suppress flake8 error)
 from event_camera_py import UniqueDecoder  # noqa: E402  (suppress flake8 error)
 
 is_ros2 = os.environ['ROS_VERSION'] == '2'
@@ -88,6 +110,565 @@ def test_decode_bytes(verbose=False):
     )
 
 
+def test_decode_many(verbose=False):
+    bag = BagReader('tests/test_events_1', verbose)
+    if verbose:
+        print('Testing decode_many')
+    decoder = Decoder()
+    chunk_decoder = Decoder()
+    chunk_decoder.enable_state()
+    counter = EventCounter()
+    msgs = [msg for _, msg, _ in bag.read_messages(topics=['/event_camera/events'])]
+    batch_size = 50
+    for i in range(0, len(msgs), batch_size):
+        batch = msgs[i:i + batch_size]
+        cd_events, trig_events, cd_offsets, trig_offsets = decoder.decode_many(batch)
+        # the history holds the end of the batch, continue in a fresh decoder
+        assert np.array_equal(chunk_decoder.decode_many(batch)[0], cd_events)
+        chunk_decoder = pickle.loads(pickle.dumps(chunk_decoder))
+        assert cd_offsets.shape[0] == len(batch) + 1
+        assert trig_offsets.shape[0] == len(batch) + 1
+        assert cd_offsets[-1] == cd_events.shape[0]
+        assert trig_offsets[-1] == trig_events.shape[0]
+        counter.add_cd_events(cd_events)
+        counter.add_trig_events(trig_events)
+
+    if verbose:
+        counter.print_results()
+
+    counter.check_count(
+        sum_time=2885601049874,
+        num_off_events=218291,
+        num_on_events=125183,
+        num_rise_trig=2078,
+        num_fall_trig=2078,
+    )
+    # the UniqueDecoder cannot return the events of a batch
+    try:
+        UniqueDecoder().decode_many(msgs[:2])
+        assert False, 'decode_many() must fail for the UniqueDecoder'
+    except RuntimeError:
+        pass
+
+
+def test_decode_bytes_many(verbose=False):
+    bag = BagReader('tests/test_events_1', verbose)
+    if verbose:
+        print('Testing decode_bytes_many')
+    msgs = [msg for _, msg, _ in bag.read_messages(topics=['/event_camera/events'])]
+    # the offsets must match the number of events found by decoding one-by-one
+    decoder = Decoder()
+    num_cd = [0]
+    for msg in msgs:
+        decoder.decode(msg)
+        num_cd.append(num_cd[-1] + decoder.get_cd_events().shape[0])
+    decoder = Decoder()
+    cd_events, _, cd_offsets, _ = decoder.decode_bytes_many(
+        msgs[0].encoding,
+        msgs[0].width,
+        msgs[0].height,
+        [msg.time_base for msg in msgs],
+        [msg.events.tobytes() if is_ros2 else msg.events for msg in msgs],
+    )
+    assert list(cd_offsets) == num_cd
+    assert cd_events.shape[0] == 218291 + 125183
+
+
+def test_decode_into(verbose=False):
+    bag = BagReader('tests/test_events_1', verbose)
+    if verbose:
+        print('Testing decode_into')
+    decoder = Decoder()
+    counter = EventCounter()
+    # the CD buffer is too small for some of the messages
+    cd_buf = np.empty(500, dtype=EventCD)
+    trig_buf = np.empty(100, dtype=EventExtTrig)
+    num_overflows = 0
+    for _, msg, _ in bag.read_messages(topics=['/event_camera/events']):
+        num_cd, num_trig, overflow = decoder.decode_into(msg, cd_buf, trig_buf)
+        counter.add_cd_events(cd_buf[:num_cd])
+        counter.add_trig_events(trig_buf[:num_trig])
+        if overflow:
+            num_overflows += 1
+            assert num_cd == cd_buf.shape[0]
+            counter.add_cd_events(decoder.get_cd_events())
+            counter.add_trig_events(decoder.get_ext_trig_events())
+    assert num_overflows > 0
+
+    if verbose:
+        counter.print_results()
+
+    counter.check_count(
+        sum_time=2885601049874,
+        num_off_events=218291,
+        num_on_events=125183,
+        num_rise_trig=2078,
+        num_fall_trig=2078,
+    )
+
+
+def test_time64(verbose=False):
+    bag = BagReader('tests/test_events_1', verbose)
+    if verbose:
+        print('Testing time64')
+    decoder = Decoder()
+    decoder_64 = Time64Decoder()
+    counter = EventCounter()
+    cd_buf = np.empty(100000, dtype=EventCD64)
+    trig_buf = np.empty(1000, dtype=EventExtTrig)
+    for _, msg, _ in bag.read_messages(topics=['/event_camera/events']):
+        decoder.decode(msg)
+        cd_events = decoder.get_cd_events()
+        num_cd, num_trig, overflow = decoder_64.decode_into(msg, cd_buf, trig_buf)
+        assert not overflow
+        cd_events_64 = cd_buf[:num_cd]
+        assert cd_events_64.dtype == EventCD64
+        assert cd_events_64['t'].dtype == np.int64
+        for k in ('x', 'y', 'p', 't'):
+            assert np.array_equal(cd_events_64[k], cd_events[k])
+        counter.add_cd_events(cd_events_64)
+        counter.add_trig_events(trig_buf[:num_trig])
+    assert decoder_64.get_start_time() == decoder.get_start_time()
+
+    if verbose:
+        counter.print_results()
+
+    counter.check_count(
+        sum_time=2885601049874,
+        num_off_events=218291,
+        num_on_events=125183,
+        num_rise_trig=2078,
+        num_fall_trig=2078,
+    )
+
+
+def test_columnar(verbose=False):
+    bag = BagReader('tests/test_events_1', verbose)
+    if verbose:
+        print('Testing columnar')
+    decoder = Decoder()
+    columnar_decoder = ColumnarDecoder()
+    counter = EventCounter()
+    for _, msg, _ in bag.read_messages(topics=['/event_camera/events']):
+        decoder.decode(msg)
+        columnar_decoder.decode(msg)
+        cd_events = decoder.get_cd_events()
+        columns = columnar_decoder.get_cd_events()
+        for k in ('x', 'y', 'p', 't'):
+            assert columns[k].flags['C_CONTIGUOUS']
+            assert np.array_equal(columns[k], cd_events[k])
+        counter.add_cd_events(cd_events)
+        counter.add_trig_events(columnar_decoder.get_ext_trig_events())
+
+    if verbose:
+        counter.print_results()
+
+    counter.check_count(
+        sum_time=2885601049874,
+        num_off_events=218291,
+        num_on_events=125183,
+        num_rise_trig=2078,
+        num_fall_trig=2078,
+    )
+
+
+def test_frame(verbose=False):
+    bag = BagReader('tests/test_events_1', verbose)
+    if verbose:
+        print('Testing frame')
+    decoder = Decoder()
+    frame_decoder = FrameDecoder()
+    counts = np.zeros((2, 480, 640), dtype=np.uint32)
+    time_surface = np.zeros((480, 640), dtype=np.int64)
+    frame_decoder.set_count_buffer(counts)
+    frame_decoder.set_time_surface_buffer(time_surface)
+    expected_counts = np.zeros_like(counts)
+    expected_time_surface = np.zeros_like(time_surface)
+    frame_interval = 100000  # 100 usec
+    frame_time = 7139845 + frame_interval
+    num_frames = 0
+    for _, msg, _ in bag.read_messages(topics=['/event_camera/events']):
+        decoder.decode(msg)
+        cd = decoder.get_cd_events()
+        np.add.at(expected_counts, (cd['p'], cd['y'], cd['x']), 1)
+        np.maximum.at(expected_time_surface, (cd['y'], cd['x']), cd['t'])
+        reachedTimeLimit = True
+        while reachedTimeLimit:
+            reachedTimeLimit, nextTime = frame_decoder.decode_until(msg, frame_time)
+            assert frame_decoder.get_cd_events().shape[0] == 0
+            if reachedTimeLimit:
+                assert np.all(time_surface < frame_time)
+                num_frames += 1
+            while reachedTimeLimit and frame_time <= nextTime:
+                frame_time += frame_interval
+    assert num_frames > 0
+    assert np.array_equal(counts, expected_counts)
+    assert np.array_equal(time_surface, expected_time_surface)
+    assert np.sum(counts[0]) == frame_decoder.get_num_cd_off()
+    assert np.sum(counts[1]) == frame_decoder.get_num_cd_on()
+
+
+def test_iter_windows(verbose=False):
+    bag = BagReader('tests/test_events_1', verbose)
+    if verbose:
+        print('Testing iter_windows')
+    msgs = [msg for _, msg, _ in bag.read_messages(topics=['/event_camera/events'])]
+    decoder = Decoder()
+    all_cd = []
+    for msg in msgs:
+        decoder.decode(msg)
+        all_cd.append(decoder.get_cd_events())
+    all_cd = np.concatenate(all_cd)
+    frame_interval = 100000  # 100 usec
+    t0 = 7139845
+    window_cd = []
+    for i, (t_start, cd, trig) in enumerate(iter_windows(msgs, frame_interval, start_time=t0)):
+        assert t_start == t0 + i * frame_interval
+        assert np.all((cd['t'] >= t_start) & (cd['t'] < t_start + frame_interval))
+        assert np.all((trig['t'] >= t_start) & (trig['t'] < t_start + frame_interval))
+        window_cd.append(cd)
+    assert t_start + frame_interval == 9239845, 'bad final window!'
+    # all events except the few before t0 must show up in the windows
+    assert np.array_equal(np.concatenate(window_cd), all_cd[all_cd['t'] >= t0])
+
+
+def test_iter_count_windows(verbose=False):
+    bag = BagReader('tests/test_events_1', verbose)
+    if verbose:
+        print('Testing iter_count_windows')
+    msgs = [msg for _, msg, _ in bag.read_messages(topics=['/event_camera/events'])]
+    decoder = Decoder()
+    all_cd = []
+    for msg in msgs:
+        decoder.decode(msg)
+        all_cd.append(decoder.get_cd_events())
+    all_cd = np.concatenate(all_cd)
+    counter = EventCounter()
+    count = 50000
+    windows = list(iter_count_windows(msgs, count))
+    assert len(windows) == (all_cd.shape[0] + count - 1) // count
+    for i, (t_start, cd, trig) in enumerate(windows):
+        assert cd.shape[0] == count or i == len(windows) - 1
+        assert t_start <= cd['t'][0]
+        assert np.array_equal(cd, all_cd[i * count:(i + 1) * count])
+        counter.add_cd_events(cd)
+        counter.add_trig_events(trig)
+
+    if verbose:
+        counter.print_results()
+
+    counter.check_count(
+        sum_time=2885601049874,
+        num_off_events=218291,
+        num_on_events=125183,
+        num_rise_trig=2078,
+        num_fall_trig=2078,
+    )
+
+
+def test_iter_trigger_windows(verbose=False):
+    bag = BagReader('tests/test_events_1', verbose)
+    if verbose:
+        print('Testing iter_trigger_windows')
+    msgs = [msg for _, msg, _ in bag.read_messages(topics=['/event_camera/events'])]
+    decoder = Decoder()
+    all_cd, all_trig = [], []
+    for msg in msgs:
+        decoder.decode(msg)
+        all_cd.append(decoder.get_cd_events())
+        all_trig.append(decoder.get_ext_trig_events())
+    all_cd = np.concatenate(all_cd)
+    all_trig = np.concatenate(all_trig)
+    for edge in (0, 1, None):
+        ref_trig = all_trig if edge is None else all_trig[all_trig['p'] == edge]
+        slices = list(iter_trigger_windows(msgs, edge=edge))
+        assert len(slices) == ref_trig.shape[0] + 1 and slices[-1][0] is None
+        trig = np.array([s[0] for s in slices[:-1]], dtype=EventExtTrig)
+        assert np.array_equal(trig, ref_trig)
+        # the events are sliced without losing or reordering any
+        assert np.array_equal(np.concatenate([s[1] for s in slices]), all_cd)
+        for (t, cd), t_prev in zip(slices[1:-1], ref_trig['t']):
+            assert np.all((cd['t'] >= t_prev) & (cd['t'] <= t['t']))
+    # no trigger with this id: all events come after the last trigger
+    slices = list(iter_trigger_windows(msgs, trigger_id=5))
+    assert len(slices) == 1 and slices[0][0] is None
+    assert np.array_equal(slices[0][1], all_cd)
+
+
+def test_time_index(verbose=False):
+    bag = BagReader('tests/test_events_1', verbose)
+    if verbose:
+        print('Testing time index')
+    msgs, t_rec = [], []
+    for _, msg, t in bag.read_messages(topics=['/event_camera/events']):
+        msgs.append(msg)
+        t_rec.append(t)
+    index = TimeIndex.build(msgs, t_rec)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = TimeIndex.sidecar_path(os.path.join(tmp_dir, 'test_events_1'))
+        index.save(path)
+        index = TimeIndex.load(path)
+    e = index.entries
+    assert len(index) == len(msgs)
+    assert index.encoding == 'evt3'
+    assert np.array_equal(e['recording_time'], t_rec)
+    assert np.sum(e['num_cd']) == 218291 + 125183
+    assert np.all(e['first_time'] <= e['last_time'])
+    assert index.get_time_range()[0] == 7139840
+    assert index.seek(0).index == 0
+    assert index.seek(index.get_time_range()[1] + 1).index == len(msgs)
+
+    # decoding from the seek position must give the same events as decoding all
+    decoder = Decoder()
+    all_cd = []
+    for msg in msgs:
+        decoder.decode(msg)
+        all_cd.append(decoder.get_cd_events())
+    num_trig = decoder.get_num_trigger_rising() + decoder.get_num_trigger_falling()
+    assert np.sum(e['num_trig']) == num_trig
+    t_seek = 8000000
+    pos = index.seek(t_seek)
+    assert e['last_time'][pos.index] >= t_seek and e['last_time'][pos.index - 1] < t_seek
+    assert pos.prime_index < pos.index
+    decoder = Decoder()
+    decoder.prime(msgs[pos.prime_index:pos.index], pos.last_time)
+    assert decoder.get_num_cd_on() == 0
+    for i in range(pos.index, len(msgs)):
+        decoder.decode(msgs[i])
+        assert np.array_equal(decoder.get_cd_events(), all_cd[i])
+
+
+def test_state(verbose=False):
+    bag = BagReader('tests/test_events_1', verbose)
+    if verbose:
+        print('Testing get_state/set_state')
+    msgs = [msg for _, msg, _ in bag.read_messages(topics=['/event_camera/events'])]
+    for decoder_class in (Decoder, UniqueDecoder):
+        decoder = decoder_class()
+        chunk_decoder = decoder_class()
+        chunk_decoder.enable_state()
+        for i, msg in enumerate(msgs):
+            if i % 100 == 50:
+                # continue with a fresh decoder, as if decoding in another process
+                chunk_decoder = pickle.loads(pickle.dumps(chunk_decoder))
+            decoder.decode(msg)
+            chunk_decoder.decode(msg)
+            if decoder_class is UniqueDecoder:
+                # the packets continue across the restore
+                cd, offsets = decoder.get_cd_event_packets_flat()
+                chunk_cd, chunk_offsets = chunk_decoder.get_cd_event_packets_flat()
+                assert np.array_equal(offsets, chunk_offsets)
+            else:
+                cd = decoder.get_cd_events()
+                chunk_cd = chunk_decoder.get_cd_events()
+            assert np.array_equal(cd, chunk_cd)
+        assert chunk_decoder.get_num_cd_off() == 218291
+        assert chunk_decoder.get_num_cd_on() == 125183
+        assert chunk_decoder.get_num_trigger_rising() == decoder.get_num_trigger_rising()
+        assert chunk_decoder.get_start_time() == decoder.get_start_time()
+        # without enable_state(), the decoder does not keep the messages
+        try:
+            pickle.dumps(decoder)
+            assert False, 'pickling must fail without enable_state()'
+        except RuntimeError:
+            pass
+
+
+def make_evt3_rollover_messages():
+    # one message per time high value, crossing the rollover of the 24 bit sensor time
+    msgs = []
+    for th in list(range(0xFF0, 0x1000)) + list(range(0, 0x10)):
+        words = [0x8000 | th]
+        for tl in (0x000, 0x800):
+            words += [0x6000 | tl, 0x0000 | (th % 480), 0x2000 | (1 << 11) | (tl % 640)]
+        msgs.append(
+            SimpleNamespace(
+                encoding='evt3',
+                width=640,
+                height=480,
+                time_base=0,
+                events=np.array(words, dtype=np.uint16).tobytes(),
+            )
+        )
+    return msgs
+
+
+def test_time_index_rollover(verbose=False):
+    if verbose:
+        print('Testing time index with time rollover')
+    msgs = make_evt3_rollover_messages()
+    decoder = Time64Decoder()
+    all_cd = []
+    for msg in msgs:
+        decoder.decode(msg)
+        all_cd.append(decoder.get_cd_events())
+    index = TimeIndex.build(msgs)
+    # seek past the rollover, priming from before it
+    for num_priming in (1, 8):
+        pos = index.seek(index.entries['first_time'][-4], num_priming)
+        assert pos.index == len(msgs) - 4
+        assert pos.last_time == index.entries['last_time'][pos.index - 1]
+        seek_decoder = Time64Decoder()
+        seek_decoder.prime(msgs[pos.prime_index:pos.index], pos.last_time)
+        for i in range(pos.index, len(msgs)):
+            seek_decoder.decode(msgs[i])
+            cd = seek_decoder.get_cd_events()
+            assert np.all(cd['t'] > (1 << 24))
+            assert np.array_equal(cd, all_cd[i])
+
+
+def test_state_rollover(verbose=False):
+    if verbose:
+        print('Testing set_state with time rollover')
+    msgs = make_evt3_rollover_messages()
+    decoder = Time64Decoder()
+    decoder.enable_state()
+    for msg in msgs[:-4]:
+        decoder.decode(msg)
+    decoder.get_cd_events()
+    restored = Time64Decoder()
+    restored.set_state(decoder.get_state())
+    # prime another decoder with the help of the time index
+    index = TimeIndex.build(msgs)
+    pos = index.seek(index.entries['first_time'][-4])
+    assert pos.index == len(msgs) - 4
+    primed = Time64Decoder()
+    primed.prime(msgs[pos.prime_index:pos.index], pos.last_time)
+    for msg in msgs[-4:]:
+        decoder.decode(msg)
+        restored.decode(msg)
+        primed.decode(msg)
+        cd = decoder.get_cd_events()
+        assert np.all(cd['t'] > (1 << 24))
+        assert np.array_equal(cd, restored.get_cd_events())
+        assert np.array_equal(cd, primed.get_cd_events())
+
+
+def test_parallel_bag_decoder(verbose=False):
+    if not is_ros2:
+        return
+    if verbose:
+        print('Testing parallel bag decoder')
+    bag = BagReader('tests/test_events_1', verbose)
+    decoder = Time64Decoder()
+    msgs, t_rec, all_cd, all_trig = [], [], [], []
+    for _, msg, t in bag.read_messages(topics=['/event_camera/events']):
+        decoder.decode(msg)
+        msgs.append(msg)
+        t_rec.append(t)
+        all_cd.append(decoder.get_cd_events())
+        all_trig.append(decoder.get_ext_trig_events())
+    # chunks by recording time from the bag metadata, or by message count from the index
+    for index in (None, TimeIndex.build(msgs, t_rec)):
+        parallel_decoder = ParallelBagDecoder(
+            'tests/test_events_1', num_workers=2, messages_per_chunk=50, index=index
+        )
+        # the workers do not read the previous chunk to find the priming messages
+        chunks = parallel_decoder._make_chunks()
+        assert all(c[1] > prev[2] for prev, c in zip(chunks[1:], chunks[2:]))
+        counter = EventCounter()
+        end = 0
+        for chunk in parallel_decoder.decode():
+            assert chunk.first_message == end
+            end = chunk.end_message
+            if index is not None:
+                assert end - chunk.first_message == min(50, len(msgs) - chunk.first_message)
+            assert np.array_equal(
+                chunk.cd_events, np.concatenate(all_cd[chunk.first_message:end])
+            )
+            assert np.array_equal(
+                chunk.ext_trig_events, np.concatenate(all_trig[chunk.first_message:end])
+            )
+            counter.add_cd_events(chunk.cd_events)
+            counter.add_trig_events(chunk.ext_trig_events)
+        assert end == len(all_cd)
+        assert parallel_decoder.get_num_cd_off() == 218291
+        assert parallel_decoder.get_num_cd_on() == 125183
+        assert parallel_decoder.get_num_trigger_rising() == decoder.get_num_trigger_rising()
+        assert parallel_decoder.get_num_trigger_falling() == decoder.get_num_trigger_falling()
+        assert parallel_decoder.get_rate() > 0
+        if verbose:
+            counter.print_results()
+        counter.check_count(
+            sum_time=2885601049874,
+            num_off_events=218291,
+            num_on_events=125183,
+            num_rise_trig=2078,
+            num_fall_trig=2078,
+        )
+
+
+def test_prefetching_bag_reader(verbose=False):
+    if verbose:
+        print('Testing prefetching bag reader')
+    topic = '/event_camera/events'
+    bag = BagReader('tests/test_events_1', verbose)
+    expected = [(msg.events, t) for _, msg, t in bag.read_messages(topics=[topic])]
+    bag_path = 'tests/test_events_1' + ('' if is_ros2 else '.bag')
+    with PrefetchingBagReader(bag_path, topic, queue_size=4) as bag:
+        decoder = Decoder()
+        counter = EventCounter()
+        for i, (msg_topic, msg, t) in enumerate(bag):
+            assert msg_topic == topic
+            assert bytes(msg.events) == bytes(expected[i][0])
+            assert t == expected[i][1]
+            decoder.decode(msg)
+            counter.add_cd_events(decoder.get_cd_events())
+            counter.add_trig_events(decoder.get_ext_trig_events())
+    assert i + 1 == len(expected)
+    counter.check_count(
+        sum_time=2885601049874,
+        num_off_events=218291,
+        num_on_events=125183,
+        num_rise_trig=2078,
+        num_fall_trig=2078,
+    )
+    # stop reading early, must not block
+    with PrefetchingBagReader(bag_path, topic, queue_size=4) as bag:
+        for i, _ in enumerate(bag):
+            if i == 10:
+                break
+
+
+def test_decode_serialized(verbose=False):
+    if not is_ros2:
+        return
+    if verbose:
+        print('Testing decode_serialized')
+    from event_camera_py.bag_reader import open_ros2_reader
+
+    bag = BagReader('tests/test_events_1', verbose)
+    msgs = [msg for _, msg, _ in bag.read_messages(topics=['/event_camera/events'])]
+    reader, _ = open_ros2_reader('tests/test_events_1', ['/event_camera/events'])
+    decoder = Decoder()
+    raw_decoder = Decoder()
+    counter = EventCounter()
+    for msg in msgs:
+        _, data, _ = reader.read_next()
+        assert raw_decoder.find_first_sensor_time_serialized(
+            data
+        ) == decoder.find_first_sensor_time(msg)
+        decoder.decode(msg)
+        raw_decoder.decode_serialized(data)
+        cd = raw_decoder.get_cd_events()
+        assert np.array_equal(cd, decoder.get_cd_events())
+        counter.add_cd_events(cd)
+        counter.add_trig_events(raw_decoder.get_ext_trig_events())
+    counter.check_count(
+        sum_time=2885601049874,
+        num_off_events=218291,
+        num_on_events=125183,
+        num_rise_trig=2078,
+        num_fall_trig=2078,
+    )
+    # truncated message must raise error
+    try:
+        raw_decoder.decode_serialized(data[:20])
+        assert False, 'truncated message not detected!'
+    except RuntimeError:
+        pass
+
+
 def test_decode_until(verbose=False):
     bag = BagReader('tests/test_events_1', verbose)
     if verbose:
@@ -123,6 +704,504 @@ def test_decode_until(verbose=False):
     )
 
 
+def write_raw_file(fname):
+    bag = BagReader('tests/test_events_1')
+    with open(fname, 'wb') as f:
+        f.write(b'% camera_integrator_name Prophesee\n')
+        f.write(b'% format EVT3;height=480;width=640\n')
+        f.write(b'% end\n')
+        for _, msg, _ in bag.read_messages(topics=['/event_camera/events']):
+            f.write(bytes(msg.events))
+
+
+def test_raw_file_decoder(verbose=False):
+    if verbose:
+        print('Testing raw file decoder')
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        fname = os.path.join(tmp_dir, 'test_events_1.raw')
+        write_raw_file(fname)
+        with RawFileDecoder(fname, chunk_size=100001) as raw_decoder:
+            assert raw_decoder.encoding == 'evt3'
+            assert (raw_decoder.width, raw_decoder.height) == (640, 480)
+            assert raw_decoder.find_first_sensor_time() == 7139840
+            counter = EventCounter()
+            while raw_decoder.decode():
+                counter.add_cd_events(raw_decoder.get_cd_events())
+                counter.add_trig_events(raw_decoder.get_ext_trig_events())
+            counter.check_count(
+                sum_time=2885601049874,
+                num_off_events=218291,
+                num_on_events=125183,
+                num_rise_trig=2078,
+                num_fall_trig=2078,
+            )
+            # the decoder has not kept copies of the chunks
+            try:
+                raw_decoder.get_decoder().get_state()
+                assert False, 'decoder must not keep the state by default'
+            except RuntimeError:
+                pass
+
+        # same as test_decode_until(), but the time slices span chunks
+        with RawFileDecoder(fname, chunk_size=100001) as raw_decoder:
+            counter = EventCounter()
+            frame_interval = 100000
+            frame_time = 7139845 + frame_interval
+            reached_time_limit = True
+            while reached_time_limit:
+                reached_time_limit, next_time = raw_decoder.decode_until(frame_time)
+                cd = raw_decoder.get_cd_events()
+                assert np.all(cd['t'] < frame_time)
+                counter.add_cd_events(cd)
+                counter.add_trig_events(raw_decoder.get_ext_trig_events())
+                while reached_time_limit and frame_time <= next_time:
+                    frame_time += frame_interval
+            assert frame_time == 9239845, 'bad frame time!'
+            counter.check_count(
+                sum_time=2885601049874,
+                num_off_events=218291,
+                num_on_events=125183,
+                num_rise_trig=2078,
+                num_fall_trig=2078,
+            )
+
+        with RawFileDecoder(fname) as raw_decoder:
+            num_cd = sum(cd.shape[0] for _, cd, _ in raw_decoder.iter_windows(100000))
+            assert num_cd == 218291 + 125183
+
+
+def test_filter(verbose=False):
+    bag = BagReader('tests/test_events_1', verbose)
+    if verbose:
+        print('Testing filter')
+    decoder = Decoder()
+    filtered = Decoder()
+    unique = UniqueDecoder()
+    chunk_decoder = Decoder()
+    t_min, t_max = 7500000, 9000000
+    for d in (filtered, unique, chunk_decoder):
+        d.set_filter(roi=(100, 50, 200, 150), polarity=1, t_min=t_min, t_max=t_max)
+    chunk_decoder.enable_state()
+    num_kept = 0
+    for i, (_, msg, _) in enumerate(bag.read_messages(topics=['/event_camera/events'])):
+        if i == 50:
+            # the filter settings are part of the state
+            chunk_decoder = pickle.loads(pickle.dumps(chunk_decoder))
+        decoder.decode(msg)
+        filtered.decode(msg)
+        unique.decode(msg)
+        chunk_decoder.decode(msg)
+        cd = decoder.get_cd_events()
+        t = cd['t'].astype(np.int64) + (decoder.get_start_time() or 0)
+        keep = (
+            (cd['x'] >= 100)
+            & (cd['x'] < 300)
+            & (cd['y'] >= 50)
+            & (cd['y'] < 200)
+            & (cd['p'] == 1)
+            & (t >= t_min)
+            & (t < t_max)
+        )
+        cd_filtered = filtered.get_cd_events()
+        assert np.array_equal(cd[keep], cd_filtered)
+        assert np.array_equal(decoder.get_ext_trig_events(), filtered.get_ext_trig_events())
+        cd_unique, _ = unique.get_cd_event_packets_flat()
+        assert np.array_equal(cd[keep], cd_unique)
+        assert np.array_equal(cd[keep], chunk_decoder.get_cd_events())
+        num_kept += cd_filtered.shape[0]
+    assert num_kept > 0
+    for d in (filtered, unique, chunk_decoder):
+        assert d.get_num_cd_off() == 0
+        assert d.get_num_cd_on() == num_kept
+        assert d.get_num_cd_dropped() == 218291 + 125183 - num_kept
+    assert decoder.get_num_cd_dropped() == 0
+
+
+def test_hot_pixel_filter(verbose=False):
+    if verbose:
+        print('Testing hot pixel filter')
+    msgs = [msg for _, msg, _ in BagReader('tests/test_events_1').read_messages(
+        topics=['/event_camera/events'])]
+    decoder = Decoder()
+    filtered = Decoder()
+    duration, max_rate = 500000, 20.0
+    filtered.learn_hot_pixels(duration, max_rate)
+    assert filtered.get_hot_pixel_mask() is None
+    chunk_decoder = Decoder()
+    chunk_decoder.enable_state()
+    chunk_decoder.learn_hot_pixels(duration, max_rate)
+    cd, cd_filtered = [], []
+    for i, msg in enumerate(msgs):
+        if i % 100 == 60:
+            # the learning state and the mask are part of the decoder state
+            assert (chunk_decoder.get_hot_pixel_mask() is None) == (i == 60)
+            chunk_decoder = pickle.loads(pickle.dumps(chunk_decoder))
+        decoder.decode(msg)
+        filtered.decode(msg)
+        chunk_decoder.decode(msg)
+        cd.append(decoder.get_cd_events())
+        cd_filtered.append(filtered.get_cd_events())
+        assert np.array_equal(cd_filtered[-1], chunk_decoder.get_cd_events())
+    cd, cd_filtered = np.concatenate(cd), np.concatenate(cd_filtered)
+    # the same mask computed with numpy
+    learning = cd['t'] < cd['t'][0] + duration
+    counts = np.zeros((480, 640), dtype=np.int64)
+    np.add.at(counts, (cd['y'][learning], cd['x'][learning]), 1)
+    mask = counts > max_rate * duration * 1e-6
+    assert np.count_nonzero(mask) > 0
+    assert np.array_equal(filtered.get_hot_pixel_mask(), mask)
+    is_hot = ~learning & mask[cd['y'], cd['x']]
+    assert np.array_equal(cd[~is_hot], cd_filtered)
+    assert filtered.get_num_cd_hot_pixel() == np.count_nonzero(is_hot)
+    assert filtered.get_num_cd_dropped() == filtered.get_num_cd_hot_pixel()
+
+    assert np.array_equal(chunk_decoder.get_hot_pixel_mask(), mask)
+    assert chunk_decoder.get_num_cd_hot_pixel() == filtered.get_num_cd_hot_pixel()
+    assert chunk_decoder.get_num_cd_dropped() == filtered.get_num_cd_dropped()
+
+    # a loaded mask drops all events of the hot pixels
+    loaded = Decoder()
+    loaded.set_hot_pixel_mask(mask)
+    for msg in msgs:
+        loaded.decode(msg)
+        cd_loaded = loaded.get_cd_events()
+        assert not np.any(mask[cd_loaded['y'], cd_loaded['x']])
+    assert loaded.get_num_cd_hot_pixel() == np.count_nonzero(mask[cd['y'], cd['x']])
+
+
+def test_noise_filter(verbose=False):
+    if verbose:
+        print('Testing noise filter')
+    decoder = Decoder()
+    filtered = UniqueDecoder()
+    chunk_decoder = UniqueDecoder()
+    chunk_decoder.enable_state()
+    dt = 2000
+    filtered.set_noise_filter(dt)
+    chunk_decoder.set_noise_filter(dt)
+    # reference implementation, the time map has a border of one pixel
+    last_time = np.zeros((482, 642), dtype=np.int64)
+    num_msgs = 0
+    for _, msg, _ in BagReader('tests/test_events_1').read_messages(
+        topics=['/event_camera/events']
+    ):
+        if num_msgs == 10:
+            # the time map of the noise filter is part of the decoder state
+            chunk_decoder = pickle.loads(pickle.dumps(chunk_decoder))
+        decoder.decode(msg)
+        filtered.decode(msg)
+        chunk_decoder.decode(msg)
+        cd = decoder.get_cd_events()
+        keep = np.zeros(cd.shape[0], dtype=bool)
+        for i, (x, y, t) in enumerate(zip(cd['x'], cd['y'], cd['t'].astype(np.int64))):
+            nbr = last_time[y : y + 3, x : x + 3]  # noqa: E203
+            keep[i] = np.count_nonzero(nbr > max(t - dt, 0)) > (nbr[1, 1] > max(t - dt, 0))
+            last_time[y + 1, x + 1] = t
+        cd_filtered, _ = filtered.get_cd_event_packets_flat()
+        assert np.array_equal(cd[keep], cd_filtered)
+        assert np.array_equal(cd_filtered, chunk_decoder.get_cd_event_packets_flat()[0])
+        num_msgs += 1
+        if num_msgs == 20:  # the python reference is slow
+            break
+    assert filtered.get_num_cd_noise() > 0
+    assert filtered.get_num_cd_noise() == filtered.get_num_cd_dropped()
+    assert chunk_decoder.get_num_cd_noise() == filtered.get_num_cd_noise()
+    assert filtered.get_num_cd_noise() + filtered.get_num_cd_on() + filtered.get_num_cd_off() == (
+        decoder.get_num_cd_on() + decoder.get_num_cd_off()
+    )
+
+
+def test_remap(verbose=False):
+    if verbose:
+        print('Testing remap')
+    decoder = Decoder()
+    remapped = Decoder()
+    # downscale by two, flip horizontally, and drop a border of 10 pixels
+    y, x = np.mgrid[0:480, 0:640]
+    map_x = (639 - x) // 2
+    map_y = y // 2
+    map_x[:, :10] = -1
+    remapped.set_remap(map_x, map_y)
+    chunk_decoder = Decoder()
+    chunk_decoder.enable_state()
+    chunk_decoder.set_remap(map_x, map_y)
+    num_events, num_dropped = 0, 0
+    for i, (_, msg, _) in enumerate(
+        BagReader('tests/test_events_1').read_messages(topics=['/event_camera/events'])
+    ):
+        if i == 50:
+            # the remap table is part of the decoder state
+            chunk_decoder = pickle.loads(pickle.dumps(chunk_decoder))
+        decoder.decode(msg)
+        remapped.decode(msg)
+        chunk_decoder.decode(msg)
+        cd = decoder.get_cd_events()
+        keep = cd['x'] >= 10
+        expected = cd[keep]
+        expected['x'] = map_x[expected['y'], expected['x']]
+        expected['y'] = map_y[expected['y'], cd['x'][keep]]
+        assert np.array_equal(expected, remapped.get_cd_events())
+        assert np.array_equal(expected, chunk_decoder.get_cd_events())
+        num_events += cd.shape[0]
+        num_dropped += np.count_nonzero(~keep)
+    assert remapped.get_num_cd_dropped() == num_dropped
+    assert remapped.get_num_cd_on() + remapped.get_num_cd_off() == num_events - num_dropped
+    try:
+        remapped.set_remap(map_x[:, :320], map_y[:, :320])
+        assert False, 'remap table with wrong shape must be rejected!'
+    except RuntimeError:
+        pass
+
+
+def test_stats(verbose=False):
+    if verbose:
+        print('Testing stats')
+    msgs = [msg for _, msg, _ in BagReader('tests/test_events_1').read_messages(
+        topics=['/event_camera/events'])]
+    decoder = Decoder()
+    calls = []
+    decoder.set_stats_callback(lambda *args: calls.append(args))
+    max_size_cd = 0
+    for msg in msgs:
+        decoder.decode(msg)
+        max_size_cd = max(max_size_cd, decoder.get_cd_events().shape[0])
+        decoder.get_ext_trig_events()
+    stats = decoder.get_stats()
+    num_trig = decoder.get_num_trigger_rising() + decoder.get_num_trigger_falling()
+    num_events = 218291 + 125183 + num_trig
+    assert stats['num_messages'] == len(msgs)
+    assert stats['num_bytes'] == sum(len(msg.events) for msg in msgs)
+    assert stats['decode_time'] > 0 and stats['handoff_time'] > 0
+    assert stats['max_size_cd'] == max_size_cd
+    assert 0 < stats['num_allocations'] < len(msgs)  # the buffers are recycled
+    assert len(calls) == len(msgs)
+    assert [c[0] for c in calls] == [len(msg.events) for msg in msgs]
+    assert sum(c[1] for c in calls) == num_events
+    assert abs(sum(c[2] for c in calls) - stats['decode_time']) < 1e-6
+
+    # decode_many() reports each message as well
+    decoder = Decoder()
+    decoder.set_stats_callback(lambda *args: calls.append(args))
+    calls.clear()
+    decoder.decode_many(msgs)
+    assert decoder.get_stats()['num_messages'] == len(msgs)
+    assert len(calls) == len(msgs) and sum(c[1] for c in calls) == num_events
+    decoder.reset_stats()
+    assert decoder.get_stats()['num_bytes'] == 0
+
+
+def decode_all(msgs):
+    decoder = Time64Decoder()
+    cd, trig = [], []
+    for msg in msgs:
+        decoder.decode(msg)
+        cd.append(decoder.get_cd_events())
+        trig.append(decoder.get_ext_trig_events())
+    return np.concatenate(cd), np.concatenate(trig)
+
+
+def test_encoder(verbose=False):
+    if verbose:
+        print('Testing encoder')
+    stream = SyntheticEventStream(
+        width=640, height=480, event_rate=2e6, num_hot_pixels=5, trigger_frequency=1000.0, seed=1
+    )
+    cd, trig = stream.generate_events(10000)
+    assert np.all(np.diff(cd['t']) >= 0) and trig.shape[0] == 20
+    assert trig['t'][0] == 0 and np.array_equal(trig['p'][:2], [0, 1])  # rising edge first
+    # round trip through the decoder must give back the identical events
+    msgs = list(stream.messages(20, message_duration=500))
+    for msg in msgs:
+        msg.events = msg.events.copy()  # decoder must not depend on the encoder's buffer
+    cd_dec, trig_dec = decode_all(msgs)
+    stream = SyntheticEventStream(
+        width=640, height=480, event_rate=2e6, num_hot_pixels=5, trigger_frequency=1000.0, seed=1
+    )
+    stream.generate_events(10000)
+    cd_ref, trig_ref = [], []
+    for _ in range(20):
+        c, t = stream.generate_events(500)
+        cd_ref.append(c)
+        trig_ref.append(t)
+    assert np.array_equal(cd_dec, np.concatenate(cd_ref))
+    assert np.array_equal(trig_dec, np.concatenate(trig_ref))
+    # the rising edges are at multiples of the trigger period, and have p = 0
+    decoder = Decoder()
+    for msg in msgs:
+        decoder.decode(msg)
+    assert decoder.get_num_trigger_rising() == np.count_nonzero(trig_dec['p'] == 0)
+    rising = [t for t, _ in iter_trigger_windows(msgs, edge=0) if t is not None]
+    assert len(rising) == decoder.get_num_trigger_rising()
+    assert all(t['p'] == 0 and t['t'] % 1000 == 0 for t in rising)
+
+    # time gaps beyond the rollover of the evt3 time stamps, and EventCD input
+    cd = np.zeros(3, dtype=EventCD64)
+    cd['t'] = [5, 5, (1 << 26) + 7]
+    cd['x'] = [3, 4, 639]
+    cd['p'] = [1, 1, 0]
+    msg = SimpleNamespace(
+        encoding='evt3', width=640, height=480, time_base=0, events=encode_events('evt3', cd)
+    )
+    assert np.array_equal(decode_all([msg])[0], cd)
+    cd32 = np.zeros(2, dtype=EventCD)
+    cd32['t'] = [10, 12]
+    cd32['x'] = [1, 100]
+    msg.events = encode_events('evt3', cd32)
+    assert np.array_equal(decode_all([msg])[0]['x'], cd32['x'])
+
+    # evt2: check the layout of the words
+    words = encode_events('evt2', cd, trig[:2]).view(np.uint32)
+    is_cd = (words >> 28) < 2
+    assert np.array_equal(words[is_cd] & 0x7FF, cd['y'])
+    assert np.array_equal((words[is_cd] >> 11) & 0x7FF, cd['x'])
+    assert np.array_equal(words[is_cd] >> 28, cd['p'])
+    high = words[(words >> 28) == 0x8] & 0x0FFFFFFF
+    assert np.array_equal(high, np.unique(np.concatenate((cd['t'], trig['t'][:2])) >> 6))
+    assert np.count_nonzero((words >> 28) == 0xA) == 2
+
+    # replaying messages must look like a continuous stream
+    stream = SyntheticEventStream(width=640, height=480, event_rate=1e6, seed=2)
+    msgs = list(stream.messages(16, message_duration=1024, num_unique=4))
+    assert stream.get_time() == 16 * 1024
+    cd_dec, _ = decode_all(msgs)
+    assert np.all(np.diff(cd_dec['t']) >= 0)
+    n = cd_dec.shape[0] // 4
+    assert np.array_equal(cd_dec['t'][n:2 * n], cd_dec['t'][:n] + 4096)
+    try:
+        encode_events('evt3', cd[::-1].copy())
+        assert False, 'unsorted events must be rejected'
+    except RuntimeError:
+        pass
+
+
+def test_buffer_pool(verbose=False):
+    if verbose:
+        print('Testing buffer pool')
+    msgs = [msg for _, msg, _ in BagReader('tests/test_events_1').read_messages(
+        topics=['/event_camera/events'])]
+    # buffers owned by live arrays cannot be recycled
+    decoder = Decoder()
+    kept = []
+    for msg in msgs:
+        decoder.decode(msg)
+        kept.append(decoder.get_cd_events())
+        kept.append(decoder.get_ext_trig_events())
+    assert decoder.get_stats()['num_allocations'] == 2 * len(msgs)
+    mem = decoder.get_memory_usage()
+    assert mem['current'] >= sum(a.nbytes for a in kept) and mem['num_reused'] == 0
+    cd = kept[0].copy()
+    del decoder  # the arrays keep the pool alive
+    assert np.array_equal(kept[0], cd)
+    del kept
+
+    # the columns are recycled once all of their arrays are gone
+    decoder = ColumnarDecoder()
+    t_prev, t_prev_copy = None, None
+    for msg in msgs:
+        decoder.decode(msg)
+        # a column that is still alive must not be reused
+        assert t_prev is None or np.array_equal(t_prev, t_prev_copy)
+        t_prev = decoder.get_cd_events()['t']
+        t_prev_copy = t_prev.copy()
+        decoder.get_ext_trig_events()
+    assert decoder.get_stats()['num_allocations'] < len(msgs) // 10
+    assert decoder.get_memory_usage()['num_reused'] > len(msgs)
+
+    # a burst must not make the buffers of all later messages large
+    stream = SyntheticEventStream(width=640, height=480, event_rate=1e6, seed=3)
+    small = list(stream.messages(40, message_duration=1024))
+    burst = next(SyntheticEventStream(width=640, height=480, event_rate=100e6).messages(1))
+    decoder = Decoder()
+    decoder_no_decay = Decoder()
+    decoder_no_decay.set_buffer_pool(decay=1.0)
+    for d in (decoder, decoder_no_decay):
+        for msg in [burst] + small:
+            d.decode(msg)
+            d.get_cd_events()
+            d.get_ext_trig_events()
+    mem = decoder.get_memory_usage()
+    mem_no_decay = decoder_no_decay.get_memory_usage()
+    burst_bytes = burst.events.shape[0] // 4 * EventCD.itemsize  # about 4 bytes per event
+    assert mem['peak'] >= burst_bytes and mem_no_decay['peak'] >= burst_bytes
+    assert mem['current'] < burst_bytes // 10 < mem_no_decay['current']
+    assert mem['num_reused'] > 0 and mem['num_pooled'] <= 16
+    decoder.reset_stats()
+    assert decoder.get_memory_usage()['peak'] == mem['current']
+    decoder.set_buffer_pool(max_pooled_bytes=0)
+    assert decoder.get_memory_usage()['pooled'] == 0
+
+
+def test_multi_decoder(verbose=False):
+    if verbose:
+        print('Testing multi decoder')
+    msgs = [msg for _, msg, _ in BagReader('tests/test_events_1').read_messages(
+        topics=['/event_camera/events'])]
+    cd_ref, trig_ref = decode_all(msgs)
+    # the same bag for both cameras, with the clock of camera 1 ahead
+    decoder = MultiDecoder(2)
+    decoder.set_time_offset(1, 500)
+    decoder.set_time_window(10000)
+    windows = []
+    for i, msg in enumerate(msgs):
+        decoder.decode(0, msg)
+        if i == 0:
+            assert decoder.get_windows() == []  # camera 1 has not delivered yet
+        if i >= 3:
+            decoder.decode(1, msgs[i - 3])  # camera 1 lags behind
+        windows += decoder.get_windows()
+    for msg in msgs[-3:]:
+        decoder.decode(1, msg)
+    decoder.flush()
+    windows += decoder.get_windows()
+    assert decoder.get_num_cd_on(1) == 125183 and decoder.get_num_cd_off(0) == 218291
+    starts = np.array([w[0] for w in windows])
+    assert np.all(np.diff(starts) == 10000)
+    assert starts[0] == min(cd_ref['t'][0], trig_ref['t'][0])
+    for start, cd, trig in windows:
+        assert np.all((cd['t'] >= start) & (cd['t'] < start + 10000))
+        assert np.all((trig['t'] >= start) & (trig['t'] < start + 10000))
+    assert windows[0][1].dtype == EventCDCamera and windows[0][2].dtype == EventExtTrigCamera
+    cd = np.concatenate([w[1] for w in windows])
+    trig = np.concatenate([w[2] for w in windows])
+    # ordered by time, and by camera for equal times
+    assert np.all(np.lexsort((cd['camera'], cd['t'])) == np.arange(cd.shape[0]))
+    for camera, offset in ((0, 0), (1, 500)):
+        c = cd[cd['camera'] == camera]
+        assert np.array_equal(c['t'] - offset, cd_ref['t'])
+        for f in ('x', 'y', 'p'):
+            assert np.array_equal(c[f], cd_ref[f])
+        assert np.array_equal(trig[trig['camera'] == camera]['t'] - offset, trig_ref['t'])
+
+    # three synthetic cameras against a merge with numpy
+    streams = [
+        SyntheticEventStream(width=640, height=480, event_rate=r, seed=i)
+        for i, r in enumerate((1e6, 3e6, 0.5e6))
+    ]
+    decoder = MultiDecoder(3)
+    decoder.set_time_window(700, start_time=1000)
+    for camera, offset in enumerate((0, -200, 300)):
+        decoder.set_time_offset(camera, offset)
+    cd_cams = []
+    for camera, stream in enumerate(streams):
+        msgs = list(stream.messages(10, message_duration=1000))
+        cd_cams.append(decode_all(msgs)[0])
+        for msg in msgs:
+            decoder.decode(camera, msg)
+    decoder.flush()
+    cd = np.concatenate([w[1] for w in decoder.get_windows()])
+    ref = []
+    for camera, (c, offset) in enumerate(zip(cd_cams, (0, -200, 300))):
+        r = np.zeros(c.shape[0], dtype=EventCDCamera)
+        for f in ('x', 'y', 'p'):
+            r[f] = c[f]
+        r['t'] = c['t'] + offset
+        r['camera'] = camera
+        ref.append(r[r['t'] >= 1000])
+    ref = np.concatenate(ref)
+    ref = ref[np.lexsort((ref['camera'], ref['t']))]
+    assert np.array_equal(cd, ref)
+
+
 def test_unique(verbose=False):
     bag = BagReader('tests/test_events_1', verbose)
     if verbose:
@@ -148,6 +1227,54 @@ def test_unique(verbose=False):
     )
 
 
+def test_unique_flat(verbose=False):
+    bag = BagReader('tests/test_events_1', verbose)
+    if verbose:
+        print('Testing unique flat')
+    decoder = UniqueDecoder()
+    decoder_flat = UniqueDecoder()
+    counter = EventCounter()
+    for _, msg, _ in bag.read_messages(topics=['/event_camera/events']):
+        decoder.decode(msg)
+        decoder_flat.decode(msg)
+        cd_packets = decoder.get_cd_event_packets()
+        cd, offsets = decoder_flat.get_cd_event_packets_flat()
+        assert offsets.dtype == np.int64
+        assert offsets.shape[0] == len(cd_packets) + 1
+        assert test_verify.flat_packets_are_unique(cd, offsets)
+        for i, p in enumerate(cd_packets):
+            assert np.array_equal(p, cd[offsets[i] : offsets[i + 1]])  # noqa: E203
+        counter.add_cd_events(cd)
+        counter.add_trig_event_packets(decoder_flat.get_ext_trig_event_packets())
+    counter.check_count(
+        sum_time=2885601049874,
+        num_off_events=218291,
+        num_on_events=125183,
+        num_rise_trig=2078,
+        num_fall_trig=2078,
+    )
+
+
+def test_unique_full_clear(verbose=False):
+    bag = BagReader('tests/test_events_1', verbose)
+    if verbose:
+        print('Testing unique full clear')
+    decoder = UniqueDecoder()
+    decoder_full = UniqueDecoder()
+    decoder_full.set_full_clear(True)
+    for i, (_, msg, _) in enumerate(bag.read_messages(topics=['/event_camera/events'])):
+        if i == 200:
+            decoder_full.set_full_clear(False)  # switching must not alter the packets
+        elif i == 300:
+            decoder_full.set_full_clear(True)
+        decoder.decode(msg)
+        decoder_full.decode(msg)
+        cd, offsets = decoder.get_cd_event_packets_flat()
+        cd_full, offsets_full = decoder_full.get_cd_event_packets_flat()
+        assert np.array_equal(cd, cd_full)
+        assert np.array_equal(offsets, offsets_full)
+
+
 def test_unique_until(verbose=False):
     bag = BagReader('tests/test_events_1', verbose)
     if verbose:
@@ -199,6 +1326,33 @@ def test_find_first_sensor_time(verbose=True):
 if __name__ == '__main__':
     test_decode_bytes(True)
     test_decode_msg(True)
+    test_decode_many(True)
+    test_decode_bytes_many(True)
+    test_decode_into(True)
+    test_time64(True)
+    test_columnar(True)
+    test_frame(True)
+    test_iter_windows(True)
+    test_iter_count_windows(True)
+    test_iter_trigger_windows(True)
+    test_time_index(True)
+    test_time_index_rollover(True)
+    test_state(True)
+    test_state_rollover(True)
+    test_parallel_bag_decoder(True)
+    test_prefetching_bag_reader(True)
+    test_decode_serialized(True)
+    test_raw_file_decoder(True)
     test_decode_until(True)
+    test_filter(True)
+    test_hot_pixel_filter(True)
+    test_noise_filter(True)
+    test_remap(True)
+    test_stats(True)
+    test_buffer_pool(True)
+    test_multi_decoder(True)
+    test_encoder(True)
     test_unique(True)
+    test_unique_flat(True)
+    test_unique_full_clear(True)
     test_unique_until(True)
@@ -27,3 +27,17 @@ def packet_is_unique(packets) -> bool:
             print(f'has {num_with_duplicates} duplicates at:')
             return False
     return True
+
+
+def flat_packets_are_unique(events, offsets) -> bool:
+    if offsets[0] != 0 or offsets[-1] != events.shape[0] or np.any(np.diff(offsets) < 0):
+        print('bad packet offsets:\n', offsets)
+        return False
+    packet = np.repeat(np.arange(offsets.shape[0] - 1), np.diff(offsets))
+    idx = np.stack((packet, events['x'], events['y']), axis=1)
+    _, c = np.unique(idx, return_counts=True, axis=0)
+    num_with_duplicates = np.count_nonzero(c > 1)
+    if num_with_duplicates > 0:
+        print(f'found {num_with_duplicates} duplicates!')
+        return False
+    return True